@@ -0,0 +1,145 @@
+import functools
+import hashlib
+import io
+import os
+import time
+
+import pandas as pd
+from PIL import Image
+
+LOGO_FILE = 'gambarlogo.png'
+ICON_FILE = 'icon.png'
+# Lebar tampilan (piksel) logo di halaman login dan halaman utama, serta ukuran favicon
+LOGIN_LOGO_WIDTH = 600
+MAIN_LOGO_WIDTH = 300
+ICON_SIZE = 64
+WEBP_QUALITY = 90
+# PNG disimpan sebagai palet 256 warna (tanpa dithering); cukup untuk logo dan jauh lebih kecil
+PNG_COLORS = 256
+# Folder yang dilayani Streamlit di /app/static/ bila server.enableStaticServing aktif (diatur di
+# .streamlit/config.toml; Streamlit hanya membaca file itu dari folder kerja). Folder ini tidak di-commit.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_URL = '/app/static/'
+# Lebar maksimum Streamlit untuk gambar selebar kolom (dipakai untuk mengukur cara lama)
+STREAMLIT_MAX_WIDTH = 1460
+
+
+class ImageAsset:
+    """Gambar yang sudah diperkecil ke lebar tampilan dan di-encode sekali: PNG palet teroptimasi dan WebP."""
+
+    def __init__(self, path, width, height, png, webp, source_bytes, mtime):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.png = png
+        self.webp = webp
+        self.source_bytes = source_bytes
+        self.mtime = mtime
+        self._url = None
+
+    @property
+    def compact(self):
+        """(ekstensi, byte) encoding terkecil; logo dengan sedikit warna biasanya lebih kecil sebagai PNG palet."""
+        return min([('png', self.png), ('webp', self.webp)], key=lambda item: len(item[1]))
+
+    def publish(self, static_dir=STATIC_DIR):
+        """Menulis encoding terkecil ke folder statis (nama berisi hash isi) dan mengembalikan URL-nya.
+
+        Tanggal file disamakan dengan file sumber agar header Last-Modified dari Streamlit
+        membuat browser menyimpan gambar di cache-nya lebih lama.
+        """
+        if self._url is None:
+            stem = os.path.splitext(os.path.basename(self.path))[0]
+            ext, data = self.compact
+            name = f"{stem}-{self.width}-{hashlib.sha1(data).hexdigest()[:10]}.{ext}"
+            target = os.path.join(static_dir, name)
+            if not os.path.exists(target):
+                os.makedirs(static_dir, exist_ok=True)
+                temp = f"{target}.{os.getpid()}.tmp"
+                with open(temp, 'wb') as f:
+                    f.write(data)
+                os.replace(temp, target)
+            os.utime(target, (self.mtime, self.mtime))
+            self._url = STATIC_URL + name
+        return self._url
+
+
+def _encode(image, fmt, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=16)
+def _load(path, mtime_ns, width):
+    with Image.open(path) as image:
+        image.load()
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS) if image.width > width else image.copy()
+    return ImageAsset(
+        path, resized.width, resized.height,
+        png=_encode(resized.quantize(PNG_COLORS, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE),
+                    'PNG', optimize=True),
+        webp=_encode(resized, 'WEBP', quality=WEBP_QUALITY, method=6),
+        source_bytes=os.path.getsize(path), mtime=mtime_ns / 1e9,
+    )
+
+
+def get_asset(path, width):
+    """Aset gambar untuk lebar tampilan tertentu; didekode dan diperkecil sekali per proses (dan per versi file)."""
+    return _load(path, os.stat(path).st_mtime_ns, width)
+
+
+def image_source(path, width, static_serving):
+    """Sumber untuk st.image/page_icon: URL file statis bila static serving aktif, selain itu byte PNG.
+
+    Byte PNG sudah selebar tampilan, jadi Streamlit tidak perlu mengubah ukuran atau meng-encode ulang.
+    """
+    asset = get_asset(path, width)
+    return asset.publish() if static_serving else asset.png
+
+
+def _legacy_render(path, width):
+    """Meniru cara lama (Image.open lalu st.image): encode PNG ukuran penuh, lalu Streamlit memperkecil dan encode ulang.
+
+    Tanpa `width` file dikirim apa adanya (seperti page_icon berupa path file).
+    """
+    start = time.perf_counter()
+    if width is None:
+        with open(path, 'rb') as f:
+            return len(f.read()), time.perf_counter() - start
+    with Image.open(path) as image:
+        full = _encode(image, 'PNG')
+    decoded = Image.open(io.BytesIO(full))
+    if decoded.width > width:
+        decoded = decoded.resize((width, int(decoded.height * width / decoded.width)), Image.BILINEAR)
+        payload = _encode(decoded, 'PNG')
+    else:
+        payload = full
+    return len(payload), time.perf_counter() - start
+
+
+def transfer_report(items, static_serving):
+    """Ukuran dan waktu per render gambar, cara lama dibanding aset yang sudah disiapkan.
+
+    `items` berisi (label, path, lebar tampilan, lebar yang dipakai cara lama atau None bila file dikirim utuh).
+    """
+    rows = []
+    for label, path, width, legacy_width in items:
+        legacy_bytes, legacy_seconds = _legacy_render(path, legacy_width)
+        start = time.perf_counter()
+        asset = get_asset(path, width)
+        cached_seconds = time.perf_counter() - start
+        sent = len(asset.compact[1]) if static_serving else len(asset.png)
+        rows.append({
+            'Aset': label,
+            'File Sumber (KB)': asset.source_bytes / 1024,
+            'Cara Lama (KB)': legacy_bytes / 1024,
+            'Cara Lama (ms)': legacy_seconds * 1000,
+            'PNG (KB)': len(asset.png) / 1024,
+            'WebP (KB)': len(asset.webp) / 1024,
+            'Dikirim Sekarang (KB)': sent / 1024,
+            'Sekarang (ms)': cached_seconds * 1000,
+            'Hemat per Rerun (KB)': (legacy_bytes - sent) / 1024,
+        })
+    return pd.DataFrame(rows).set_index('Aset')
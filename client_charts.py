@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+# Ukuran grafik di slider dalam inci (seperti matplotlib); dikonversi ke piksel untuk Vega-Lite
+PIXELS_PER_INCH = 80
+HISTOGRAM_BINS = 20
+# Scatter dengan titik lebih banyak dari ini dikirim sebagai grid bin 2D, bukan titik mentah
+SCATTER_RAW_POINTS = 5000
+SCATTER_BINS = 60
+
+
+def pixels(inches):
+    return int(inches * PIXELS_PER_INCH)
+
+
+def histogram_data(values, bins=HISTOGRAM_BINS):
+    """Jumlah per bin; hanya tepi bin dan frekuensinya yang dikirim ke browser."""
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({'Awal': edges[:-1], 'Akhir': edges[1:], 'Frekuensi': counts})
+
+
+def _histogram_layer(x_title):
+    return {
+        'mark': {'type': 'bar', 'stroke': 'black', 'strokeWidth': 0.5},
+        'encoding': {
+            'x': {'field': 'Awal', 'type': 'quantitative', 'bin': {'binned': True}, 'title': x_title},
+            'x2': {'field': 'Akhir'},
+            'y': {'field': 'Frekuensi', 'type': 'quantitative'},
+            'tooltip': [{'field': 'Awal', 'format': '.4g'}, {'field': 'Akhir', 'format': '.4g'}, {'field': 'Frekuensi'}],
+        },
+    }
+
+
+def histogram_spec(title, x_title, width, height):
+    return {'title': title, 'width': width, 'height': height, **_histogram_layer(x_title)}
+
+
+def histogram_grid_spec(title, width, height, columns=3):
+    """Histogram semua kolom sebagai facet; data memakai kolom 'Kolom' sebagai penanda."""
+    per_column = max(1, min(columns, 3))
+    return {
+        'title': title,
+        'facet': {'field': 'Kolom', 'type': 'nominal', 'title': None},
+        'columns': per_column,
+        'spec': {'width': width // per_column, 'height': height // 2, **_histogram_layer(None)},
+        'resolve': {'scale': {'x': 'independent', 'y': 'independent'}},
+    }
+
+
+def box_stats(sorted_values, label, whis=1.5):
+    """Statistik boxplot eksak dari tampilan terurut (kuantil dan whisker dengan indeks, tanpa sort ulang)."""
+    n = sorted_values.size
+    if n == 0:
+        return {'label': label, 'q1': np.nan, 'med': np.nan, 'q3': np.nan, 'whislo': np.nan,
+                'whishi': np.nan, 'mean': np.nan, 'n_outliers': 0}
+    positions = np.array([0.25, 0.5, 0.75]) * (n - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, n - 1)
+    q1, med, q3 = sorted_values[lower] + (positions - lower) * (sorted_values[upper] - sorted_values[lower])
+    lo, hi = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+    first = np.searchsorted(sorted_values, lo, side='left')
+    last = np.searchsorted(sorted_values, hi, side='right') - 1
+    return {
+        'label': label, 'q1': q1, 'med': med, 'q3': q3,
+        'whislo': sorted_values[first], 'whishi': sorted_values[last],
+        'mean': float(sorted_values.mean()), 'n_outliers': int(first + (n - 1 - last)),
+    }
+
+
+def boxplot_data(stats_list):
+    keys = ['label', 'q1', 'med', 'q3', 'whislo', 'whishi', 'mean', 'n_outliers']
+    return pd.DataFrame([{key: s[key] for key in keys} for s in stats_list]).rename(columns={'label': 'Kolom'})
+
+
+def boxplot_spec(title, y_title, width, height):
+    """Boxplot dari statistik yang sudah dihitung: whisker (rule), kotak Q1-Q3 dan garis median."""
+    x = {'field': 'Kolom', 'type': 'nominal', 'title': None, 'sort': None}
+    tooltip = [{'field': 'Kolom'}] + [{'field': f, 'format': '.4g'} for f in ('q1', 'med', 'q3', 'whislo', 'whishi', 'mean')] + [{'field': 'n_outliers'}]
+    return {
+        'title': title, 'width': width, 'height': height,
+        'encoding': {'x': x, 'tooltip': tooltip},
+        'layer': [
+            {'mark': 'rule', 'encoding': {'y': {'field': 'whislo', 'type': 'quantitative', 'title': y_title}, 'y2': {'field': 'whishi'}}},
+            {'mark': {'type': 'bar', 'size': 40}, 'encoding': {'y': {'field': 'q1', 'type': 'quantitative'}, 'y2': {'field': 'q3'}}},
+            {'mark': {'type': 'tick', 'color': 'white', 'size': 40}, 'encoding': {'y': {'field': 'med', 'type': 'quantitative'}}},
+        ],
+    }
+
+
+def scatter_data(x, y, raw_limit=SCATTER_RAW_POINTS, bins=SCATTER_BINS):
+    """Titik mentah untuk data kecil, atau jumlah per sel grid 2D (hanya sel berisi) untuk data besar."""
+    if x.size <= raw_limit:
+        return pd.DataFrame({'x': x, 'y': y}), False
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    ix, iy = np.nonzero(counts)
+    return pd.DataFrame({
+        'x': x_edges[ix], 'x2': x_edges[ix + 1], 'y': y_edges[iy], 'y2': y_edges[iy + 1], 'Jumlah': counts[ix, iy].astype(int),
+    }), True
+
+
+def scatter_spec(title, x_title, y_title, width, height, binned):
+    if not binned:
+        return {
+            'title': title, 'width': width, 'height': height,
+            'mark': {'type': 'circle', 'size': 20, 'opacity': 0.6},
+            'encoding': {
+                'x': {'field': 'x', 'type': 'quantitative', 'title': x_title, 'scale': {'zero': False}},
+                'y': {'field': 'y', 'type': 'quantitative', 'title': y_title, 'scale': {'zero': False}},
+                'tooltip': [{'field': 'x', 'title': x_title, 'format': '.4g'}, {'field': 'y', 'title': y_title, 'format': '.4g'}],
+            },
+        }
+    return {
+        'title': title, 'width': width, 'height': height,
+        'mark': 'rect',
+        'encoding': {
+            'x': {'field': 'x', 'type': 'quantitative', 'title': x_title, 'scale': {'zero': False}},
+            'x2': {'field': 'x2'},
+            'y': {'field': 'y', 'type': 'quantitative', 'title': y_title, 'scale': {'zero': False}},
+            'y2': {'field': 'y2'},
+            'color': {'field': 'Jumlah', 'type': 'quantitative', 'scale': {'type': 'log', 'scheme': 'viridis'}},
+            'tooltip': [{'field': 'Jumlah'}],
+        },
+    }
+
+
+def correlation_data(corr):
+    data = corr.rename_axis(index='Baris', columns='Kolom').stack().rename('r').reset_index()
+    data[['Baris', 'Kolom']] = data[['Baris', 'Kolom']].astype(str)
+    return data
+
+
+def heatmap_spec(title, order, width, height):
+    axis = {'type': 'nominal', 'sort': [str(col) for col in order], 'title': None}
+    return {
+        'title': title, 'width': width, 'height': height,
+        'encoding': {'x': {'field': 'Kolom', **axis}, 'y': {'field': 'Baris', **axis}},
+        'layer': [
+            {'mark': 'rect', 'encoding': {
+                'color': {'field': 'r', 'type': 'quantitative', 'scale': {'scheme': 'redblue', 'domain': [-1, 1], 'reverse': True}},
+                'tooltip': [{'field': 'Baris'}, {'field': 'Kolom'}, {'field': 'r', 'format': '.3f'}],
+            }},
+            {'mark': {'type': 'text', 'fontSize': 11}, 'encoding': {'text': {'field': 'r', 'type': 'quantitative', 'format': '.2f'}}},
+        ],
+    }
+
+
+def power_curve_spec(title, effect_title, alphas, width, height, target, simulated=False):
+    """Kurva power terhadap n per ukuran efek untuk seluruh grid α.
+
+    Pilihan α dan sorotan efek (klik legenda) adalah parameter Vega-Lite, jadi berubah di browser
+    tanpa menghitung atau mengirim ulang grid. Titik hasil simulasi ditumpuk bila `simulated`.
+    """
+    alpha_filter = {'filter': 'datum.Alpha == alpha'}
+    x = {'field': 'n', 'type': 'quantitative', 'scale': {'type': 'log'}, 'title': 'n'}
+    color = {'field': 'Efek', 'type': 'ordinal', 'title': effect_title, 'scale': {'scheme': 'viridis'}}
+    opacity = {'condition': {'param': 'efek', 'value': 1}, 'value': 0.15}
+    layers = [
+        {
+            'transform': [alpha_filter],
+            'params': [{'name': 'efek', 'select': {'type': 'point', 'fields': ['Efek']}, 'bind': 'legend'}],
+            'mark': {'type': 'line', 'strokeWidth': 2},
+            'encoding': {
+                'x': x, 'color': color, 'opacity': opacity,
+                'y': {'field': 'Power', 'type': 'quantitative', 'scale': {'domain': [0, 1]}},
+                'tooltip': [{'field': 'Efek'}, {'field': 'n'}, {'field': 'Power', 'format': '.3f'}],
+            },
+        },
+        {'data': {'values': [{'target': target}]}, 'mark': {'type': 'rule', 'color': 'red', 'strokeDash': [4, 4]},
+         'encoding': {'y': {'field': 'target', 'type': 'quantitative'}}},
+    ]
+    if simulated:
+        layers.append({
+            'transform': [alpha_filter],
+            'mark': {'type': 'point', 'filled': True, 'size': 50, 'shape': 'diamond'},
+            'encoding': {
+                'x': x, 'color': color, 'opacity': opacity,
+                'y': {'field': 'Power (MC)', 'type': 'quantitative'},
+                'tooltip': [{'field': 'Efek'}, {'field': 'n'}, {'field': 'Power (MC)', 'format': '.3f'},
+                            {'field': 'SE (MC)', 'format': '.3f'}, {'field': 'Power (Pendekatan)', 'format': '.3f'}],
+            },
+        })
+    return {
+        'title': title, 'width': width, 'height': height,
+        'params': [{'name': 'alpha', 'value': alphas[len(alphas) // 2],
+                    'bind': {'input': 'select', 'options': list(alphas), 'name': 'α '}}],
+        'layer': layers,
+    }
@@ -5,25 +5,71 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 import sqlite3
+import os
 import io
-from PIL import Image
+import hashlib
 import statsmodels.api as sm
 from io import BytesIO
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from memory_governor import governor
+from sketches import EXACT_ROW_LIMIT, build_column_sketches, describe_from_sketches, max_rank_error
+from column_profile import DatasetProfile
+import assets
+import client_charts
+from jobs import DONE, FAILED, INLINE_WAIT_SECONDS, make_job_key, runner
+from rendering import render_pairplot_png
+from report import REPORT_TESTS, generate_report
+from preview import PAGE_SIZES, filter_mask, merge_edits, page_window, sort_positions
+from ingest import SOURCE_COLUMN, read_uploaded, stack_files
+from compare import compare_groups, group_boxplot_stats, group_summary
+from transforms import BOXCOX, LOG, MINMAX, METHODS as TRANSFORM_METHODS, SUFFIXES, FittedTransform, fit_transform
+from result_store import dataset_hash, store as result_store
+import shared_cache
+from shared_cache import connect_sqlite
+from live_ingest import PUBLISH_SECONDS as LIVE_PUBLISH_SECONDS, drop_source, get_source
+from regression import DesignSpec, factor_means, fit_regression
+import gage_rr
+import power
+import quality
+from timeseries import MIN_WINDOW_N, ROLLING_STATS, check_time_window, decimate_indices, detect_time_column, prepare_series, rolling_stats, windowed_tests
 
 # --- Konfigurasi Halaman Streamlit ---
+# Dengan server.enableStaticServing gambar dikirim sebagai file statis; tanpa itu sebagai byte PNG kecil
+STATIC_SERVING = bool(st.get_option("server.enableStaticServing"))
+try:
+    page_icon = assets.image_source(assets.ICON_FILE, assets.ICON_SIZE, STATIC_SERVING)
+except FileNotFoundError:
+    page_icon = None
 st.set_page_config(
     page_title="PSD Analyst",
-    page_icon="icon.png",
+    page_icon=page_icon,
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
 # --- Fungsi-fungsi Database ---
-DB_FILE = 'aplikasi_db.sqlite'
+# Default di folder bersama atau folder aplikasi, jadi semua proses server memakai file yang sama apa pun folder kerjanya
+DB_FILE = os.path.abspath(os.environ.get('PSD_DB_FILE', shared_cache.data_path('aplikasi_db.sqlite')))
+CHART_MODES = ["Interaktif (browser)", "Gambar (PNG)"]
+# Jumlah baris bertanda yang ditampilkan pada pemeriksaan kualitas data
+QUALITY_PREVIEW_ROWS = 1000
+# Jumlah data terakhir yang digambar pada I-Chart sumber langsung
+LIVE_CHART_POINTS = 500
+# Jumlah pengguna per halaman di pengaturan admin
+USER_PAGE_SIZE = 50
+USER_STATUSES = ['pending', 'approved']
+USER_ROLES = ['User', 'Admin']
+# Perencanaan sampel tidak bergantung pada dataset; hasilnya di-cache dengan kunci tetap ini
+PLANNER_HASH = 'perencanaan-sampel'
+POWER_ALPHAS = [0.01, 0.05, 0.10]
+# Jumlah titik n yang disimulasikan pada validasi Monte-Carlo
+POWER_MC_POINTS = 6
+# Jumlah pekerjaan selesai (beserta hasilnya) yang disimpan per sesi; yang lebih lama dikirim ulang bila diminta
+SESSION_FINISHED_JOBS = 16
 
 def init_db():
     """Menginisialisasi database dan membuat tabel jika belum ada."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
     
     # Create users table
@@ -36,6 +82,10 @@ def init_db():
     )
     """)
     
+    # Indeks untuk filter status/peran dengan urutan ID (halaman admin)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_status_id ON users (status, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_role_id ON users (role, id)")
+
     # Create features table
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS features (
@@ -54,6 +104,13 @@ def init_db():
         'Uji Hipotesis': 1,
         'Normalisasi Data': 1,
         'Bantuan': 1,
+        'Laporan Lengkap': 1,
+        'Perbandingan Grup': 1,
+        'Deret Waktu': 1,
+        'Regresi & DOE': 1,
+        'Gage R&R': 1,
+        'Kualitas Data': 1,
+        'Perencanaan Sampel': 1,
     }
     for feature, is_enabled in default_features.items():
         cursor.execute("SELECT 1 FROM features WHERE feature_name = ?", (feature,))
@@ -70,7 +127,7 @@ def init_db():
 
 def add_user(user_id, password, role='User'):
     """Menambahkan pengguna baru ke tabel users."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
     status = 'pending' if role == 'User' else 'approved'
     try:
@@ -84,7 +141,7 @@ def add_user(user_id, password, role='User'):
 
 def check_user(user_id, password):
     """Memeriksa kredensial pengguna."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM users WHERE id = ? AND password = ?", (user_id, password))
     user = cursor.fetchone()
@@ -93,7 +150,7 @@ def check_user(user_id, password):
 
 def get_user_status(user_id):
     """Mendapatkan status pengguna (pending/approved)."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
     cursor.execute("SELECT status FROM users WHERE id = ?", (user_id,))
     status = cursor.fetchone()
@@ -102,49 +159,74 @@ def get_user_status(user_id):
 
 def get_user_role(user_id):
     """Mendapatkan peran pengguna (User/Admin)."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
     cursor.execute("SELECT role FROM users WHERE id = ?", (user_id,))
     role = cursor.fetchone()
     conn.close()
     return role[0] if role else None
 
-def approve_user(user_id):
-    """Menyetujui pengguna baru."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("UPDATE users SET status = 'approved' WHERE id = ?", (user_id,))
-    conn.commit()
-    conn.close()
-    
-def get_all_users():
-    """Mendapatkan semua pengguna dari tabel users."""
-    conn = sqlite3.connect(DB_FILE)
+def query_users(status=None, role=None, prefix='', after=None, limit=USER_PAGE_SIZE):
+    """Mendapatkan satu halaman pengguna urut ID, difilter status/peran dan awalan ID.
+
+    Memakai pagination keyset (`id > after`) dan rentang indeks untuk awalan, sehingga biaya
+    per halaman tidak bergantung pada jumlah pengguna. Mengembalikan (baris, ada halaman berikutnya).
+    """
+    clauses, params = [], []
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if role:
+        clauses.append("role = ?")
+        params.append(role)
+    if prefix:
+        clauses.append("id >= ? AND id < ?")
+        params += [prefix, prefix + '\U0010ffff']
+    if after is not None:
+        clauses.append("id > ?")
+        params.append(after)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
-    cursor.execute("SELECT id, role, status FROM users")
+    cursor.execute(f"SELECT id, role, status FROM users {where} ORDER BY id LIMIT ?", params + [limit + 1])
     users = cursor.fetchall()
     conn.close()
-    return users
-    
-def delete_user(user_id):
-    """Menghapus pengguna dari database."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
-    conn.commit()
-    conn.close()
+    return users[:limit], len(users) > limit
 
-def update_user_role(user_id, new_role):
-    """Memperbarui peran pengguna."""
-    conn = sqlite3.connect(DB_FILE)
+def count_users():
+    """Jumlah pengguna per status dan peran (dihitung dari indeks, tanpa membaca baris)."""
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
-    cursor.execute("UPDATE users SET role = ? WHERE id = ?", (new_role, user_id))
-    conn.commit()
+    cursor.execute("SELECT status, role, COUNT(*) FROM users GROUP BY status, role")
+    counts = cursor.fetchall()
     conn.close()
+    return {(status, role): count for status, role, count in counts}
+
+def _bulk_update(sql, rows):
+    """Menjalankan satu perintah untuk banyak pengguna dalam satu transaksi; mengembalikan jumlah baris berubah."""
+    conn = connect_sqlite(DB_FILE)
+    try:
+        with conn:
+            cursor = conn.executemany(sql, rows)
+            return cursor.rowcount
+    finally:
+        conn.close()
+
+def approve_users(user_ids):
+    """Menyetujui banyak pengguna sekaligus."""
+    return _bulk_update("UPDATE users SET status = 'approved' WHERE id = ?", [(user_id,) for user_id in user_ids])
+
+def update_users_role(user_ids, new_role):
+    """Memperbarui peran banyak pengguna sekaligus."""
+    return _bulk_update("UPDATE users SET role = ? WHERE id = ?", [(new_role, user_id) for user_id in user_ids])
+
+def delete_users(user_ids):
+    """Menghapus banyak pengguna sekaligus."""
+    return _bulk_update("DELETE FROM users WHERE id = ?", [(user_id,) for user_id in user_ids])
 
 def get_feature_status():
     """Mendapatkan status semua fitur dari database."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
     cursor.execute("SELECT feature_name, is_enabled FROM features")
     features = cursor.fetchall()
@@ -153,21 +235,486 @@ def get_feature_status():
 
 def update_feature_status(feature_name, is_enabled):
     """Memperbarui status fitur di database."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect_sqlite(DB_FILE)
     cursor = conn.cursor()
     cursor.execute("UPDATE features SET is_enabled = ? WHERE feature_name = ?", (int(is_enabled), feature_name))
     conn.commit()
     conn.close()
     
+# --- Fungsi Pengelolaan Memori Sesi ---
+def get_session_id():
+    """Mendapatkan ID sesi Streamlit yang sedang berjalan."""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else 'local'
+
+def get_frame(key):
+    """Mengambil DataFrame milik sesi dari pengelola memori."""
+    return governor.get(get_session_id(), key)
+
+def set_frame(key, frame):
+    """Menyimpan DataFrame milik sesi ke pengelola memori."""
+    governor.put(get_session_id(), key, frame)
+
+def get_frame_version(key):
+    """Mendapatkan versi DataFrame sesi (berubah setiap kali data diganti)."""
+    return governor.version(get_session_id(), key)
+
+def ingest_frame(ingest_key, reader, files=None, settings=()):
+    """Membaca data hanya sekali per file dan pengaturan, lalu membangun sketsa kolomnya.
+
+    Dalam mode multi-proses (`PSD_SHARED_DIR`) hasil parsing `files` dibagi lewat folder bersama,
+    jadi file yang sama hanya diparsing sekali oleh satu proses server.
+    """
+    if st.session_state.get('ingest_key') != ingest_key or get_frame('df') is None:
+        if files and shared_cache.datasets is not None:
+            df = shared_cache.datasets.get_or_parse(shared_cache.content_key(files, *settings), reader)
+        else:
+            df = reader()
+        # File yang gagal dibaca saat penumpukan ikut tersimpan di dataset (juga di cache bersama)
+        st.session_state['ingest_errors'] = df.attrs.pop('ingest_errors', {})
+        set_frame('df', df)
+        st.session_state['ingest_key'] = ingest_key
+        get_column_sketches(df)
+
+def get_column_sketches(df):
+    """Mengambil sketsa kuantil dan momen per kolom, dibangun sekali per versi data."""
+    version = get_frame_version('df')
+    cached = st.session_state.get('column_sketches')
+    if cached is None or cached[0] != version:
+        cached = (version, build_column_sketches(df))
+        st.session_state['column_sketches'] = cached
+    return cached[1]
+
+def get_column_profile(df, variant=''):
+    """Mengambil indeks profil kolom (tipe, mask NaN, nilai bersih, min/maks), dibangun sekali per versi data.
+
+    `variant` membedakan turunan dataset yang sama, mis. data setelah baris bertanda dikecualikan.
+    """
+    version = get_frame_version('df')
+    profiles = st.session_state.setdefault('column_profiles', {})
+    cached = profiles.get(variant)
+    if cached is None or cached[0] != version:
+        cached = profiles[variant] = (version, DatasetProfile(df))
+    return cached[1]
+
+# --- Fungsi Pengecualian Baris Bertanda ---
+def set_quality_exclusion(frame, excluded, methods):
+    """Menyimpan dataset tanpa baris bertanda untuk dipakai semua analisis sampai data berganti."""
+    token = hashlib.sha1(np.packbits(excluded).tobytes() + repr(methods).encode()).hexdigest()[:16]
+    drop_variant_profiles()
+    set_frame('quality_df', frame[~excluded])
+    st.session_state['quality_exclusion'] = {
+        'version': get_frame_version('df'), 'token': token,
+        'n_excluded': int(excluded.sum()), 'methods': list(methods),
+    }
+
+def drop_variant_profiles():
+    profiles = st.session_state.get('column_profiles', {})
+    for variant in [key for key in profiles if key]:
+        del profiles[variant]
+
+def clear_quality_exclusion():
+    st.session_state.pop('quality_exclusion', None)
+    drop_variant_profiles()
+    governor.discard(get_session_id(), 'quality_df')
+
+def get_quality_exclusion():
+    """Pengecualian yang aktif untuk versi data saat ini; otomatis dibatalkan bila data berubah."""
+    exclusion = st.session_state.get('quality_exclusion')
+    if exclusion is not None and exclusion['version'] != get_frame_version('df'):
+        clear_quality_exclusion()
+        return None
+    return exclusion
+
+def get_analysis_frame(df):
+    """Dataset untuk analisis: tanpa baris bertanda bila pengecualian aktif."""
+    exclusion = get_quality_exclusion()
+    return get_frame('quality_df') if exclusion is not None else df
+
+def show_figure(fig):
+    """Menampilkan grafik lalu menutupnya agar tidak tertahan di memori matplotlib."""
+    st.pyplot(fig)
+    plt.close(fig)
+
+def show_client_chart(data, spec):
+    """Mengirim data teragregasi dan spesifikasi Vega-Lite; grafik digambar di browser."""
+    st.vega_lite_chart(data, spec, use_container_width=False)
+
+def show_client_visualization(df, profile, numeric_cols, plot_type, plot_mode, plot_width, plot_height, exact_quantiles):
+    """Visualisasi mode interaktif: agregat dihitung sekali per versi data, hover dan zoom ditangani browser."""
+    width, height = client_charts.pixels(plot_width), client_charts.pixels(plot_height)
+
+    def histogram(col):
+        return profile.derived(('histogram', col), lambda: client_charts.histogram_data(profile.values(col)))
+
+    def box(col):
+        if exact_quantiles:
+            return profile.derived(('box', col), lambda: client_charts.box_stats(profile[col].sorted, col))
+        return get_column_sketches(df)[col].boxplot_stats(col)
+
+    if plot_type == "Heatmap":
+        if len(numeric_cols) < 2:
+            st.warning("Diperlukan setidaknya dua kolom numerik untuk membuat Heatmap.")
+            return
+        st.markdown("#### Heatmap Korelasi")
+        selected_cols = st.multiselect("Pilih kolom numerik untuk heatmap:", options=numeric_cols, default=numeric_cols)
+        if not selected_cols:
+            st.info("✅ Silakan pilih minimal dua kolom untuk membuat Heatmap.")
+            return
+        corr_matrix = profile.derived(('corr', tuple(selected_cols)), lambda: df[selected_cols].corr())
+        show_client_chart(client_charts.correlation_data(corr_matrix), client_charts.heatmap_spec("Matriks Korelasi Heatmap", selected_cols, width, height))
+        st.markdown("---")
+        st.subheader("📋 Matriks Korelasi")
+        st.dataframe(corr_matrix.style.background_gradient(cmap='coolwarm'), use_container_width=True)
+
+    elif plot_type == "Histogram":
+        if plot_mode == "Grafik Terpisah":
+            for col in numeric_cols:
+                st.markdown(f"#### Distribusi untuk Kolom: **{col}**")
+                show_client_chart(histogram(col), client_charts.histogram_spec(f'Histogram untuk {col}', str(col), width, height))
+        else:
+            st.markdown("#### Histogram Semua Kolom dalam Satu Grafik")
+            data = pd.concat([histogram(col).assign(Kolom=str(col)) for col in numeric_cols], ignore_index=True)
+            show_client_chart(data, client_charts.histogram_grid_spec("Histogram Semua Kolom", width, height, len(numeric_cols)))
+
+    elif plot_type == "Boxplot":
+        if plot_mode == "Grafik Terpisah":
+            for col in numeric_cols:
+                st.markdown(f"#### Boxplot untuk Kolom: **{col}**")
+                stats_col = box(col)
+                show_client_chart(client_charts.boxplot_data([stats_col]), client_charts.boxplot_spec(f'Boxplot untuk {col}', str(col), width, height))
+                st.caption(f"Jumlah outlier (di luar 1.5×IQR){'' if exact_quantiles else ' (perkiraan)'}: {stats_col['n_outliers']}")
+        else:
+            st.markdown("#### Boxplot Semua Kolom dalam Satu Grafik")
+            data = client_charts.boxplot_data([box(col) for col in numeric_cols])
+            show_client_chart(data, client_charts.boxplot_spec('Boxplot Semua Kolom', None, width, height))
+        st.caption("Outlier tidak dikirim satu per satu; arahkan kursor ke kotak untuk melihat kuartil dan jumlah outlier.")
+
+    elif plot_type == "Scatter Plot":
+        if len(numeric_cols) < 2:
+            st.warning("Diperlukan setidaknya dua kolom numerik untuk membuat Scatter Plot.")
+            return
+        x_col = st.selectbox("Pilih Kolom untuk Sumbu X:", numeric_cols, key="x_col")
+        y_col = st.selectbox("Pilih Kolom untuk Sumbu Y:", numeric_cols, key="y_col")
+        st.markdown(f"#### Scatter Plot: {y_col} vs {x_col}")
+        data, binned = profile.derived(('scatter', x_col, y_col), lambda: client_charts.scatter_data(*profile.paired(x_col, y_col)))
+        show_client_chart(data, client_charts.scatter_spec(f'Scatter Plot {y_col} vs {x_col}', str(x_col), str(y_col), width, height, binned))
+        if binned:
+            st.caption(f"Data besar digambar sebagai grid {client_charts.SCATTER_BINS}×{client_charts.SCATTER_BINS} jumlah titik per sel.")
+
+# --- Fungsi Sumber Data Langsung ---
+# Sumber langsung ikut dihapus saat sesinya dihapus pengelola memori (logout atau sesi ditutup)
+governor.on_drop(drop_source)
+
+def poll_live_source(source):
+    """Membaca baris baru dari sumber langsung; dataset sesi diperbarui paling sering sekali per interval publikasi.
+
+    Mengembalikan True bila dataset sesi berubah.
+    """
+    source.poll()
+    rows, replace, sketches = source.take_snapshot()
+    if rows is None and not replace:
+        return False
+    current = None if replace else get_frame('df')
+    if rows is None:
+        rows = pd.DataFrame(columns=source.reader.columns)
+    set_frame('df', rows if current is None else pd.concat([current, rows], ignore_index=True))
+    # Sketsa sumber langsung sudah diperbarui per blok, jadi tidak perlu dibangun ulang dari seluruh data
+    st.session_state['column_sketches'] = (get_frame_version('df'), sketches)
+    return True
+
+def show_live_monitor(source):
+    """Menampilkan statistik berjalan, batas kendali I-MR dan histogram dari sumber langsung."""
+    if not source.sketches:
+        st.info("Menunggu data numerik dari sumber langsung...")
+        return
+    col = st.selectbox("Kolom yang dipantau:", list(source.sketches), key="live_monitor_col")
+    moments = source.sketches[col].moments
+    control = source.control[col]
+    lcl, cl, ucl = control.limits(moments)
+
+    metric_cols = st.columns(5)
+    metric_cols[0].metric("Jumlah Data", f"{moments.n:,}")
+    metric_cols[1].metric("Rata-rata", f"{moments.mean:.4f}")
+    metric_cols[2].metric("Std", f"{moments.std:.4f}")
+    metric_cols[3].metric("LCL / UCL", f"{lcl:.3f} / {ucl:.3f}")
+    metric_cols[4].metric("Di Luar Batas Kendali", f"{control.out_of_control:,}")
+
+    fig, ax = plt.subplots(ncols=2, figsize=(14, 4), gridspec_kw={'width_ratios': [2, 1]})
+    recent = source.recent[col].tail(LIVE_CHART_POINTS).to_numpy(dtype=float, na_value=np.nan)
+    ax[0].plot(recent, marker='o', markersize=2, linewidth=0.8)
+    for value, style, label in [(ucl, '--', 'UCL'), (cl, '-', 'CL'), (lcl, '--', 'LCL')]:
+        ax[0].axhline(value, color='red' if label != 'CL' else 'green', linestyle=style, label=f"{label} = {value:.3f}")
+    outside = (recent > ucl) | (recent < lcl)
+    ax[0].scatter(np.flatnonzero(outside), recent[outside], color='red', zorder=3)
+    ax[0].set_title(f"I-Chart '{col}' ({len(recent)} data terakhir)")
+    ax[0].legend(loc='upper left', fontsize=8)
+
+    histogram = source.histograms[col]
+    ax[1].bar(histogram.edges[:-1], histogram.counts, width=histogram.width, align='edge', edgecolor='white')
+    ax[1].axvline(lcl, color='red', linestyle='--')
+    ax[1].axvline(ucl, color='red', linestyle='--')
+    ax[1].set_title(f"Histogram '{col}' (semua data)")
+    show_figure(fig)
+
+# --- Fungsi Cache Hasil Analisis ---
+def get_dataset_hash():
+    """Hash isi dataset aktif, dihitung sekali per versi data; ditambah penanda pengecualian baris bila aktif."""
+    version = get_frame_version('df')
+    cached = st.session_state.get('dataset_hash')
+    if cached is None or cached[0] != version:
+        cached = (version, dataset_hash(get_frame('df')))
+        st.session_state['dataset_hash'] = cached
+    exclusion = get_quality_exclusion()
+    return cached[1] if exclusion is None else f"{cached[1]}-{exclusion['token']}"
+
+def record_analysis(data_hash, analysis, params, from_cache):
+    """Mencatat analisis ke riwayat dataset, sekali per sesi untuk analisis yang sama."""
+    recorded = st.session_state.setdefault('recorded_analyses', set())
+    key = result_store.make_key(data_hash, analysis, params)
+    if key not in recorded:
+        recorded.add(key)
+        result_store.record(data_hash, analysis, params, st.session_state.get('user_id'), from_cache)
+
+def cached_analysis(analysis, params, compute, data_hash=None):
+    """Mengambil hasil analisis ringan dari cache persisten, atau menghitung dan menyimpannya.
+
+    Analisis yang tidak bergantung pada dataset memberi `data_hash` tetap agar dipakai ulang lintas dataset.
+    """
+    data_hash = data_hash or get_dataset_hash()
+    found, result = result_store.get(data_hash, analysis, params)
+    if not found:
+        result = compute()
+        result_store.put(data_hash, analysis, params, result)
+    record_analysis(data_hash, analysis, params, found)
+    return result
+
+# --- Fungsi Pratinjau Data Berhalaman ---
+def get_preview_positions(df, sort_col, ascending, filter_col, filter_query):
+    """Menghitung urutan baris pratinjau; indeks urutan dan mask filter di-cache per versi data."""
+    version = get_frame_version('df')
+    cache = st.session_state.get('preview_cache')
+    if cache is None or cache['version'] != version:
+        cache = st.session_state['preview_cache'] = {'version': version, 'sort': {}, 'filter': {}}
+
+    if sort_col is None:
+        positions = np.arange(len(df))
+    else:
+        sort_key = (sort_col, ascending)
+        if sort_key not in cache['sort']:
+            cache['sort'][sort_key] = sort_positions(df[sort_col], ascending)
+        positions = cache['sort'][sort_key]
+
+    if filter_col is not None and filter_query.strip():
+        filter_key = (filter_col, filter_query.strip())
+        if filter_key not in cache['filter']:
+            cache['filter'] = {filter_key: filter_mask(df[filter_col], filter_query)}
+        positions = positions[cache['filter'][filter_key][positions]]
+    return positions
+
+def show_data_preview(df, editable=False):
+    """Menampilkan data per halaman sehingga hanya baris yang terlihat yang dikirim ke browser."""
+    no_option = "(tidak ada)"
+    columns = df.columns.tolist()
+    col_sort, col_order, col_filter, col_query = st.columns([3, 2, 3, 3])
+    with col_sort:
+        sort_col = st.selectbox("Urutkan berdasarkan:", [no_option] + columns, key="preview_sort_col")
+    with col_order:
+        ascending = st.radio("Urutan:", ["Naik", "Turun"], key="preview_sort_order", horizontal=True) == "Naik"
+    with col_filter:
+        filter_col = st.selectbox("Filter kolom:", [no_option] + columns, key="preview_filter_col")
+    with col_query:
+        filter_query = st.text_input("Nilai filter:", key="preview_filter_query", placeholder="teks, 10..20, >5")
+
+    positions = get_preview_positions(
+        df,
+        None if sort_col == no_option else sort_col,
+        ascending,
+        None if filter_col == no_option else filter_col,
+        filter_query
+    )
+
+    col_size, col_page = st.columns(2)
+    with col_size:
+        page_size = st.selectbox("Baris per halaman:", PAGE_SIZES, index=1, key="preview_page_size")
+    n_pages = max(1, -(-len(positions) // page_size))
+    with col_page:
+        page = st.number_input("Halaman:", min_value=1, max_value=n_pages, value=1, step=1, key="preview_page")
+    page = min(page, n_pages)
+
+    window = page_window(df, positions, page, page_size)
+    first_row = (page - 1) * page_size + 1 if len(window) else 0
+    st.caption(f"Menampilkan baris {first_row}–{first_row + len(window) - 1 if len(window) else 0} dari {len(positions)}"
+               + (f" (terfilter dari {len(df)})" if len(positions) != len(df) else ""))
+
+    if not editable:
+        st.dataframe(window, use_container_width=True)
+        return df
+
+    # Key editor diganti setiap kali perubahan disimpan agar suntingan tidak diterapkan dua kali
+    revision = st.session_state.get('editor_revision', 0)
+    edited = st.data_editor(window, num_rows="dynamic", use_container_width=True, key=f"editor_{revision}_{page}")
+    merged = merge_edits(df, window, edited)
+    if merged is None:
+        return df
+    set_frame('manual_df', merged)
+    set_frame('df', merged)
+    st.session_state['editor_revision'] = revision + 1
+    st.rerun()
+
+# --- Fungsi Pekerjaan Latar Belakang ---
+def transform_fit_job(ctx, frame, columns, method):
+    """Fit transformasi untuk banyak kolom di latar belakang karena estimasi lambda mahal untuk data besar."""
+    ctx.progress(0.0, f"Fit {method} untuk {len(columns)} kolom...")
+    return fit_transform(frame, columns, method, progress=lambda fraction: ctx.progress(fraction, "Mengestimasi lambda..."))
+
+def anderson_job(ctx, values):
+    """Uji Anderson-Darling di latar belakang."""
+    ctx.progress(0.1, "Menghitung statistik Anderson-Darling...")
+    return stats.anderson(values, dist='norm')
+
+def anova_job(ctx, frame, cols):
+    """ANOVA 1 arah di latar belakang, dengan progres per kolom."""
+    samples = []
+    for i, col in enumerate(cols):
+        ctx.progress(i / (len(cols) + 1), f"Menyiapkan kolom {col}...")
+        samples.append(frame[col].dropna().to_numpy())
+    ctx.progress(len(cols) / (len(cols) + 1), "Menghitung ANOVA...")
+    return stats.f_oneway(*samples)
+
+def group_compare_job(ctx, frame, group_col, value_cols):
+    """Uji perbandingan grup dan statistik boxplot untuk semua kolom nilai di latar belakang."""
+    ctx.progress(0.0, "Menghitung ANOVA, Kruskal-Wallis, Levene dan Bartlett...")
+    results = compare_groups(frame, group_col, value_cols)
+    box_stats = {}
+    for i, col in enumerate(value_cols):
+        ctx.progress(0.5 + 0.5 * i / len(value_cols), f"Menyiapkan boxplot {col}...")
+        box_stats[col] = group_boxplot_stats(frame, group_col, col)
+    return results, box_stats
+
+def timeseries_job(ctx, frame, value_col, time_col, rolling_window, test_window, selected, quantiles, ewma_span):
+    """Statistik bergulir, uji per jendela dan desimasi grafik untuk satu deret waktu."""
+    ctx.progress(0.0, "Menyiapkan deret waktu...")
+    series = prepare_series(frame, value_col, time_col)
+    ctx.progress(0.1, "Menghitung statistik bergulir...")
+    rolling = rolling_stats(series, rolling_window, selected, quantiles, ewma_span)
+    ctx.progress(0.6, "Menghitung uji per jendela...")
+    tests = windowed_tests(series, test_window)
+    ctx.progress(0.9, "Mendesimasi grafik...")
+    indices = decimate_indices(series.to_numpy())
+    return {
+        'n': len(series), 'x': series.index[indices], 'values': series.to_numpy()[indices],
+        'rolling': rolling.iloc[indices].reset_index(drop=True), 'tests': tests,
+    }
+
+def regression_job(ctx, frame, response, predictors, categorical, interaction_order, doe):
+    """Regresi berganda / analisis faktorial dengan akumulasi QR per blok di latar belakang."""
+    ctx.progress(0.0, "Menyiapkan matriks desain...")
+    spec = DesignSpec(frame, response, predictors, categorical, interaction_order)
+    result = fit_regression(frame, spec, progress=lambda fraction, message=None: ctx.progress(0.9 * fraction, message))
+    if doe:
+        ctx.progress(0.95, "Menghitung rata-rata per level faktor...")
+        pairs = [term for term in spec.terms if len(term) == 2]
+        result.factor_means = factor_means(frame, response, predictors, pairs)
+    return result
+
+def gage_rr_job(ctx, frame, part_col, operator_col, value_cols, characteristic_col, study_type):
+    """Studi Gage R&R (metode ANOVA) untuk semua karakteristik sekaligus di latar belakang."""
+    ctx.progress(0.0, "Menyusun data format panjang...")
+    long = gage_rr.to_long(frame, part_col, operator_col, value_cols, characteristic_col)
+    ctx.progress(0.3, "Menghitung komponen varians semua karakteristik...")
+    summary, anova_tables, components = gage_rr.analyze(long, part_col, operator_col, study_type)
+    ctx.progress(0.9, "Menghitung rata-rata per part dan operator...")
+    return {'summary': summary, 'anova': anova_tables, 'components': components,
+            'cell_means': gage_rr.cell_means(long, part_col, operator_col)}
+
+def quality_job(ctx, frame, columns, methods, iqr_k, mad_z, esd_max_outliers, run_length):
+    """Pemeriksaan kualitas data untuk semua kolom terpilih di latar belakang."""
+    return quality.screen(frame, columns, methods, iqr_k=iqr_k, mad_z=mad_z, esd_max_outliers=esd_max_outliers,
+                          run_length=run_length, progress=ctx.progress)
+
+def power_mc_job(ctx, test, effects, ns, alphas, distribution, replicates):
+    """Validasi Monte-Carlo power uji non-parametrik di latar belakang."""
+    return power.simulate_power(test, effects, ns, alphas, distribution, replicates, progress=ctx.progress)
+
+def persistent_job(ctx, data_hash, analysis, params, user_id, fn, *args, **kwargs):
+    """Membungkus pekerjaan agar hasilnya diambil dari atau disimpan ke cache hasil persisten."""
+    found, result = result_store.get(data_hash, analysis, params)
+    if not found:
+        result = fn(ctx, *args, **kwargs)
+        result_store.put(data_hash, analysis, params, result)
+    result_store.record(data_hash, analysis, params, user_id, found)
+    return result
+
+def run_job(name, fn, *args, label=None, use_process=False, params=None, persist=False, full_frame=False,
+            data_hash=None, **kwargs):
+    """Mengirim pekerjaan untuk versi data saat ini; pengiriman yang sama digabung.
+
+    Dengan `persist=True` hasilnya juga disimpan ke cache persisten lintas sesi dan pengguna,
+    dengan kunci `data_hash` bila diberikan (pekerjaan yang tidak membaca dataset).
+    Pekerjaan yang memakai dataset lengkap (`full_frame=True`) tidak bergantung pada pengecualian baris.
+    """
+    exclusion = None if full_frame else get_quality_exclusion()
+    key = make_job_key(name, get_frame_version('df'), exclusion['token'] if exclusion else None, **(params or {}))
+    if persist:
+        args = (data_hash or get_dataset_hash(), name, params, st.session_state.get('user_id'), fn) + args
+        fn = persistent_job
+    finished = st.session_state.setdefault('finished_jobs', {})
+    job = finished.pop(key, None)
+    if job is None:
+        job = runner.submit(key, fn, *args, label=label, use_process=use_process, **kwargs)
+        if not job.done:
+            job.wait(INLINE_WAIT_SECONDS)
+    if job.done:
+        # Pekerjaan selesai (termasuk gagal/dibatalkan) diserahkan ke sesi, jadi registri global
+        # tidak menahan hasilnya dan rerun tidak menjalankannya lagi
+        finished[key] = job
+        for old in list(finished)[:-SESSION_FINISHED_JOBS]:
+            del finished[old]
+        runner.forget(key)
+    return job
+
+def show_job(job):
+    """Menampilkan progres pekerjaan yang masih berjalan; mengembalikan hasilnya bila selesai."""
+    if job.state == DONE:
+        return job.result
+    if job.done:
+        if job.state == FAILED:
+            st.error(f"Gagal menjalankan {job.label}: {job.error}")
+        else:
+            st.warning(f"{job.label} dibatalkan.")
+        if st.button("Jalankan Ulang", key=f"rerun_{job.key}"):
+            st.session_state.get('finished_jobs', {}).pop(job.key, None)
+            runner.forget(job.key)
+            st.rerun()
+        return None
+
+    @st.fragment(run_every=1.0)
+    def job_progress():
+        if job.done:
+            st.rerun()
+        st.progress(job.progress, text=job.message or f"{job.label} sedang diproses...")
+        if not job.cancellable:
+            st.caption(f"{job.label} sudah berjalan di proses terpisah dan tidak bisa dibatalkan; tunggu sampai selesai.")
+        elif st.button("Batalkan", key=f"cancel_{job.key}"):
+            runner.cancel(job.key)
+            st.rerun()
+
+    job_progress()
+    return None
+
 # --- Fungsi Halaman Login dan Register ---
+def show_logo(width):
+    """Menampilkan logo yang sudah diperkecil dan di-encode sekali per proses."""
+    try:
+        st.image(assets.image_source(assets.LOGO_FILE, width, STATIC_SERVING), width=width, output_format="PNG")
+    except FileNotFoundError:
+        st.error(f"File '{assets.LOGO_FILE}' tidak ditemukan. Pastikan file ada di folder yang sama.")
+
 def login_page():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        try:
-            logo_image = Image.open("gambarlogo.png")
-            st.image(logo_image, use_container_width=True)
-        except FileNotFoundError:
-            st.error("File 'gambarlogo.png' tidak ditemukan. Pastikan file ada di folder yang sama.")
+        show_logo(assets.LOGIN_LOGO_WIDTH)
 
     st.subheader("Login")
     
@@ -232,31 +779,126 @@ def register_page():
         st.session_state['page'] = 'login'
         st.rerun()
 
+# --- Fungsi Pengelolaan Pengguna (Admin) ---
+@st.fragment
+def show_user_management():
+    """Daftar pengguna per halaman dengan pencarian dan aksi massal; hanya bagian ini yang dijalankan ulang saat berinteraksi."""
+    counts = count_users()
+    col_pending, col_approved, col_admin = st.columns(3)
+    col_pending.metric("Menunggu Persetujuan", f"{sum(c for (status, _), c in counts.items() if status == 'pending'):,}")
+    col_approved.metric("Pengguna Disetujui", f"{sum(c for (status, _), c in counts.items() if status == 'approved'):,}")
+    col_admin.metric("Admin", f"{sum(c for (_, role), c in counts.items() if role == 'Admin'):,}")
+
+    col_status, col_role, col_search = st.columns(3)
+    status = col_status.selectbox("Status:", USER_STATUSES + ['Semua'], format_func=lambda s: {'pending': 'Menunggu', 'approved': 'Disetujui'}.get(s, s), key="users_status")
+    role = col_role.selectbox("Role:", ['Semua'] + USER_ROLES, key="users_role")
+    prefix = col_search.text_input("Cari ID (awalan):", key="users_search").strip()
+
+    # Awal setiap halaman yang sudah dilalui disimpan agar tombol "Sebelumnya" tetap memakai keyset
+    filters = (status, role, prefix)
+    if st.session_state.get('users_filters') != filters:
+        st.session_state['users_filters'] = filters
+        st.session_state['users_page_starts'] = [None]
+    page_starts = st.session_state['users_page_starts']
+    users, has_more = query_users(
+        status=None if status == 'Semua' else status, role=None if role == 'Semua' else role,
+        prefix=prefix, after=page_starts[-1]
+    )
+    if not users:
+        st.info("Tidak ada pengguna yang cocok dengan filter.")
+        return
+
+    page = pd.DataFrame(users, columns=['ID', 'Role', 'Status'])
+    page.insert(0, 'Pilih', False)
+    edited = st.data_editor(
+        page, hide_index=True, use_container_width=True, disabled=['ID', 'Role', 'Status'],
+        key=f"users_page_{hash((filters, page_starts[-1]))}"
+    )
+    selected = edited.loc[edited['Pilih'], 'ID'].tolist()
+    # Admin tidak bisa menurunkan role atau menghapus akunnya sendiri lewat aksi massal
+    if st.session_state['user_id'] in selected:
+        selected.remove(st.session_state['user_id'])
+        st.caption("Akun Anda sendiri tidak ikut diproses oleh aksi massal.")
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    if col_prev.button("◀ Sebelumnya", disabled=len(page_starts) == 1, key="users_prev"):
+        page_starts.pop()
+        st.rerun(scope="fragment")
+    col_info.caption(f"Halaman {len(page_starts)} · {len(users)} pengguna · {len(selected)} dipilih")
+    if col_next.button("Berikutnya ▶", disabled=not has_more, key="users_next"):
+        page_starts.append(users[-1][0])
+        st.rerun(scope="fragment")
+
+    st.markdown("**Aksi untuk pengguna terpilih**")
+    col_approve, col_new_role, col_role_btn, col_delete = st.columns([1, 1, 1, 1])
+    if col_approve.button("✅ Setujui", disabled=not selected, key="users_bulk_approve"):
+        st.session_state['users_message'] = f"{approve_users(selected)} pengguna berhasil disetujui."
+        st.rerun(scope="fragment")
+    new_role = col_new_role.selectbox("Role baru:", USER_ROLES, key="users_bulk_role", label_visibility="collapsed")
+    if col_role_btn.button("🔁 Ubah Role", disabled=not selected, key="users_bulk_role_btn"):
+        st.session_state['users_message'] = f"Role {update_users_role(selected, new_role)} pengguna diubah menjadi '{new_role}'."
+        st.rerun(scope="fragment")
+    if col_delete.button("🗑️ Hapus", disabled=not selected, key="users_bulk_delete"):
+        st.session_state['users_message'] = f"{delete_users(selected)} pengguna berhasil dihapus."
+        st.session_state['users_page_starts'] = [None]
+        st.rerun(scope="fragment")
+    message = st.session_state.pop('users_message', None)
+    if message:
+        st.success(message)
+
 # --- Fungsi Halaman Utama Aplikasi ---
 def show_main_app():
     col1, col2, col3 = st.columns(3)
     with col1:
         # Menampilkan gambar logo
-        try:
-            logo_image = Image.open("gambarlogo.png")
-            st.image(logo_image, width=300)
-        except FileNotFoundError:
-            st.error("File 'gambarlogo.png' tidak ditemukan. Pastikan file ada di folder yang sama.")
+        show_logo(assets.MAIN_LOGO_WIDTH)
     
     st.markdown("---")
     st.sidebar.markdown(f"Selamat datang, **{st.session_state['user_id']}**!")
+    governor.touch(get_session_id(), st.session_state['user_id'])
 
     # --- Sidebar for Data Input and Manipulation ---
     st.sidebar.header("📁 Input Data")
-    data_source = st.sidebar.radio("Pilih metode input data:", ["Upload File", "Input Manual"])
+    data_source = st.sidebar.radio("Pilih metode input data:", ["Upload File", "Input Manual", "Sumber Langsung"])
+    live_source = None
 
-    if 'df' not in st.session_state:
-        st.session_state['df'] = None
-    
     if data_source == "Upload File":
         # Perbarui file uploader untuk mendukung CSV, XLS, dan XLSX
-        uploaded_file = st.sidebar.file_uploader("Upload file CSV atau Excel", type=["csv", "xlsx", "xls"])
-        
+        uploaded_files = st.sidebar.file_uploader("Upload file CSV atau Excel", type=["csv", "xlsx", "xls"], accept_multiple_files=True)
+        uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+
+        if len(uploaded_files) > 1:
+            # Banyak file ditumpuk menjadi satu dataset dengan kolom sumber
+            st.sidebar.subheader("Pengaturan Banyak File")
+            if any(f.name.lower().endswith('.csv') for f in uploaded_files):
+                separator_option = st.sidebar.selectbox("Pemisah (Delimiter):", [',', ';', '\t'], key="separator_select")
+                encoding_option = st.sidebar.selectbox("Encoding:", ['utf-8', 'latin1', 'ISO-8859-1', 'cp1252'], key="encoding_select")
+            else:
+                separator_option, encoding_option = ',', 'utf-8'
+            st.sidebar.caption(f"File Excel dibaca dari sheet pertama. Asal setiap baris dicatat di kolom '{SOURCE_COLUMN}'.")
+
+            def read_stacked():
+                stacked, errors = stack_files(uploaded_files, sep=separator_option, encoding=encoding_option)
+                st.session_state['ingest_errors'] = errors
+                if stacked is None:
+                    raise ValueError("tidak ada file yang berhasil dibaca")
+                stacked.attrs['ingest_errors'] = errors
+                return stacked
+
+            try:
+                ingest_frame(
+                    (tuple(f.file_id for f in uploaded_files), separator_option, encoding_option),
+                    read_stacked, files=uploaded_files,
+                    # Nama file masuk ke kolom sumber, jadi ikut menentukan kunci cache bersama
+                    settings=('stack', separator_option, encoding_option, tuple(f.name for f in uploaded_files))
+                )
+                ingest_errors = st.session_state.get('ingest_errors', {})
+                st.sidebar.success(f"{len(uploaded_files) - len(ingest_errors)} dari {len(uploaded_files)} file berhasil dibaca dan digabung!")
+            except Exception as e:
+                st.sidebar.error(f"Error saat membaca file: {e}. Coba ganti opsi 'Pemisah' atau 'Encoding'.")
+            for name, error in st.session_state.get('ingest_errors', {}).items():
+                st.sidebar.warning(f"'{name}' dilewati: {error}")
+
         if uploaded_file is not None:
             # Deteksi jenis file berdasarkan ekstensinya
             file_extension = uploaded_file.name.split('.')[-1]
@@ -267,7 +909,11 @@ def show_main_app():
                 encoding_option = st.sidebar.selectbox("Encoding:", ['utf-8', 'latin1', 'ISO-8859-1', 'cp1252'], key="encoding_select")
                 
                 try:
-                    st.session_state['df'] = pd.read_csv(uploaded_file, sep=separator_option, encoding=encoding_option)
+                    ingest_frame(
+                        (uploaded_file.file_id, separator_option, encoding_option),
+                        lambda: pd.read_csv(uploaded_file, sep=separator_option, encoding=encoding_option),
+                        files=[uploaded_file], settings=('csv', separator_option, encoding_option)
+                    )
                     st.sidebar.success("File CSV berhasil diunggah dan dibaca!")
                 except Exception as e:
                     st.sidebar.error(f"Error saat membaca file CSV: {e}. Coba ganti opsi 'Pemisah' atau 'Encoding'.")
@@ -280,7 +926,11 @@ def show_main_app():
                     sheet_names = excel_file.sheet_names
                     
                     selected_sheet = st.sidebar.selectbox("Pilih Sheet:", sheet_names, key="sheet_select")
-                    st.session_state['df'] = pd.read_excel(excel_file, sheet_name=selected_sheet)
+                    ingest_frame(
+                        (uploaded_file.file_id, selected_sheet),
+                        lambda: pd.read_excel(excel_file, sheet_name=selected_sheet),
+                        files=[uploaded_file], settings=('excel', selected_sheet)
+                    )
                     st.sidebar.success(f"File Excel berhasil diunggah dan sheet '{selected_sheet}' berhasil dibaca!")
                 except Exception as e:
                     st.sidebar.error(f"Error saat membaca file Excel: {e}. Pastikan format file benar.")
@@ -288,45 +938,78 @@ def show_main_app():
             else:
                 st.sidebar.warning("Format file tidak didukung.")
 
+    elif data_source == "Sumber Langsung":
+        st.sidebar.info("Memantau file CSV yang terus ditambah (mis. ekspor MES). Hanya baris baru yang dibaca.")
+        live_path = st.sidebar.text_input("Path file atau folder:", key="live_path", placeholder="mis. D:/MES/hasil.csv atau D:/MES/")
+        live_pattern = st.sidebar.text_input("Pola nama file (untuk folder):", value="*.csv", key="live_pattern")
+        live_separator = st.sidebar.selectbox("Pemisah (Delimiter):", [',', ';', '\t'], key="live_separator")
+        live_encoding = st.sidebar.selectbox("Encoding:", ['utf-8', 'latin1', 'ISO-8859-1', 'cp1252'], key="live_encoding")
+        live_interval = st.sidebar.number_input("Interval refresh (detik):", min_value=1, max_value=60, value=2, key="live_interval")
+        live_full_refresh = st.sidebar.checkbox(
+            "Perbarui semua tab otomatis", key="live_full_refresh",
+            help=f"Tab analisis memakai data yang digabung paling sering setiap {LIVE_PUBLISH_SECONDS:g} detik. "
+                 "Bila nonaktif, hanya panel pemantauan yang diperbarui; tab lain memakai data itu saat Anda berinteraksi."
+        )
+
+        if live_path:
+            live_key = ('live', live_path, live_pattern, live_separator, live_encoding)
+            if st.session_state.get('ingest_key') != live_key:
+                # Sumber baru: mulai membaca dari awal file
+                drop_source(get_session_id())
+                st.session_state['ingest_key'] = live_key
+            live_source = get_source(get_session_id(), live_path, live_pattern, live_separator, live_encoding)
+            poll_live_source(live_source)
+            if live_source.error:
+                st.sidebar.error(f"Error saat membaca sumber langsung: {live_source.error}")
+            elif live_source.reader.current_file is None:
+                st.sidebar.warning("File tidak ditemukan. Periksa path atau pola nama file.")
+            else:
+                st.sidebar.success(f"Memantau '{os.path.basename(live_source.reader.current_file)}' ({live_source.rows:,} baris).")
+
     else: # data_source == "Input Manual"
         st.sidebar.info("Gunakan editor dan tombol di sidebar untuk input data manual.")
+        st.session_state.pop('ingest_key', None)
 
-        if 'manual_df' not in st.session_state:
-            st.session_state['manual_df'] = pd.DataFrame({
+        manual_df = get_frame('manual_df')
+        if manual_df is None:
+            manual_df = pd.DataFrame({
                 'Grup': ['Sample1', 'Sample2', 'Sample3', 'Sample4', 'Sample5'],
                 'A': [10.2, 10.5, 10.4, 10.3, 10.6],
                 'B': [11.3, 11.1, 11.2, 11.0, 11.4]
             })
+            set_frame('manual_df', manual_df)
         
         st.sidebar.markdown("---")
         st.sidebar.subheader("⚙️ Atur Data Manual")
         
         if st.sidebar.button("➕ Tambah Baris"):
-            current_cols = st.session_state['manual_df'].columns
-            new_row = {col: 'new_sample' if st.session_state['manual_df'][col].dtype == 'object' else 0 for col in current_cols}
-            st.session_state['manual_df'] = pd.concat([st.session_state['manual_df'], pd.DataFrame([new_row])], ignore_index=True)
+            current_cols = manual_df.columns
+            new_row = {col: 'new_sample' if manual_df[col].dtype == 'object' else 0 for col in current_cols}
+            set_frame('manual_df', pd.concat([manual_df, pd.DataFrame([new_row])], ignore_index=True))
             st.rerun()
         
         new_col_name = st.sidebar.text_input("Nama Kolom Baru:", placeholder="e.g., C")
         if st.sidebar.button("➕ Tambah Kolom"):
-            if new_col_name and new_col_name not in st.session_state['manual_df'].columns:
-                st.session_state['manual_df'][new_col_name] = [0.0] * len(st.session_state['manual_df'])
+            if new_col_name and new_col_name not in manual_df.columns:
+                manual_df = manual_df.copy()
+                manual_df[new_col_name] = [0.0] * len(manual_df)
+                set_frame('manual_df', manual_df)
                 st.sidebar.success(f"Kolom '{new_col_name}' berhasil ditambahkan.")
                 st.rerun()
-            elif new_col_name in st.session_state['manual_df'].columns:
+            elif new_col_name in manual_df.columns:
                 st.sidebar.warning(f"Kolom '{new_col_name}' sudah ada.")
             else:
                 st.sidebar.warning("Nama kolom tidak boleh kosong.")
         
         st.sidebar.markdown("---")
         st.sidebar.subheader("✏️ Ganti Nama Kolom")
-        current_cols_options = st.session_state['manual_df'].columns.tolist()
+        current_cols_options = manual_df.columns.tolist()
         col_to_rename = st.sidebar.selectbox("Pilih Kolom yang Akan Diganti:", current_cols_options, key="rename_select")
         new_col_name_input = st.sidebar.text_input("Nama Kolom Baru:", placeholder="Nama baru", key="rename_input")
 
         if st.sidebar.button("✅ Ganti Nama"):
             if new_col_name_input and new_col_name_input not in current_cols_options:
-                st.session_state['manual_df'] = st.session_state['manual_df'].rename(columns={col_to_rename: new_col_name_input})
+                set_frame('manual_df', manual_df.rename(columns={col_to_rename: new_col_name_input}))
                 st.sidebar.success(f"Nama kolom '{col_to_rename}' berhasil diganti menjadi '{new_col_name_input}'.")
                 st.rerun()
             elif new_col_name_input in current_cols_options:
@@ -334,18 +1017,32 @@ def show_main_app():
             else:
                 st.sidebar.warning("Nama baru tidak boleh kosong.")
         
-        st.session_state['df'] = st.session_state['manual_df']
+        set_frame('df', manual_df)
 
     # Log out button
     if st.sidebar.button("Keluar"):
         st.session_state['logged_in'] = False
         st.session_state['user_id'] = None
         st.session_state['user_role'] = None
-        st.session_state['df'] = None  # Clear data on logout
+        governor.drop_session(get_session_id())  # Clear data on logout
         st.rerun()
 
+    # --- Panel Pemantauan Sumber Langsung ---
+    if live_source is not None:
+        st.subheader("📡 Pemantauan Langsung")
+
+        @st.fragment(run_every=float(live_interval))
+        def live_panel():
+            if poll_live_source(live_source) and live_full_refresh:
+                st.rerun()
+            show_live_monitor(live_source)
+
+        live_panel()
+        st.markdown("---")
+
     # --- Main Content with Tabs ---
-    if st.session_state['df'] is not None:
+    df = get_frame('df')
+    if df is not None:
         
         # Dapatkan status fitur dari database
         feature_status = get_feature_status()
@@ -371,21 +1068,32 @@ def show_main_app():
             with col_data:
                 if data_source == "Input Manual":
                     st.subheader("Data Manual")
-                    edited_df = st.data_editor(st.session_state['df'], num_rows="dynamic", use_container_width=True)
-                    st.session_state['df'] = edited_df
+                    df = show_data_preview(df, editable=True)
                 else:
                     st.subheader("Data yang Diunggah")
-                    st.dataframe(st.session_state['df'], use_container_width=True)
+                    df = show_data_preview(df)
 
             with col_desc:
                 st.subheader("Statistik Deskriptif")
-                st.dataframe(st.session_state['df'].describe(), use_container_width=True)
+                exact_quantiles = st.toggle(
+                    "Kuantil eksak",
+                    value=len(df) <= EXACT_ROW_LIMIT,
+                    key="exact_quantiles",
+                    help="Nonaktifkan untuk menghitung kuartil dan median dari sketsa kuantil (lebih cepat untuk data besar)."
+                )
+                if exact_quantiles:
+                    st.dataframe(df.describe(), use_container_width=True)
+                else:
+                    column_sketches = get_column_sketches(df)
+                    st.dataframe(describe_from_sketches(column_sketches), use_container_width=True)
+                    st.caption(f"Kuartil diperkirakan dengan sketsa KLL. Galat peringkat maksimum ±{max_rank_error(column_sketches):.2%}; count, mean, std, min dan max eksak.")
 
             st.markdown("---")
             
             with st.expander("📈 Visualisasi Data"):
                 st.write("Visualisasi Data:")
-                numeric_cols = st.session_state['df'].select_dtypes(include=np.number).columns.tolist()
+                profile = get_column_profile(df)
+                numeric_cols = profile.numeric_cols
                 
                 if not numeric_cols:
                     st.warning("Tidak ada kolom numerik untuk divisualisasikan.")
@@ -404,6 +1112,10 @@ def show_main_app():
                         st.warning("Tidak ada fitur visualisasi yang diaktifkan oleh admin.")
                     else:
                         plot_type = st.selectbox("Pilih Jenis Grafik:", enabled_plot_options)
+                        chart_mode = st.radio(
+                            "Mode grafik:", CHART_MODES, horizontal=True, key="chart_mode",
+                            help="Interaktif: hanya data teragregasi yang dikirim dan grafik digambar di browser. Gambar: dirender server dengan matplotlib dan bisa diunduh sebagai PNG."
+                        )
                         
                         if plot_type != "Heatmap":
                             plot_mode = st.radio("Pilih Tampilan Grafik:", ["Grafik Terpisah", "Satu Grafik"])
@@ -421,7 +1133,10 @@ def show_main_app():
                             plot_width = st.slider("Lebar Grafik", 4, 20, 15, key="plot_width_single")
                             plot_height = st.slider("Tinggi Grafik", 3, 15, 8, key="plot_height_single")
 
-                        if plot_type == "Heatmap":
+                        if chart_mode == CHART_MODES[0] and not (plot_type == "Scatter Plot" and plot_mode == "Satu Grafik"):
+                            show_client_visualization(df, profile, numeric_cols, plot_type, plot_mode, plot_width, plot_height, exact_quantiles)
+
+                        elif plot_type == "Heatmap":
                             if len(numeric_cols) < 2:
                                 st.warning("Diperlukan setidaknya dua kolom numerik untuk membuat Heatmap.")
                             else:
@@ -434,7 +1149,7 @@ def show_main_app():
                                 )
 
                                 if selected_cols:
-                                    df_selected = st.session_state['df'][selected_cols].copy()
+                                    df_selected = df[selected_cols].copy()
                                     corr_matrix = df_selected.corr()
 
                                     fig, ax = plt.subplots(figsize=(plot_width, plot_height))
@@ -451,6 +1166,7 @@ def show_main_app():
 
                                     buf = BytesIO()
                                     fig.savefig(buf, format="png", bbox_inches="tight")
+                                    plt.close(fig)
                                     st.download_button(
                                         label="⬇️ Unduh Heatmap (PNG)",
                                         data=buf.getvalue(),
@@ -469,20 +1185,26 @@ def show_main_app():
                                 for col in numeric_cols:
                                     st.markdown(f"#### Distribusi untuk Kolom: **{col}**")
                                     fig, ax = plt.subplots(figsize=(plot_width, plot_height))
-                                    st.session_state['df'][col].hist(ax=ax, bins=20, edgecolor='black')
+                                    ax.hist(profile.values(col), bins=20, edgecolor='black')
+                                    ax.grid(True)
                                     ax.set_title(f'Histogram untuk {col}')
                                     ax.set_xlabel(col)
                                     ax.set_ylabel('Frekuensi')
-                                    st.pyplot(fig)
+                                    show_figure(fig)
                             
                             elif plot_type == "Boxplot":
                                 for col in numeric_cols:
                                     st.markdown(f"#### Boxplot untuk Kolom: **{col}**")
                                     fig, ax = plt.subplots(figsize=(plot_width, plot_height))
-                                    sns.boxplot(y=st.session_state['df'][col], ax=ax)
+                                    if exact_quantiles:
+                                        sns.boxplot(y=df[col], ax=ax)
+                                    else:
+                                        box_stats = get_column_sketches(df)[col].boxplot_stats(col)
+                                        ax.bxp([box_stats], showfliers=False)
+                                        st.caption(f"Boxplot dari sketsa kuantil; perkiraan jumlah outlier (di luar 1.5×IQR): {box_stats['n_outliers']}")
                                     ax.set_title(f'Boxplot untuk {col}')
                                     ax.set_ylabel(col)
-                                    st.pyplot(fig)
+                                    show_figure(fig)
                             
                             elif plot_type == "Scatter Plot":
                                 if len(numeric_cols) < 2:
@@ -493,37 +1215,56 @@ def show_main_app():
                                     
                                     st.markdown(f"#### Scatter Plot: {y_col} vs {x_col}")
                                     fig, ax = plt.subplots(figsize=(plot_width, plot_height))
-                                    sns.scatterplot(data=st.session_state['df'], x=x_col, y=y_col, ax=ax)
+                                    sns.scatterplot(data=df, x=x_col, y=y_col, ax=ax)
                                     ax.set_title(f'Scatter Plot {y_col} vs {x_col}')
                                     ax.set_xlabel(x_col)
                                     ax.set_ylabel(y_col)
-                                    st.pyplot(fig)
+                                    show_figure(fig)
                         
                         else: # plot_mode == "Satu Grafik"
                             if plot_type == "Histogram":
                                 st.markdown("#### Histogram Semua Kolom dalam Satu Grafik")
                                 fig, ax = plt.subplots(figsize=(plot_width, plot_height))
-                                st.session_state['df'][numeric_cols].hist(ax=ax)
+                                df[numeric_cols].hist(ax=ax)
                                 fig.suptitle("Histogram Semua Kolom", fontsize=16)
-                                st.pyplot(fig)
+                                show_figure(fig)
 
                             elif plot_type == "Boxplot":
                                 st.markdown("#### Boxplot Semua Kolom dalam Satu Grafik")
                                 fig, ax = plt.subplots(figsize=(plot_width, plot_height))
-                                sns.boxplot(data=st.session_state['df'][numeric_cols], ax=ax)
+                                if exact_quantiles:
+                                    sns.boxplot(data=df[numeric_cols], ax=ax)
+                                else:
+                                    column_sketches = get_column_sketches(df)
+                                    ax.bxp([column_sketches[col].boxplot_stats(col) for col in numeric_cols], showfliers=False)
+                                    st.caption("Boxplot dari sketsa kuantil; outlier tidak digambar satu per satu.")
                                 ax.set_title('Boxplot Semua Kolom')
-                                st.pyplot(fig)
+                                show_figure(fig)
 
                             elif plot_type == "Scatter Plot":
                                 st.markdown("#### Pairplot / Scatter Plot Matrix")
                                 st.info("Visualisasi ini menunjukkan hubungan antara semua pasangan kolom numerik.")
-                                fig = sns.pairplot(st.session_state['df'][numeric_cols])
-                                st.pyplot(fig)
+                                job = run_job(
+                                    'pairplot', render_pairplot_png, df[numeric_cols],
+                                    label="Pairplot", use_process=True, params={'cols': tuple(numeric_cols)}, full_frame=True
+                                )
+                                pairplot_png = show_job(job)
+                                if pairplot_png is not None:
+                                    st.image(pairplot_png)
 
         with tabs[tab_mapping["🛠️ Analisis Data"]]:
             st.header("Fitur Analisis Data")
-            
-            numeric_cols = st.session_state['df'].select_dtypes(include=np.number).columns.tolist()
+
+            exclusion = get_quality_exclusion()
+            if exclusion is not None:
+                col_note, col_reset = st.columns([4, 1])
+                col_note.info(f"{exclusion['n_excluded']:,} baris bertanda ({', '.join(exclusion['methods'])}) dikecualikan dari semua analisis di tab ini.")
+                if col_reset.button("Sertakan Kembali", key="quality_include_all"):
+                    clear_quality_exclusion()
+                    st.rerun()
+            df = get_analysis_frame(df)
+            profile = get_column_profile(df, variant=exclusion['token'] if exclusion else '')
+            numeric_cols = profile.numeric_cols
             if not numeric_cols:
                 st.warning("Data tidak memiliki kolom numerik. Silakan periksa tab 'Input Data' untuk memasukkan data yang valid.")
             
@@ -534,10 +1275,32 @@ def show_main_app():
                 enabled_analysis_options.append("Uji Hipotesis")
             if feature_status['Uji Normalitas']:
                 enabled_analysis_options.append("Uji Normalitas")
+            if feature_status.get('Laporan Lengkap', False):
+                enabled_analysis_options.append("Laporan Lengkap")
+            if feature_status.get('Perbandingan Grup', False):
+                enabled_analysis_options.append("Perbandingan Grup")
+            if feature_status.get('Deret Waktu', False):
+                enabled_analysis_options.append("Deret Waktu")
+            if feature_status.get('Regresi & DOE', False):
+                enabled_analysis_options.append("Regresi & DOE")
+            if feature_status.get('Gage R&R', False):
+                enabled_analysis_options.append("Gage R&R")
+            if feature_status.get('Kualitas Data', False):
+                enabled_analysis_options.append("Kualitas Data")
+            if feature_status.get('Perencanaan Sampel', False):
+                enabled_analysis_options.append("Perencanaan Sampel")
 
             if not enabled_analysis_options:
                 st.warning("Tidak ada fitur analisis yang diaktifkan oleh admin.")
             else:
+                with st.expander("🕘 Riwayat Analisis Dataset Ini"):
+                    history_df = result_store.history(get_dataset_hash())
+                    if history_df.empty:
+                        st.info("Belum ada analisis yang tercatat untuk dataset ini.")
+                    else:
+                        st.caption("Analisis yang pernah dijalankan pada data dengan isi yang sama, dari semua sesi dan pengguna.")
+                        st.dataframe(history_df, use_container_width=True)
+
                 analysis_type = st.radio("Pilih jenis analisis:", enabled_analysis_options)
         
                 if analysis_type == "Uji Hipotesis":
@@ -555,7 +1318,7 @@ def show_main_app():
                         if numeric_cols:
                             column = st.selectbox("Kolom yang diuji:", numeric_cols)
                             mu = st.number_input("Masukkan nilai rata-rata populasi (μ₀):", value=0.0)
-                            t_stat, p_val = stats.ttest_1samp(st.session_state['df'][column].dropna(), mu, nan_policy='omit')
+                            t_stat, p_val = stats.ttest_1samp(profile.values(column), mu)
                             st.info(f"**Hasil Uji-t 1 Sampel:**")
                             st.write(f"t-statistik = `{t_stat:.4f}`")
                             st.write(f"p-value = `{p_val:.4f}`")
@@ -571,7 +1334,7 @@ def show_main_app():
                             col1 = st.selectbox("Pilih kolom grup 1:", numeric_cols, key='ttest_ind_1')
                             col2 = st.selectbox("Pilih kolom grup 2:", numeric_cols, key='ttest_ind_2')
                             if col1 != col2:
-                                t_stat, p_val = stats.ttest_ind(st.session_state['df'][col1].dropna(), st.session_state['df'][col2].dropna(), nan_policy='omit')
+                                t_stat, p_val = stats.ttest_ind(profile.values(col1), profile.values(col2))
                                 st.info(f"**Hasil Uji-t 2 Sampel:**")
                                 st.write(f"t-statistik = `{t_stat:.4f}`")
                                 st.write(f"p-value = `{p_val:.4f}`")
@@ -589,7 +1352,7 @@ def show_main_app():
                             col1 = st.selectbox("Pilih kolom pertama:", numeric_cols, key='ttest_paired_1')
                             col2 = st.selectbox("Pilih kolom kedua:", numeric_cols, key='ttest_paired_2')
                             if col1 != col2:
-                                t_stat, p_val = stats.ttest_rel(st.session_state['df'][col1].dropna(), st.session_state['df'][col2].dropna())
+                                t_stat, p_val = stats.ttest_rel(*profile.paired(col1, col2))
                                 st.info(f"**Hasil Uji-t Paired:**")
                                 st.write(f"t-statistik = `{t_stat:.4f}`")
                                 st.write(f"p-value = `{p_val:.4f}`")
@@ -607,7 +1370,7 @@ def show_main_app():
                             column = st.selectbox("Kolom yang diuji:", numeric_cols)
                             mu = st.number_input("Masukkan nilai rata-rata populasi (μ₀):", value=0.0)
                             sigma = st.number_input("Masukkan standar deviasi populasi (σ):", value=1.0)
-                            data_to_test = st.session_state['df'][column].dropna()
+                            data_to_test = profile.values(column)
                             n = len(data_to_test)
                             if n > 0 and sigma > 0:
                                 x_bar = np.mean(data_to_test)
@@ -677,8 +1440,8 @@ def show_main_app():
                             col1 = st.selectbox("Pilih kolom grup 1:", numeric_cols, key='ftest_1')
                             col2 = st.selectbox("Pilih kolom grup 2:", numeric_cols, key='ftest_2')
                             if col1 != col2:
-                                data1 = st.session_state['df'][col1].dropna()
-                                data2 = st.session_state['df'][col2].dropna()
+                                data1 = profile.values(col1)
+                                data2 = profile.values(col2)
                                 var1 = np.var(data1, ddof=1)
                                 var2 = np.var(data2, ddof=1)
                                 
@@ -710,15 +1473,17 @@ def show_main_app():
                     elif test_type == "ANOVA 1 Arah":
                         cols = st.multiselect("Pilih kolom numerik:", numeric_cols)
                         if len(cols) > 1:
-                            samples = [st.session_state['df'][col].dropna() for col in cols]
-                            f_stat, p_val = stats.f_oneway(*samples)
-                            st.info(f"**Hasil ANOVA 1 Arah:**")
-                            st.write(f"F-statistik = `{f_stat:.4f}`")
-                            st.write(f"p-value = `{p_val:.4f}`")
-                            if p_val < alpha:
-                                st.success(f"**Kesimpulan:** Tolak H₀ (Ada perbedaan rata-rata signifikan) karena p-value < α ({alpha}).")
-                            else:
-                                st.error(f"**Kesimpulan:** Gagal tolak H₀ (Tidak ada perbedaan rata-rata signifikan) karena p-value ≥ α ({alpha}).")
+                            job = run_job('anova', anova_job, df, cols, label="ANOVA 1 Arah", params={'cols': tuple(cols)}, persist=True)
+                            anova_result = show_job(job)
+                            if anova_result is not None:
+                                f_stat, p_val = anova_result
+                                st.info(f"**Hasil ANOVA 1 Arah:**")
+                                st.write(f"F-statistik = `{f_stat:.4f}`")
+                                st.write(f"p-value = `{p_val:.4f}`")
+                                if p_val < alpha:
+                                    st.success(f"**Kesimpulan:** Tolak H₀ (Ada perbedaan rata-rata signifikan) karena p-value < α ({alpha}).")
+                                else:
+                                    st.error(f"**Kesimpulan:** Gagal tolak H₀ (Tidak ada perbedaan rata-rata signifikan) karena p-value ≥ α ({alpha}).")
                         else:
                             st.warning("Pilih setidaknya dua kolom.")
             
@@ -727,7 +1492,7 @@ def show_main_app():
                             col1 = st.selectbox("Pilih kolom grup 1:", numeric_cols, key='mann_whitney_1')
                             col2 = st.selectbox("Pilih kolom grup 2:", numeric_cols, key='mann_whitney_2')
                             if col1 != col2:
-                                u_stat, p_val = stats.mannwhitneyu(st.session_state['df'][col1].dropna(), st.session_state['df'][col2].dropna(), alternative='two-sided')
+                                u_stat, p_val = stats.mannwhitneyu(profile.values(col1), profile.values(col2), alternative='two-sided')
                                 st.info(f"**Hasil Uji Mann-Whitney U:**")
                                 st.write(f"U-statistik = `{u_stat:.4f}`")
                                 st.write(f"p-value = `{p_val:.4f}`")
@@ -745,7 +1510,7 @@ def show_main_app():
                             col1 = st.selectbox("Pilih kolom pertama:", numeric_cols, key='wilcoxon_1')
                             col2 = st.selectbox("Pilih kolom kedua:", numeric_cols, key='wilcoxon_2')
                             if col1 != col2:
-                                w_stat, p_val = stats.wilcoxon(st.session_state['df'][col1].dropna(), st.session_state['df'][col2].dropna())
+                                w_stat, p_val = stats.wilcoxon(*profile.paired(col1, col2))
                                 st.info(f"**Hasil Uji Wilcoxon Signed-Rank:**")
                                 st.write(f"W-statistik = `{w_stat:.4f}`")
                                 st.write(f"p-value = `{p_val:.4f}`")
@@ -770,13 +1535,13 @@ def show_main_app():
                             "D'Agostino's K²"
                         ])
                         
-                        data_to_test = st.session_state['df'][column].dropna()
+                        data_to_test = profile.values(column)
                         
-                        if data_to_test.empty:
+                        if data_to_test.size == 0:
                             st.warning("Kolom yang dipilih tidak memiliki data.")
                         else:
                             if test_method == "Shapiro-Wilk":
-                                stat, p_val = stats.shapiro(data_to_test)
+                                stat, p_val = cached_analysis('shapiro', {'column': column}, lambda: tuple(stats.shapiro(data_to_test)))
                                 st.info(f"**Hasil Uji Shapiro-Wilk:**")
                                 st.write(f"W-statistik = `{stat:.4f}`")
                                 st.write(f"p-value = `{p_val:.4f}`")
@@ -788,7 +1553,7 @@ def show_main_app():
                             elif test_method == "Ryan-Joiner":
                                 st.info("Catatan: Fungsi bawaan Python untuk Ryan-Joiner tidak tersedia. "
                                     "Kami menggunakan Uji Shapiro-Wilk, yang memberikan hasil sangat mirip.")
-                                stat, p_val = stats.shapiro(data_to_test)
+                                stat, p_val = cached_analysis('shapiro', {'column': column}, lambda: tuple(stats.shapiro(data_to_test)))
                                 st.info(f"**Hasil Uji Ryan-Joiner (menggunakan Shapiro-Wilk):**")
                                 st.write(f"W-statistik = `{stat:.4f}`")
                                 st.write(f"p-value = `{p_val:.4f}`")
@@ -799,8 +1564,8 @@ def show_main_app():
 
                             elif test_method == "Kolmogorov-Smirnov":
                                 mean = data_to_test.mean()
-                                std = data_to_test.std()
-                                stat, p_val = stats.kstest(data_to_test, 'norm', args=(mean, std))
+                                std = data_to_test.std(ddof=1)
+                                stat, p_val = cached_analysis('kstest', {'column': column}, lambda: tuple(stats.kstest(data_to_test, 'norm', args=(mean, std))))
                                 st.info(f"**Hasil Uji Kolmogorov-Smirnov:**")
                                 st.write(f"D-statistik = `{stat:.4f}`")
                                 st.write(f"p-value = `{p_val:.4f}`")
@@ -810,28 +1575,33 @@ def show_main_app():
                                     st.error("**Kesimpulan:** Data **tidak normal** (Tolak H₀) karena p-value ≤ 0.05.")
 
                             elif test_method == "Anderson-Darling":
-                                result = stats.anderson(data_to_test, dist='norm')
-                                st.info(f"**Hasil Uji Anderson-Darling:**")
-                                st.write(f"A-statistik = `{result.statistic:.4f}`")
-                                st.write("Nilai Kritis:")
-                                
-                                for i in range(len(result.critical_values)):
-                                    st.write(f"  - Tingkat Signifikansi: {result.significance_level[i]}% -> Nilai Kritis: {result.critical_values[i]:.4f}")
-                                
-                                st.write("---")
-                                is_normal = True
-                                for i in range(len(result.critical_values)):
-                                    if result.statistic > result.critical_values[i]:
-                                        is_normal = False
-                                        break
-                                
-                                if is_normal:
-                                    st.success("**Kesimpulan:** Data **normal** (A-statistik < nilai kritis pada semua tingkat signifikansi yang diuji).")
-                                else:
-                                    st.error("**Kesimpulan:** Data **tidak normal** (A-statistik > nilai kritis pada tingkat signifikansi terkecil).")
+                                job = run_job(
+                                    'anderson', anderson_job, data_to_test,
+                                    label="Uji Anderson-Darling", params={'column': column}, persist=True
+                                )
+                                result = show_job(job)
+                                if result is not None:
+                                    st.info(f"**Hasil Uji Anderson-Darling:**")
+                                    st.write(f"A-statistik = `{result.statistic:.4f}`")
+                                    st.write("Nilai Kritis:")
+                                    
+                                    for i in range(len(result.critical_values)):
+                                        st.write(f"  - Tingkat Signifikansi: {result.significance_level[i]}% -> Nilai Kritis: {result.critical_values[i]:.4f}")
+                                    
+                                    st.write("---")
+                                    is_normal = True
+                                    for i in range(len(result.critical_values)):
+                                        if result.statistic > result.critical_values[i]:
+                                            is_normal = False
+                                            break
+                                    
+                                    if is_normal:
+                                        st.success("**Kesimpulan:** Data **normal** (A-statistik < nilai kritis pada semua tingkat signifikansi yang diuji).")
+                                    else:
+                                        st.error("**Kesimpulan:** Data **tidak normal** (A-statistik > nilai kritis pada tingkat signifikansi terkecil).")
 
                             elif test_method == "D'Agostino's K²":
-                                stat, p_val = stats.normaltest(data_to_test)
+                                stat, p_val = cached_analysis('dagostino', {'column': column}, lambda: tuple(stats.normaltest(data_to_test)))
                                 st.info(f"**Hasil Uji D'Agostino's K²:**")
                                 st.write(f"K²-statistik = `{stat:.4f}`")
                                 st.write(f"p-value = `{p_val:.4f}`")
@@ -850,7 +1620,7 @@ def show_main_app():
                             fig, ax = plt.subplots(figsize=(plot_width, plot_height))
                             sm.qqplot(data_to_test, line='s', ax=ax)
                             ax.set_title(f"Q-Q Plot untuk Kolom '{column}'")
-                            st.pyplot(fig)
+                            show_figure(fig)
             
                     else:
                         st.warning("Tidak ada kolom numerik yang tersedia.")
@@ -858,84 +1628,616 @@ def show_main_app():
                 elif analysis_type == "Normalisasi Data":
                     st.subheader("🔄 Normalisasi & Transformasi Data")
                     if numeric_cols:
-                        column_to_normalize = st.selectbox("Pilih kolom untuk diproses:", numeric_cols)
-                        transform_method = st.selectbox("Pilih metode:", ["Min-Max Scaling", "Standardize (Z-Score)", "Box-Cox Transform", "Log Transform"])
+                        columns_to_transform = st.multiselect("Pilih kolom untuk diproses:", numeric_cols, default=numeric_cols[:1], key="transform_cols")
+                        transform_method = st.selectbox("Pilih metode:", TRANSFORM_METHODS, key="transform_method")
 
                         st.markdown("---")
-                        if st.button("Lakukan Transformasi"):
-                            original_data = st.session_state['df'][column_to_normalize].dropna()
-                            
-                            if original_data.empty:
-                                st.warning("Kolom yang dipilih tidak memiliki data.")
-                            else:
-                                transformed_data = None
-                                method_name = ""
-
-                                if transform_method == "Min-Max Scaling":
-                                    min_val = original_data.min()
-                                    max_val = original_data.max()
-                                    if max_val - min_val == 0:
-                                        st.error("Kolom memiliki nilai konstan, tidak dapat di-Min-Max Scaling.")
-                                    else:
-                                        transformed_data = (original_data - min_val) / (max_val - min_val)
-                                        method_name = "Min-Max Scaling"
-                                
-                                elif transform_method == "Standardize (Z-Score)":
-                                    mean_val = original_data.mean()
-                                    std_val = original_data.std()
-                                    if std_val == 0:
-                                        st.error("Kolom memiliki standar deviasi nol, tidak dapat di-Standardize.")
-                                    else:
-                                        transformed_data = (original_data - mean_val) / std_val
-                                        method_name = "Standardize (Z-Score)"
+                        # Syarat metode dicek dari profil kolom, jadi data yang tidak valid tidak sampai menjalankan fit
+                        invalid_cols = []
+                        if transform_method in (LOG, BOXCOX):
+                            invalid_cols = profile.non_positive(columns_to_transform)
+                            if invalid_cols:
+                                st.warning(f"{transform_method} hanya dapat digunakan pada data positif. Kolom bermasalah: {', '.join(map(str, invalid_cols))}")
+                        elif transform_method == MINMAX:
+                            invalid_cols = profile.constant(columns_to_transform)
+                            if invalid_cols:
+                                st.warning(f"Kolom bernilai konstan, tidak dapat di-Min-Max Scaling: {', '.join(map(str, invalid_cols))}")
+                        transform_request = (tuple(columns_to_transform), transform_method)
+                        if st.button("Lakukan Transformasi", disabled=not columns_to_transform or bool(invalid_cols)):
+                            st.session_state['transform_request'] = transform_request
+
+                        # Permintaan disimpan agar hasil tetap tampil selama rerun (mis. saat fit lambda berjalan)
+                        if columns_to_transform and not invalid_cols and st.session_state.get('transform_request') == transform_request:
+                            job = run_job(
+                                'transform_fit', transform_fit_job, df, list(columns_to_transform), transform_method,
+                                label=transform_method, params={'columns': transform_request[0], 'method': transform_method}, persist=True
+                            )
+                            fitted = show_job(job)
+                            if fitted is not None:
+                                # Transformasi terakhir disimpan agar bisa diterapkan ke batch baru tanpa fit ulang
+                                st.session_state['fitted_transform'] = fitted
+                                transformed_df = fitted.transform(df)
+                                st.info(f"Data berhasil diproses dengan **{transform_method}** untuk {len(fitted.columns)} kolom.")
+
+                                st.write("**Parameter hasil fit:**")
+                                param_table = fitted.to_frame()
+                                if param_table.shape[1] == 0:
+                                    st.caption("Metode ini tidak memiliki parameter.")
+                                else:
+                                    st.dataframe(param_table, use_container_width=True)
+
+                                col_write, col_params = st.columns(2)
+                                with col_write:
+                                    output_names = fitted.output_names(df.columns)
+                                    if st.button(f"💾 Tulis ke Dataset ({', '.join(output_names.values())})"):
+                                        # Ditulis ke dataset lengkap, termasuk baris yang sedang dikecualikan
+                                        new_df = fitted.write_back(get_frame('df'))
+                                        set_frame('df', new_df)
+                                        if st.session_state.get('ingest_key') is None:
+                                            set_frame('manual_df', new_df)
+                                        st.session_state.pop('transform_request', None)
+                                        st.rerun()
+                                with col_params:
+                                    st.download_button(
+                                        label="⬇️ Unduh Parameter (JSON)",
+                                        data=fitted.to_json(),
+                                        file_name=f"parameter_{SUFFIXES[transform_method]}.json",
+                                        mime="application/json"
+                                    )
 
-                                elif transform_method == "Log Transform":
-                                    if (original_data <= 0).any():
-                                        st.error("Log Transform hanya dapat digunakan pada data dengan nilai positif.")
-                                    else:
-                                        transformed_data = np.log(original_data)
-                                        method_name = "Log Transform"
-                                
-                                elif transform_method == "Box-Cox Transform":
-                                    if (original_data <= 0).any():
-                                        st.error("Box-Cox Transform hanya dapat digunakan pada data dengan nilai positif.")
-                                    else:
-                                        try:
-                                            transformed_data, _ = stats.boxcox(original_data)
-                                            method_name = "Box-Cox Transform"
-                                        except Exception as e:
-                                            st.error(f"Gagal melakukan Box-Cox Transform: {e}")
-                                            transformed_data = None
-
-                                if transformed_data is not None:
-                                    st.info(f"Data berhasil diproses dengan **{method_name}**.")
+                                column_to_normalize = st.selectbox("Lihat detail kolom:", fitted.columns, key="transform_detail_col")
+                                original_data = pd.Series(profile.values(column_to_normalize), name=column_to_normalize)
+                                transformed_data = transformed_df[column_to_normalize].dropna()
+
+                                col_original, col_transformed = st.columns(2)
+                                with col_original:
+                                    st.subheader("Data Asli")
+                                    st.write(original_data)
+                                with col_transformed:
+                                    st.subheader("Data Hasil Transformasi")
+                                    st.write(transformed_data)
                                     
-                                    col_original, col_transformed = st.columns(2)
-                                    with col_original:
-                                        st.subheader("Data Asli")
-                                        st.write(original_data)
-                                    with col_transformed:
-                                        st.subheader("Data Hasil Transformasi")
-                                        st.write(transformed_data)
-                                        
+                                st.markdown("---")
+                                st.subheader("Perbandingan Distribusi")
+                                
+                                st.subheader("Pengaturan Ukuran Grafik")
+                                plot_width = st.slider("Lebar Grafik", 4, 15, 12, key="plot_width_norm")
+                                plot_height = st.slider("Tinggi Grafik", 3, 10, 5, key="plot_height_norm")
+                                
+                                fig, ax = plt.subplots(ncols=2, figsize=(plot_width, plot_height))
+                                
+                                sns.histplot(original_data, kde=True, ax=ax[0])
+                                ax[0].set_title(f"Distribusi Asli: '{column_to_normalize}'")
+                                
+                                sns.histplot(transformed_data, kde=True, ax=ax[1])
+                                ax[1].set_title(f"Distribusi Setelah {transform_method}")
+                                
+                                show_figure(fig)
+
+                        with st.expander("📦 Terapkan Transformasi ke Batch Baru"):
+                            st.write("Gunakan parameter yang sudah di-fit (dari sesi ini atau file JSON) pada data baru tanpa fit ulang.")
+                            params_file = st.file_uploader("File parameter (JSON, opsional):", type=["json"], key="transform_params_file")
+                            batch_file = st.file_uploader("File data batch baru (CSV atau Excel):", type=["csv", "xlsx", "xls"], key="transform_batch_file")
+                            try:
+                                batch_transform = (FittedTransform.from_json(params_file.getvalue().decode('utf-8'))
+                                                   if params_file is not None else st.session_state.get('fitted_transform'))
+                                if batch_transform is None:
+                                    st.info("Lakukan transformasi terlebih dahulu atau unggah file parameter.")
+                                elif batch_file is not None:
+                                    batch_df = batch_transform.write_back(read_uploaded(batch_file))
+                                    st.success(f"{batch_transform.method} diterapkan ke {len(batch_df)} baris batch baru.")
+                                    st.dataframe(batch_df.head(100), use_container_width=True)
+                                    st.download_button(
+                                        label="⬇️ Unduh Hasil Batch (CSV)",
+                                        data=batch_df.to_csv(index=False).encode('utf-8'),
+                                        file_name=f"batch_{SUFFIXES[batch_transform.method]}.csv",
+                                        mime="text/csv"
+                                    )
+                            except Exception as e:
+                                st.error(f"Gagal menerapkan transformasi: {e}")
+                    else:
+                        st.warning("Tidak ada kolom numerik yang tersedia.")
+
+                elif analysis_type == "Laporan Lengkap":
+                    st.subheader("📄 Laporan Analisis Lengkap")
+                    if numeric_cols:
+                        st.write("Laporan berisi statistik deskriptif, uji normalitas, histogram, Q-Q plot, heatmap korelasi, dan uji hipotesis yang dipilih.")
+                        report_cols = st.multiselect("Kolom yang dimasukkan ke laporan:", numeric_cols, default=numeric_cols, key="report_cols")
+                        report_tests = st.multiselect("Uji hipotesis yang disertakan:", REPORT_TESTS, key="report_tests")
+                        report_mu = 0.0
+                        if "Uji-t 1 Sampel (μ₀)" in report_tests:
+                            report_mu = st.number_input("Nilai rata-rata populasi (μ₀) untuk Uji-t:", value=0.0, key="report_mu")
+                        report_format = st.radio("Format laporan:", ["HTML", "PDF"], horizontal=True, key="report_format")
+
+                        report_request = (tuple(report_cols), tuple(report_tests), report_mu, report_format)
+                        if st.button("Buat Laporan", disabled=not report_cols):
+                            st.session_state['report_request'] = report_request
+
+                        if report_cols and st.session_state.get('report_request') == report_request:
+                            job = run_job(
+                                'report', generate_report, df, report_cols, report_tests, runner.submit_process,
+                                mu=report_mu, fmt=report_format.lower(), label="Laporan",
+                                params={'request': report_request}, persist=True
+                            )
+                            report_bytes = show_job(job)
+                            if report_bytes is not None:
+                                st.success(f"Laporan untuk {len(report_cols)} kolom siap diunduh.")
+                                st.download_button(
+                                    label=f"⬇️ Unduh Laporan ({report_format})",
+                                    data=report_bytes,
+                                    file_name=f"laporan_analisis.{report_format.lower()}",
+                                    mime="text/html" if report_format == "HTML" else "application/pdf"
+                                )
+                    else:
+                        st.warning("Tidak ada kolom numerik yang tersedia.")
+
+                elif analysis_type == "Perbandingan Grup":
+                    st.subheader("🧪 Perbandingan Antar Grup / Sumber")
+                    group_candidates = [col for col in df.columns if col not in numeric_cols]
+                    if numeric_cols and group_candidates:
+                        st.write("Membandingkan setiap kolom nilai antar grup sekaligus: ANOVA, Kruskal-Wallis, serta uji homogenitas varians Levene dan Bartlett.")
+                        default_group = group_candidates.index(SOURCE_COLUMN) if SOURCE_COLUMN in group_candidates else 0
+                        group_col = st.selectbox("Kolom grup:", group_candidates, index=default_group, key="compare_group_col")
+                        value_cols = st.multiselect("Kolom nilai:", numeric_cols, default=numeric_cols, key="compare_value_cols")
+                        if value_cols:
+                            job = run_job(
+                                'group_compare', group_compare_job, df, group_col, value_cols, label="Perbandingan Grup",
+                                params={'group_col': group_col, 'value_cols': tuple(value_cols)}, persist=True
+                            )
+                            compare_result = show_job(job)
+                            if compare_result is not None:
+                                results, box_stats = compare_result
+                                st.dataframe(results.style.format(precision=4), use_container_width=True)
+                                st.caption("p-value ≤ 0.05 berarti ada perbedaan signifikan antar grup (ANOVA/Kruskal-Wallis) atau varians antar grup tidak homogen (Levene/Bartlett). Grup dengan kurang dari 2 data diabaikan.")
+
+                                detail_col = st.selectbox("Lihat detail kolom:", value_cols, key="compare_detail_col")
+                                st.dataframe(group_summary(df, group_col, detail_col), use_container_width=True)
+                                fig, ax = plt.subplots(figsize=(10, 5))
+                                ax.bxp(box_stats[detail_col], showfliers=False, showmeans=True)
+                                ax.set_title(f"Boxplot {detail_col} per {group_col}")
+                                ax.tick_params(axis='x', rotation=45)
+                                show_figure(fig)
+                    else:
+                        st.warning("Perbandingan grup membutuhkan minimal satu kolom numerik dan satu kolom grup (non-numerik). Unggah beberapa file sekaligus untuk mendapatkan kolom 'Sumber'.")
+
+                elif analysis_type == "Deret Waktu":
+                    st.subheader("📈 Analisis Deret Waktu")
+                    if numeric_cols:
+                        no_time = "(urutan baris)"
+                        detected_time = detect_time_column(df)
+                        time_options = [no_time] + [col for col in df.columns if col not in numeric_cols or col == detected_time]
+                        time_choice = st.selectbox(
+                            "Kolom waktu:", time_options,
+                            index=time_options.index(detected_time) if detected_time in time_options else 0,
+                            key="ts_time_col"
+                        )
+                        time_col = None if time_choice == no_time else time_choice
+                        if detected_time is not None:
+                            st.caption(f"Kolom waktu terdeteksi otomatis: '{detected_time}'.")
+                        ts_value_col = st.selectbox("Kolom nilai:", numeric_cols, key="ts_value_col")
+
+                        col_window, col_test = st.columns(2)
+                        with col_window:
+                            window_kinds = ["Jumlah Baris"] + (["Durasi Waktu"] if time_col is not None else [])
+                            window_kind = st.radio("Jenis jendela:", window_kinds, horizontal=True, key="ts_window_kind")
+                            if window_kind == "Durasi Waktu":
+                                rolling_window = st.text_input("Lebar jendela bergulir (mis. 30s, 5min, 1h):", value="5min", key="ts_rolling_time")
+                                test_window = st.text_input("Lebar jendela uji (mis. 1h, 1D):", value="1h", key="ts_test_time")
+                            else:
+                                rolling_window = int(st.number_input("Lebar jendela bergulir (baris):", min_value=2, value=50, step=1, key="ts_rolling_rows"))
+                                test_window = int(st.number_input("Lebar jendela uji (baris):", min_value=MIN_WINDOW_N, value=500, step=10, key="ts_test_rows"))
+                        with col_test:
+                            ts_selected = st.multiselect("Statistik bergulir:", ROLLING_STATS, default=["Rata-rata", "EWMA"], key="ts_stats")
+                            ts_quantiles = st.multiselect("Kuantil bergulir:", [0.05, 0.25, 0.5, 0.75, 0.95], key="ts_quantiles")
+                            ewma_span = int(st.number_input("Span EWMA:", min_value=2, value=20, step=1, key="ts_ewma_span"))
+
+                        try:
+                            if window_kind == "Durasi Waktu":
+                                check_time_window(rolling_window)
+                                check_time_window(test_window)
+                            window_ok = True
+                        except ValueError as e:
+                            window_ok = False
+                            st.error(f"Lebar jendela waktu tidak valid: {e}. Gunakan durasi tetap seperti 30s, 5min, 1h atau 1D.")
+
+                        if window_ok:
+                            job = run_job(
+                                'timeseries', timeseries_job, df, ts_value_col, time_col, rolling_window, test_window,
+                                ts_selected, ts_quantiles, ewma_span, label="Analisis Deret Waktu",
+                                params={'value_col': ts_value_col, 'time_col': time_col, 'rolling_window': rolling_window,
+                                        'test_window': test_window, 'stats': tuple(ts_selected),
+                                        'quantiles': tuple(ts_quantiles), 'ewma_span': ewma_span},
+                                persist=True
+                            )
+                            ts_result = show_job(job)
+                            if ts_result is not None:
+                                st.caption(f"{ts_result['n']:,} titik data; grafik menampilkan {len(ts_result['x']):,} titik hasil desimasi min/maks.")
+                                fig, ax = plt.subplots(nrows=2, figsize=(12, 8), sharex=True)
+                                ax[0].plot(ts_result['x'], ts_result['values'], color='lightgray', linewidth=0.8, label=ts_value_col)
+                                for name in ts_result['rolling'].columns:
+                                    target = ax[1] if name == 'Std' else ax[0]
+                                    target.plot(ts_result['x'], ts_result['rolling'][name], linewidth=1.2, label=name)
+                                ax[0].set_title(f"Statistik Bergulir '{ts_value_col}'")
+                                ax[0].legend(loc='upper left')
+
+                                tests = ts_result['tests']
+                                drifted = tests['Bergeser'] == 'Ya'
+                                ax[1].plot(tests['Awal Jendela'], tests['Rata-rata'], marker='o', markersize=3, color='tab:blue', label='Rata-rata jendela')
+                                ax[1].scatter(tests.loc[drifted, 'Awal Jendela'], tests.loc[drifted, 'Rata-rata'], color='red', zorder=3, label='Bergeser (p ≤ 0.05)')
+                                ax[1].set_title("Rata-rata per Jendela Uji")
+                                ax[1].legend(loc='upper left')
+                                fig.autofmt_xdate()
+                                show_figure(fig)
+
+                                col_drift, col_normal = st.columns(2)
+                                with col_drift:
+                                    st.metric("Jendela Bergeser dari Jendela Awal", f"{int(drifted.sum())} / {len(tests)}")
+                                with col_normal:
+                                    st.metric("Jendela Tidak Normal", f"{int((tests['Normal'] == 'Tidak').sum())} / {len(tests)}")
+                                st.dataframe(tests, use_container_width=True)
+                    else:
+                        st.warning("Tidak ada kolom numerik yang tersedia.")
+
+                elif analysis_type == "Regresi & DOE":
+                    st.subheader("📐 Regresi & Analisis DOE")
+                    if numeric_cols:
+                        reg_mode = st.radio("Metode:", ["Regresi Linear Berganda", "Analisis Faktorial (DOE)"], horizontal=True, key="reg_mode")
+                        is_doe = reg_mode == "Analisis Faktorial (DOE)"
+                        response = st.selectbox("Respons (Y):", numeric_cols, key="reg_response")
+                        candidates = [col for col in df.columns if col != response]
+                        if is_doe:
+                            predictors = st.multiselect("Faktor:", candidates, key="doe_factors")
+                            categorical = predictors
+                            interaction_order = st.selectbox("Orde interaksi maksimum:", [1, 2, 3], index=1, key="doe_order")
+                            st.caption("Setiap faktor dikodekan sebagai level (kode efek -1/+1 untuk faktor 2 level).")
+                        else:
+                            predictors = st.multiselect("Prediktor (X):", candidates, default=[col for col in numeric_cols if col != response][:2], key="reg_predictors")
+                            categorical = [col for col in predictors if col not in numeric_cols]
+                            if categorical:
+                                st.caption(f"Prediktor kategori dikodekan dengan kode efek: {', '.join(map(str, categorical))}")
+                            interaction_order = 2 if st.checkbox("Sertakan interaksi 2 arah", key="reg_interactions") else 1
+
+                        if predictors:
+                            job = run_job(
+                                'regression', regression_job, df, response, predictors, categorical, interaction_order, is_doe,
+                                label=reg_mode, persist=True,
+                                params={'response': response, 'predictors': tuple(predictors), 'categorical': tuple(categorical),
+                                        'order': interaction_order, 'doe': is_doe}
+                            )
+                            reg_result = show_job(job)
+                            if reg_result is not None:
+                                summary = reg_result.summary
+                                col_s, col_r2, col_r2adj, col_n = st.columns(4)
+                                col_s.metric("S", f"{summary['S']:.4f}")
+                                col_r2.metric("R²", f"{summary['R²']:.2%}")
+                                col_r2adj.metric("R² (adj)", f"{summary['R² (adj)']:.2%}")
+                                col_n.metric("Jumlah Data", f"{summary['n']:,}")
+                                if reg_result.aliased:
+                                    st.warning(f"Suku berikut alias (kolinear sempurna) dan dikeluarkan dari model: {', '.join(reg_result.aliased)}")
+
+                                st.write("**Koefisien**")
+                                st.dataframe(reg_result.coefficients.style.format(precision=4), use_container_width=True)
+                                st.write("**Analisis Varians**")
+                                st.dataframe(reg_result.anova.style.format(precision=4, na_rep=''), use_container_width=True)
+                                st.write("**Diagnostik Residual**")
+                                st.dataframe(pd.DataFrame(reg_result.residual_summary, index=['Nilai']).T.style.format(precision=4), use_container_width=True)
+                                st.caption("Durbin-Watson mendekati 2 berarti residual tidak berautokorelasi; p-value Jarque-Bera > 0.05 berarti residual normal.")
+
+                                std_residuals = reg_result.sample_residuals / reg_result.residual_s
+                                fig, ax = plt.subplots(2, 2, figsize=(12, 8))
+                                ordered = np.sort(std_residuals)
+                                theoretical = stats.norm.ppf((np.arange(1, len(ordered) + 1) - 0.5) / len(ordered))
+                                ax[0, 0].scatter(ordered, theoretical, s=6)
+                                ax[0, 0].plot([theoretical.min(), theoretical.max()], [theoretical.min(), theoretical.max()], color='red')
+                                ax[0, 0].set_title("Normal Probability Plot")
+                                ax[0, 0].set_xlabel("Residual Standar")
+                                ax[0, 1].scatter(reg_result.sample_fitted, std_residuals, s=6)
+                                ax[0, 1].axhline(0, color='red')
+                                ax[0, 1].set_title("Residual vs Fitted")
+                                ax[1, 0].hist(std_residuals, bins=40, edgecolor='white')
+                                ax[1, 0].set_title("Histogram Residual")
+                                ax[1, 1].plot(reg_result.sample_order, std_residuals, marker='o', markersize=2, linewidth=0.5)
+                                ax[1, 1].axhline(0, color='red')
+                                ax[1, 1].set_title("Residual vs Urutan")
+                                fig.tight_layout()
+                                show_figure(fig)
+                                if len(reg_result.sample_residuals) < summary['n']:
+                                    st.caption(f"Grafik residual memakai sampel sistematis {len(reg_result.sample_residuals):,} dari {summary['n']:,} observasi; statistik di atas dihitung dari semua data.")
+
+                                if is_doe:
+                                    effects = reg_result.coefficients.drop(index='Konstanta')
+                                    effects = effects.reindex(effects['t'].abs().sort_values().index)
+                                    t_crit = stats.t.ppf(0.975, reg_result.df_error)
+                                    fig, ax = plt.subplots(figsize=(10, max(3, 0.35 * len(effects))))
+                                    ax.barh(effects.index.astype(str), effects['t'].abs(), color=np.where(effects['t'].abs() > t_crit, 'tab:red', 'tab:blue'))
+                                    ax.axvline(t_crit, color='black', linestyle='--', label=f"t kritis = {t_crit:.3f} (α = 0.05)")
+                                    ax.set_title("Pareto Efek Terstandar")
+                                    ax.legend()
+                                    show_figure(fig)
+
+                                    main_means, interaction_means = reg_result.factor_means
+                                    fig, ax = plt.subplots(ncols=len(main_means), figsize=(4 * len(main_means), 4), sharey=True, squeeze=False)
+                                    for i, (factor, means) in enumerate(main_means.items()):
+                                        ax[0, i].plot(means.index.astype(str), means.to_numpy(), marker='o')
+                                        ax[0, i].axhline(df[response].mean(), color='gray', linestyle='--')
+                                        ax[0, i].set_title(str(factor))
+                                    fig.suptitle(f"Main Effects Plot untuk {response}")
+                                    show_figure(fig)
+
+                                    if interaction_means:
+                                        pair = st.selectbox("Plot interaksi:", list(interaction_means), format_func=lambda p: f"{p[0]} × {p[1]}", key="doe_interaction_pair")
+                                        fig, ax = plt.subplots(figsize=(8, 5))
+                                        table = interaction_means[pair]
+                                        for level in table.columns:
+                                            ax.plot(table.index.astype(str), table[level].to_numpy(), marker='o', label=f"{pair[1]} = {level}")
+                                        ax.set_xlabel(str(pair[0]))
+                                        ax.set_ylabel(f"Rata-rata {response}")
+                                        ax.set_title(f"Interaction Plot {pair[0]} × {pair[1]}")
+                                        ax.legend()
+                                        show_figure(fig)
+                        else:
+                            st.info("Pilih minimal satu prediktor atau faktor.")
+                    else:
+                        st.warning("Tidak ada kolom numerik yang tersedia.")
+
+                elif analysis_type == "Gage R&R":
+                    st.subheader("📏 Gage R&R (Measurement System Analysis)")
+                    if numeric_cols:
+                        study_type = st.radio("Jenis studi:", [gage_rr.CROSSED, gage_rr.NESTED], horizontal=True, key="gage_type",
+                                              help="Crossed: setiap operator mengukur semua part. Nested: setiap part hanya diukur oleh satu operator (mis. uji destruktif).")
+                        all_cols = df.columns.tolist()
+                        label_cols = [col for col in all_cols if col not in numeric_cols] or all_cols
+                        col_part, col_operator = st.columns(2)
+                        part_col = col_part.selectbox("Kolom Part:", all_cols, index=all_cols.index(label_cols[0]), key="gage_part_col")
+                        operator_candidates = [col for col in all_cols if col != part_col]
+                        operator_default = next((col for col in label_cols if col != part_col), operator_candidates[0])
+                        operator_col = col_operator.selectbox("Kolom Operator:", operator_candidates, index=operator_candidates.index(operator_default), key="gage_operator_col")
+                        measure_cols = [col for col in numeric_cols if col not in (part_col, operator_col)]
+                        data_format = st.radio("Format data:", ["Satu kolom per karakteristik", "Format panjang (kolom karakteristik)"], horizontal=True, key="gage_format")
+                        characteristic_col = None
+                        if data_format == "Satu kolom per karakteristik":
+                            value_cols = st.multiselect("Kolom pengukuran (karakteristik):", measure_cols, default=measure_cols[:1], key="gage_value_cols")
+                        else:
+                            char_candidates = [col for col in all_cols if col not in (part_col, operator_col)]
+                            characteristic_col = st.selectbox("Kolom karakteristik:", char_candidates, key="gage_characteristic_col")
+                            value_col = st.selectbox("Kolom pengukuran:", [col for col in measure_cols if col != characteristic_col], key="gage_long_value_col")
+                            value_cols = [value_col] if value_col is not None else []
+
+                        if value_cols:
+                            job = run_job(
+                                'gage_rr', gage_rr_job, df, part_col, operator_col, value_cols, characteristic_col, study_type,
+                                label="Gage R&R", persist=True,
+                                params={'part': part_col, 'operator': operator_col, 'values': tuple(value_cols),
+                                        'characteristic': characteristic_col, 'type': study_type}
+                            )
+                            gage_result = show_job(job)
+                            if gage_result is not None:
+                                summary = gage_result['summary']
+                                # Toleransi hanya menskalakan Study Var, jadi diubah tanpa menghitung ulang studi
+                                st.write("**Toleransi (USL - LSL) per karakteristik** (kosongkan bila tidak ada)")
+                                tolerance_input = pd.DataFrame({'Toleransi': np.nan}, index=summary.index.astype(str))
+                                tolerance_input.index.name = gage_rr.CHARACTERISTIC
+                                tolerances = st.data_editor(tolerance_input, use_container_width=True, key="gage_tolerances")['Toleransi']
+                                tolerances.index = summary.index
+                                summary = summary.copy()
+                                summary.insert(summary.columns.get_loc('ndc'), '%Tolerance', gage_rr.tolerance_percent(summary, tolerances))
+
+                                st.write(f"**Ringkasan Gage R&R ({len(summary)} karakteristik)**")
+                                st.dataframe(summary.style.format(precision=4, na_rep=''), use_container_width=True)
+                                st.caption("AIAG: %Study Var < 10% dapat diterima, 10-30% marginal, > 30% tidak dapat diterima; ndc ≥ 5 dianjurkan.")
+                                st.download_button(
+                                    label="📥 Unduh Ringkasan (CSV)",
+                                    data=summary.to_csv().encode('utf-8'),
+                                    file_name="gage_rr_ringkasan.csv",
+                                    mime="text/csv",
+                                    key="gage_download"
+                                )
+
+                                analyzed = list(gage_result['components'])
+                                if analyzed:
+                                    char = st.selectbox("Detail karakteristik:", analyzed, format_func=str, key="gage_detail_char")
+                                    st.write("**Tabel ANOVA**")
+                                    st.dataframe(gage_result['anova'][char].style.format(precision=4, na_rep=''), use_container_width=True)
+                                    components = gage_result['components'][char].copy()
+                                    tolerance = tolerances.get(char, np.nan)
+                                    if tolerance > 0:
+                                        components['%Tolerance'] = 100 * components[gage_rr.STUDY_VAR_COLUMN] / tolerance
+                                    st.write("**Komponen Varians**")
+                                    st.dataframe(components.style.format(precision=4), use_container_width=True)
+
+                                    means = gage_result['cell_means'].loc[char]
+                                    bars = components.loc[['Total Gage R&R', '  Repeatability', '  Reproducibility', 'Part-to-Part']]
+                                    bar_cols = ['%Contribution', '%Study Var'] + (['%Tolerance'] if '%Tolerance' in bars else [])
+                                    fig, ax = plt.subplots(1, 3, figsize=(18, 5))
+                                    positions = np.arange(len(bars))
+                                    width = 0.8 / len(bar_cols)
+                                    for i, col in enumerate(bar_cols):
+                                        ax[0].bar(positions + i * width, bars[col].to_numpy(), width, label=col)
+                                    ax[0].set_xticks(positions + width * (len(bar_cols) - 1) / 2, [name.strip() for name in bars.index])
+                                    ax[0].set_title("Components of Variation")
+                                    ax[0].set_ylabel("Persen")
+                                    ax[0].legend()
+                                    part_labels = means.index.astype(str)
+                                    ax[1].plot(part_labels, means.mean(axis=1).to_numpy(), marker='o')
+                                    ax[1].set_title(f"Rata-rata per {part_col}")
+                                    ax[1].tick_params(axis='x', rotation=90)
+                                    for operator in means.columns:
+                                        ax[2].plot(part_labels, means[operator].to_numpy(), marker='o', label=str(operator))
+                                    ax[2].set_title(f"Interaksi {part_col} × {operator_col}")
+                                    ax[2].tick_params(axis='x', rotation=90)
+                                    ax[2].legend(title=str(operator_col))
+                                    fig.suptitle(f"Gage R&R ({study_type}) untuk {char}")
+                                    fig.tight_layout()
+                                    show_figure(fig)
+                        else:
+                            st.info("Pilih minimal satu kolom pengukuran.")
+                    else:
+                        st.warning("Tidak ada kolom numerik yang tersedia.")
+
+                elif analysis_type == "Kualitas Data":
+                    st.subheader("🧹 Pemeriksaan Kualitas Data & Outlier")
+                    # Pemeriksaan selalu dijalankan pada dataset lengkap agar baris yang dikecualikan tetap terlihat
+                    full_df = get_frame('df')
+                    full_numeric = get_column_profile(full_df).numeric_cols
+                    if full_numeric:
+                        quality_cols = st.multiselect("Kolom yang diperiksa:", full_numeric, default=full_numeric, key="quality_cols")
+                        quality_methods = st.multiselect("Metode:", quality.METHODS, default=quality.METHODS, key="quality_methods")
+                        with st.expander("⚙️ Pengaturan Metode"):
+                            col_iqr, col_mad, col_esd, col_run = st.columns(4)
+                            iqr_k = col_iqr.number_input("Faktor IQR (k):", 0.5, 10.0, quality.IQR_K, 0.5, key="quality_iqr_k")
+                            mad_z = col_mad.number_input("Batas MAD z:", 1.0, 20.0, quality.MAD_Z, 0.5, key="quality_mad_z")
+                            esd_max = col_esd.number_input("Maks. outlier ESD:", 1, 1000, quality.ESD_MAX_OUTLIERS, 1, key="quality_esd_max",
+                                                           help="Isi 1 untuk uji Grubbs (satu outlier).")
+                            run_length = col_run.number_input("Deret konstan minimum:", 2, 100000, quality.CONSTANT_RUN_LENGTH, 1, key="quality_run_length",
+                                                              help="Jumlah nilai identik berurutan yang dianggap sensor macet.")
+
+                        if quality_cols and quality_methods:
+                            job = run_job(
+                                'quality', quality_job, full_df, quality_cols, quality_methods, iqr_k, mad_z, int(esd_max), int(run_length),
+                                label="Pemeriksaan Kualitas Data", full_frame=True,
+                                params={'cols': tuple(quality_cols), 'methods': tuple(quality_methods), 'iqr_k': iqr_k,
+                                        'mad_z': mad_z, 'esd_max': int(esd_max), 'run_length': int(run_length)}
+                            )
+                            quality_result = show_job(job)
+                            if quality_result is not None:
+                                flagged_rows = quality_result.row_mask(quality_methods)
+                                col_rows, col_flagged, col_pct = st.columns(3)
+                                col_rows.metric("Jumlah Baris", f"{len(full_df):,}")
+                                col_flagged.metric("Baris Bertanda", f"{int(flagged_rows.sum()):,}")
+                                col_pct.metric("Persentase", f"{flagged_rows.mean():.2%}" if len(full_df) else "-")
+
+                                st.write("**Jumlah flag per kolom dan metode**")
+                                st.dataframe(quality_result.summary, use_container_width=True)
+                                st.write("**Batas yang dipakai**")
+                                st.dataframe(quality_result.limits.style.format(precision=4, na_rep='-'), use_container_width=True)
+
+                                flagged_index = np.flatnonzero(flagged_rows)
+                                if flagged_index.size:
+                                    shown = flagged_index[:QUALITY_PREVIEW_ROWS]
+                                    st.write(f"**Baris bertanda** ({len(shown):,} dari {flagged_index.size:,} ditampilkan)")
+                                    preview = full_df.iloc[shown]
+                                    preview = preview.assign(Flag=quality_result.flag_labels(shown, quality_methods))[['Flag'] + list(preview.columns)]
+                                    cell_flags = pd.DataFrame(quality_result.mask(quality_methods)[shown], index=preview.index, columns=quality_result.columns)
+                                    st.dataframe(
+                                        preview.style.apply(lambda _: np.where(cell_flags, 'background-color: #ffd6d6', ''), axis=None, subset=quality_result.columns),
+                                        use_container_width=True
+                                    )
+                                    flag_matrix = pd.DataFrame(quality_result.flags[flagged_index], index=full_df.index[flagged_index], columns=quality_result.columns)
+                                    st.download_button(
+                                        label="📥 Unduh Matriks Flag (CSV)",
+                                        data=flag_matrix.to_csv().encode('utf-8'),
+                                        file_name="matriks_flag.csv",
+                                        mime="text/csv",
+                                        key="quality_download"
+                                    )
+                                    st.caption("Nilai flag adalah jumlah bit: " + ", ".join(f"{bit} = {method}" for method, bit in quality.BITS.items()))
+
                                     st.markdown("---")
-                                    st.subheader("Perbandingan Distribusi")
-                                    
-                                    st.subheader("Pengaturan Ukuran Grafik")
-                                    plot_width = st.slider("Lebar Grafik", 4, 15, 12, key="plot_width_norm")
-                                    plot_height = st.slider("Tinggi Grafik", 3, 10, 5, key="plot_height_norm")
-                                    
-                                    fig, ax = plt.subplots(ncols=2, figsize=(plot_width, plot_height))
-                                    
-                                    sns.histplot(original_data, kde=True, ax=ax[0])
-                                    ax[0].set_title(f"Distribusi Asli: '{column_to_normalize}'")
-                                    
-                                    sns.histplot(transformed_data, kde=True, ax=ax[1])
-                                    ax[1].set_title(f"Distribusi Setelah {method_name}")
-                                    
-                                    st.pyplot(fig)
+                                    exclude_methods = st.multiselect(
+                                        "Kecualikan baris yang ditandai oleh:", quality_methods,
+                                        default=[m for m in quality_methods if m != quality.MISSING], key="quality_exclude_methods"
+                                    )
+                                    excluded = quality_result.row_mask(exclude_methods) if exclude_methods else np.zeros(len(full_df), dtype=bool)
+                                    if st.button(f"🚫 Kecualikan {int(excluded.sum()):,} Baris dari Analisis", disabled=not excluded.any(), key="quality_exclude"):
+                                        set_quality_exclusion(full_df, excluded, exclude_methods)
+                                        st.rerun()
+                                else:
+                                    st.success("Tidak ada baris yang ditandai oleh metode yang dipilih.")
+                        else:
+                            st.info("Pilih minimal satu kolom dan satu metode.")
                     else:
                         st.warning("Tidak ada kolom numerik yang tersedia.")
+
+                elif analysis_type == "Perencanaan Sampel":
+                    st.subheader("🎯 Perencanaan Ukuran Sampel & Power")
+                    st.caption("Hitung power dan ukuran sampel minimum untuk uji di 'Uji Hipotesis' sebelum data dikumpulkan.")
+                    power_test = st.selectbox("Jenis Uji:", power.TESTS, key="power_test")
+                    effect_label, (effect_small, effect_medium, effect_large) = power.EFFECT_SIZES[power_test]
+                    st.caption(f"Ukuran efek: **{effect_label}** — kecil {effect_small:g}, sedang {effect_medium:g}, besar {effect_large:g}.")
+
+                    col_effect, col_setting = st.columns(2)
+                    with col_effect:
+                        if power_test == power.F_VARIANCE:
+                            effect_range = st.slider("Rentang ukuran efek:", 1.05, 6.0, (1.25, effect_large), 0.05, key="power_effect_ratio")
+                        else:
+                            effect_range = st.slider("Rentang ukuran efek:", 0.05, 2.0, (effect_small, effect_large), 0.05, key="power_effect_std")
+                        n_effects = st.number_input("Jumlah kurva (nilai efek):", min_value=2, max_value=12, value=6, key="power_effect_count")
+                        groups = 3
+                        if power_test == power.ANOVA:
+                            groups = st.number_input("Jumlah grup (k):", min_value=2, max_value=20, value=3, key="power_groups")
+                        distribution = power.NORMAL
+                        if power_test in power.NONPARAMETRIC:
+                            distribution = st.selectbox("Distribusi data:", power.DISTRIBUTIONS, key="power_distribution",
+                                                        help="Dipakai untuk pendekatan ARE dan simulasi Monte-Carlo.")
+                    with col_setting:
+                        alphas = st.multiselect("Nilai α:", POWER_ALPHAS, default=POWER_ALPHAS, key="power_alphas")
+                        n_max = st.number_input("n maksimum pada kurva:", min_value=10, max_value=power.N_MAX, value=200, key="power_n_max")
+                        target = st.slider("Target power:", 0.50, 0.99, 0.80, 0.01, key="power_target")
+
+                    with st.expander("🔁 Konversi Ukuran Efek"):
+                        if power_test in (power.PROPORTION_ONE, power.PROPORTION_TWO):
+                            col_p1, col_p2 = st.columns(2)
+                            p1 = col_p1.number_input("Proporsi 1 (p₁):", 0.0, 1.0, 0.5, 0.01, key="power_p1")
+                            p2 = col_p2.number_input("Proporsi 2 / p₀:", 0.0, 1.0, 0.4, 0.01, key="power_p2")
+                            st.write(f"h Cohen = `{abs(power.cohen_h(p1, p2)):.4f}`")
+                        elif power_test == power.F_VARIANCE:
+                            st.write("Rasio varians langsung dipakai sebagai ukuran efek, mis. 2.0 berarti varians satu proses dua kali lainnya.")
+                        elif power_test == power.ANOVA:
+                            st.write("f Cohen = SD rata-rata grup / SD di dalam grup.")
+                        else:
+                            delta = st.number_input("Perbedaan praktis yang ingin dideteksi (Δ):", value=1.0, key="power_delta")
+                            sd_source = st.selectbox("Simpangan baku (SD):", ["Isi manual"] + numeric_cols, key="power_sd_source")
+                            if sd_source == "Isi manual":
+                                sd = st.number_input("SD:", min_value=0.0, value=1.0, key="power_sd")
+                            else:
+                                sd = float(np.std(profile.values(sd_source), ddof=1)) if profile[sd_source].n > 1 else 0.0
+                                st.write(f"SD kolom '{sd_source}' = `{sd:.4f}`")
+                            if sd > 0:
+                                st.write(f"d Cohen = Δ / SD = `{abs(delta) / sd:.4f}`")
+
+                    if not alphas:
+                        st.warning("Pilih setidaknya satu nilai α.")
+                    else:
+                        alphas = sorted(alphas)
+                        effects = np.round(np.linspace(effect_range[0], effect_range[1], int(n_effects)), 4)
+                        params = {'test': power_test, 'effects': tuple(effects.tolist()), 'alphas': tuple(alphas),
+                                  'groups': int(groups), 'distribution': distribution}
+                        grid = cached_analysis('power_grid', {**params, 'n_max': int(n_max)}, lambda: power.power_grid(
+                            power_test, effects, power.sample_sizes(n_max), alphas, groups, distribution), data_hash=PLANNER_HASH)
+                        required = cached_analysis('power_required_n', {**params, 'target': target}, lambda: power.required_n(
+                            power_test, effects, alphas, target, groups, distribution), data_hash=PLANNER_HASH)
+
+                        simulation = None
+                        if power_test in power.NONPARAMETRIC:
+                            col_validate, col_replicates = st.columns(2)
+                            validate = col_validate.checkbox("Validasi Monte-Carlo", key="power_validate",
+                                                             help="Membandingkan pendekatan ARE dengan simulasi uji rank yang sebenarnya.")
+                            replicates = col_replicates.number_input("Jumlah replikasi:", min_value=200, max_value=20000, value=1000, step=200, key="power_replicates")
+                            if validate:
+                                mc_ns = power.sample_sizes(n_max, POWER_MC_POINTS)
+                                job = run_job('power_mc', power_mc_job, power_test, effects, mc_ns, alphas, distribution, int(replicates),
+                                              label="Validasi Monte-Carlo", params={**params, 'n_max': int(n_max), 'replicates': int(replicates)},
+                                              persist=True, full_frame=True, data_hash=PLANNER_HASH)
+                                simulation = show_job(job)
+
+                        chart_data = grid if simulation is None else pd.concat([grid, simulation], ignore_index=True)
+                        st.caption("Pilih α di bawah grafik dan klik legenda untuk menyorot satu efek; perubahan ini tidak menghitung ulang grid.")
+                        show_client_chart(chart_data, client_charts.power_curve_spec(
+                            f"Kurva Power: {power_test}", effect_label, alphas,
+                            client_charts.pixels(10), client_charts.pixels(5), target, simulated=simulation is not None))
+
+                        unit = "per grup" if power_test in power.PER_GROUP else ("pasangan" if power_test in (power.T_PAIRED, power.WILCOXON) else "total")
+                        st.markdown(f"**Ukuran sampel minimum untuk power ≥ {target:.2f}** (n {unit})")
+                        st.dataframe(required.style.format("{:,.0f}", na_rep=f"> {power.N_MAX:,}"), use_container_width=True)
+                        if power_test == power.ANOVA:
+                            st.caption(f"Total data = {int(groups)} × n per grup.")
+                        if power_test in power.NONPARAMETRIC:
+                            st.caption("Untuk uji non-parametrik, n dihitung dengan pendekatan ARE terhadap uji-t; aktifkan validasi Monte-Carlo untuk memeriksanya.")
+
+                        if simulation is not None:
+                            st.markdown("**Validasi Monte-Carlo**")
+                            st.metric("Selisih Maksimum |MC − Pendekatan|", f"{simulation['Selisih'].abs().max():.3f}")
+                            st.dataframe(simulation.style.format(precision=4), use_container_width=True)
         
         if feature_status.get('Bantuan', True):
             with tabs[tab_mapping["❓ Bantuan"]]:
@@ -974,6 +2276,8 @@ def show_main_app():
                     st.markdown("- **Standardize (Z-Score)**: Mengubah data sehingga memiliki rata-rata **0** dan standar deviasi **1**. Ideal jika data Anda sudah normal dan Anda ingin mengidentifikasi *outlier* (data yang sangat ekstrem).")
                     st.markdown("- **Log Transform**: Menggunakan logaritma untuk data yang sebarannya **miring ke kanan** (nilai kecil banyak, nilai besar sedikit). Contoh: data tentang **jumlah cacat** produk per hari, yang biasanya cenderung memiliki banyak hari dengan cacat nol atau sedikit.")
                     st.markdown("- **Box-Cox Transform**: Metode yang lebih canggih untuk mengubah data menjadi lebih normal. Hanya bisa digunakan pada data dengan nilai positif.")
+                    st.markdown("- **Yeo-Johnson Transform**: Mirip Box-Cox, tetapi juga bisa digunakan pada data bernilai nol atau negatif (misalnya, **deviasi dimensi** terhadap nominal).")
+                    st.markdown("Parameter hasil fit (min/max, rata-rata/standar deviasi, atau lambda) bisa ditulis kembali ke dataset sebagai kolom baru, diunduh sebagai JSON, dan diterapkan ke **batch produksi berikutnya** tanpa fit ulang.")
 
                 with tab_hypothesis:
                     st.subheader("Uji Hipotesis")
@@ -1019,13 +2323,10 @@ def show_main_app():
             with tabs[tab_mapping["⚙️ Admin Setting"]]:
                 st.header("⚙️ Pengaturan Admin")
                 
-                users = get_all_users()
-                df_users = pd.DataFrame(users, columns=['ID', 'Role', 'Status'])
-                
                 st.markdown("---")
                 st.subheader("🔧 Kelola Fitur Aplikasi")
                 
-                ordered_features = ['Histogram', 'Boxplot', 'Scatter Plot', 'Heatmap', 'Uji Normalitas', 'Uji Hipotesis', 'Normalisasi Data', 'Bantuan']
+                ordered_features = ['Histogram', 'Boxplot', 'Scatter Plot', 'Heatmap', 'Uji Normalitas', 'Uji Hipotesis', 'Normalisasi Data', 'Laporan Lengkap', 'Perbandingan Grup', 'Deret Waktu', 'Regresi & DOE', 'Gage R&R', 'Kualitas Data', 'Perencanaan Sampel', 'Bantuan']
                 
                 for feature in ordered_features:
                     is_enabled = feature_status.get(feature, False)
@@ -1035,58 +2336,65 @@ def show_main_app():
                         st.info(f"Status fitur '{feature}' berhasil diperbarui.")
                         st.rerun()
 
-                pending_users = df_users[df_users['Status'] == 'pending']
                 st.markdown("---")
-                st.subheader("📥 Permintaan Pengguna Baru")
-                if not pending_users.empty:
-                    st.info("Berikut adalah daftar pengguna baru yang menunggu persetujuan Anda.")
-                    for index, row in pending_users.iterrows():
-                        col_id, col_btn = st.columns([0.8, 0.2])
-                        with col_id:
-                            st.write(f"ID: **{row['ID']}**")
-                        with col_btn:
-                            if st.button("Setujui", key=f"approve_{row['ID']}"):
-                                approve_user(row['ID'])
-                                st.success(f"Pengguna '{row['ID']}' berhasil disetujui.")
-                                st.rerun()
-                else:
-                    st.success("Tidak ada permintaan pengguna baru saat ini.")
-                
-                approved_users = df_users[df_users['Status'] == 'approved']
+                st.subheader("👥 Kelola Pengguna")
+                show_user_management()
+
                 st.markdown("---")
-                st.subheader("👥 Kelola Pengguna Terdaftar")
-                if not approved_users.empty:
-                    df_approved_display = approved_users.drop(columns=['Status'])
-                    st.dataframe(df_approved_display, use_container_width=True)
+                st.subheader("🧠 Penggunaan Memori Sesi")
+                usage_df = governor.usage()
+                col_mem, col_budget = st.columns(2)
+                with col_mem:
+                    st.metric("Total di Memori (MB)", f"{usage_df['Di Memori (MB)'].sum():.2f}")
+                with col_budget:
+                    st.metric("Anggaran Global (MB)", f"{governor.global_budget / (1024 * 1024):.0f}")
+                st.dataframe(usage_df, use_container_width=True)
+                if usage_df['Tidak Bisa Di-spill (MB)'].sum() > 0:
+                    st.warning("Sebagian frame memiliki tipe kolom yang tidak bisa ditulis ke Parquet, "
+                               "sehingga tetap di memori walaupun anggaran terlampaui.")
 
-                    st.markdown("---")
-                    st.subheader("Ubah Role Pengguna")
-                    user_id_to_manage = st.selectbox("Pilih ID Pengguna:", approved_users['ID'].tolist())
-                    
-                    if user_id_to_manage:
-                        current_role = approved_users[approved_users['ID'] == user_id_to_manage]['Role'].iloc[0]
-                        new_role = st.selectbox("Pilih Role Baru:", ['User', 'Admin'], index=['User', 'Admin'].index(current_role))
-                        if st.button("Ubah Role", key='change_role'):
-                            if user_id_to_manage and new_role:
-                                update_user_role(user_id_to_manage, new_role)
-                                st.success(f"Role pengguna '{user_id_to_manage}' berhasil diubah menjadi '{new_role}'.")
-                                st.rerun()
+                st.markdown("---")
+                st.subheader("🗄️ Cache Hasil Analisis")
+                cache_stats = result_store.stats()
+                col_entries, col_size, col_hits = st.columns(3)
+                with col_entries:
+                    st.metric("Jumlah Hasil", cache_stats['entries'])
+                with col_size:
+                    st.metric("Ukuran (MB)", f"{cache_stats['bytes'] / (1024 * 1024):.2f} / {result_store.max_bytes / (1024 * 1024):.0f}")
+                with col_hits:
+                    st.metric("Total Hit Cache", cache_stats['hits'])
+                if st.button("🗑️ Kosongkan Cache Hasil"):
+                    result_store.clear()
+                    st.success("Cache hasil analisis berhasil dikosongkan.")
+                    st.rerun()
+
+                if shared_cache.datasets is not None:
+                    shared_stats = shared_cache.datasets.stats()
+                    st.caption(f"Mode multi-proses: {shared_stats['entries']} dataset "
+                               f"({shared_stats['bytes'] / (1024 * 1024):.1f} MB) di folder bersama `{shared_cache.datasets.root}`.")
 
-                    st.markdown("---")
-                    st.subheader("Hapus Pengguna")
-                    user_id_to_delete = st.selectbox("Pilih ID Pengguna yang akan dihapus:", approved_users['ID'].tolist(), key='delete_user')
-                    
-                    if st.button("Hapus Pengguna", key='delete_button'):
-                        if user_id_to_delete and user_id_to_delete != st.session_state['user_id']:
-                            delete_user(user_id_to_delete)
-                            st.success(f"Pengguna '{user_id_to_delete}' berhasil dihapus.")
-                            st.rerun()
-                        elif user_id_to_delete == st.session_state['user_id']:
-                            st.error("Anda tidak bisa menghapus akun Anda sendiri.")
-                        else:
-                            st.warning("Pilih pengguna yang akan dihapus.")
+                st.markdown("---")
+                st.subheader("🖼️ Aset Gambar")
+                if STATIC_SERVING:
+                    st.caption("Logo dan ikon dikirim sebagai file statis (PNG palet/WebP) dari /app/static/ dan disimpan di cache browser.")
                 else:
-                    st.info("Tidak ada pengguna terdaftar yang tersedia.")
+                    st.caption("Static serving tidak aktif: logo dan ikon dikirim sebagai PNG kecil dari memori. "
+                               "Aktifkan `server.enableStaticServing` untuk memakai file statis.")
+                if st.button("📏 Ukur Penghematan per Rerun", key="measure_assets"):
+                    try:
+                        report = assets.transfer_report([
+                            ("Logo (login)", assets.LOGO_FILE, assets.LOGIN_LOGO_WIDTH, assets.STREAMLIT_MAX_WIDTH),
+                            ("Logo (halaman utama)", assets.LOGO_FILE, assets.MAIN_LOGO_WIDTH, assets.MAIN_LOGO_WIDTH),
+                            ("Ikon", assets.ICON_FILE, assets.ICON_SIZE, None),
+                        ], STATIC_SERVING)
+                        col_saved, col_time = st.columns(2)
+                        with col_saved:
+                            st.metric("Byte Dihemat per Rerun (KB)", f"{report['Hemat per Rerun (KB)'].sum():,.1f}")
+                        with col_time:
+                            st.metric("Waktu Dihemat per Rerun (ms)", f"{(report['Cara Lama (ms)'] - report['Sekarang (ms)']).sum():,.0f}")
+                        st.dataframe(report.style.format(precision=1), use_container_width=True)
+                    except FileNotFoundError as e:
+                        st.error(f"File gambar tidak ditemukan: {e.filename}")
 
     else:
         st.warning("Silakan upload file CSV/Excel terlebih dahulu atau gunakan input manual.")
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+class ColumnProfile:
+    """Profil satu kolom numerik: mask NaN, nilai bersih (float64 kontigu) dan ringkasannya.
+
+    Array yang disimpan bersifat read-only karena dibagi ke semua tab dan analisis.
+    Tampilan terurut baru dibentuk saat pertama kali diminta.
+    """
+
+    def __init__(self, series):
+        x = series.to_numpy(dtype=float, na_value=np.nan)
+        self.mask = _read_only(np.isnan(x))
+        self.values = _read_only(np.ascontiguousarray(x[~self.mask]))
+        self.n = self.values.size
+        self.n_missing = int(self.mask.sum())
+        self.min = float(self.values.min()) if self.n else np.nan
+        self.max = float(self.values.max()) if self.n else np.nan
+        self.all_positive = bool(self.n) and self.min > 0
+        self.is_constant = bool(self.n) and self.min == self.max
+        self._sorted = None
+
+    @property
+    def sorted(self):
+        if self._sorted is None:
+            self._sorted = _read_only(np.sort(self.values))
+        return self._sorted
+
+
+class DatasetProfile:
+    """Indeks profil kolom untuk satu versi dataset.
+
+    Klasifikasi kolom dihitung saat dibuat; profil per kolom numerik dibangun saat pertama
+    kali diakses lalu dipakai ulang sampai datanya berganti (indeks baru dibuat).
+    """
+
+    def __init__(self, frame):
+        self._frame = frame
+        self.n_rows = len(frame)
+        self.numeric_cols = frame.select_dtypes(include=np.number).columns.tolist()
+        self.datetime_cols = [col for col in frame.columns if pd.api.types.is_datetime64_any_dtype(frame[col])]
+        excluded = set(self.numeric_cols) | set(self.datetime_cols)
+        self.categorical_cols = [col for col in frame.columns if col not in excluded]
+        self._columns = {}
+        self._derived = {}
+
+    def __getitem__(self, col):
+        profile = self._columns.get(col)
+        if profile is None:
+            if col not in self.numeric_cols:
+                raise KeyError(f"Kolom '{col}' bukan kolom numerik.")
+            profile = self._columns[col] = ColumnProfile(self._frame[col])
+        return profile
+
+    def derived(self, key, compute):
+        """Hasil turunan (mis. agregat grafik) yang disimpan bersama profil dan hilang saat data berganti."""
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+
+    def values(self, col):
+        """Nilai kolom tanpa NaN sebagai array float64 kontigu (read-only)."""
+        return self[col].values
+
+    def paired(self, col1, col2):
+        """Nilai dua kolom pada baris yang lengkap di keduanya (untuk uji berpasangan)."""
+        valid = ~(self[col1].mask | self[col2].mask)
+        x1 = self._frame[col1].to_numpy(dtype=float, na_value=np.nan)
+        x2 = self._frame[col2].to_numpy(dtype=float, na_value=np.nan)
+        return x1[valid], x2[valid]
+
+    def non_positive(self, columns):
+        """Kolom yang memiliki nilai ≤ 0 (tidak boleh untuk transformasi log/Box-Cox)."""
+        return [col for col in columns if not self[col].all_positive]
+
+    def constant(self, columns):
+        return [col for col in columns if self[col].is_constant]
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def _anova_from_groups(count, mean, var):
+    """F dan p-value ANOVA 1 arah dari statistik per grup (baris = grup, kolom = variabel)."""
+    valid = count >= 2
+    n = count.where(valid)
+    k = valid.sum()
+    total = n.sum()
+    grand_mean = (n * mean).sum() / total
+    ssb = (n * (mean - grand_mean) ** 2).sum()
+    ssw = ((n - 1) * var).sum()
+    f_stat = (ssb / (k - 1)) / (ssw / (total - k))
+    p_val = stats.f.sf(f_stat, k - 1, total - k)
+    return f_stat, pd.Series(p_val, index=f_stat.index)
+
+
+def group_summary(df, group_col, value_col):
+    """Ringkasan per grup (count, mean, std, min, kuartil, max) untuk satu kolom nilai."""
+    grouped = df.groupby(group_col, observed=True)[value_col]
+    summary = grouped.agg(['count', 'mean', 'std', 'min', 'max'])
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    quartiles.columns = ['25%', '50%', '75%']
+    return summary.join(quartiles)[['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']]
+
+
+def compare_groups(df, group_col, value_cols):
+    """ANOVA, Kruskal-Wallis, Levene (median) dan Bartlett untuk banyak kolom sekaligus.
+
+    Semua uji dihitung dari agregasi groupby yang tervektorisasi atas seluruh kolom, sehingga
+    data hanya dibaca beberapa kali terlepas dari jumlah kolom. Grup dengan kurang dari dua
+    nilai diabaikan per kolom.
+    """
+    values = df[value_cols].astype(float)
+    groups = df[group_col]
+    grouped = values.groupby(groups, observed=True)
+    count = grouped.count()
+    mean = grouped.mean()
+    var = grouped.var()
+    valid = count >= 2
+    k = valid.sum()
+
+    # ANOVA 1 arah
+    f_stat, f_p = _anova_from_groups(count, mean, var)
+
+    # Kruskal-Wallis dengan koreksi nilai kembar; peringkat dihitung hanya pada grup yang valid
+    in_valid = valid.reindex(groups.to_numpy()).to_numpy()
+    ranked_values = values.where(in_valid)
+    ranks = ranked_values.rank()
+    n_total = ranks.count()
+    rank_sums = ranks.groupby(groups, observed=True).sum()
+    n_valid = count.where(valid)
+    h_stat = 12.0 / (n_total * (n_total + 1)) * (rank_sums ** 2 / n_valid).sum() - 3 * (n_total + 1)
+    ties = pd.Series({col: float(((t := ranked_values[col].value_counts().to_numpy().astype(float)) ** 3 - t).sum())
+                      for col in value_cols})
+    h_stat = h_stat / (1 - ties / (n_total ** 3 - n_total))
+    h_p = pd.Series(stats.chi2.sf(h_stat, k - 1), index=h_stat.index)
+
+    # Levene (berpusat median, seperti bawaan SciPy) = ANOVA pada |x - median grup|
+    deviations = (values - grouped.transform('median')).abs().groupby(groups, observed=True)
+    levene_stat, levene_p = _anova_from_groups(deviations.count(), deviations.mean(), deviations.var())
+
+    # Bartlett
+    n_minus_1 = (count - 1).where(valid)
+    total_minus_k = n_minus_1.sum()
+    pooled_var = (n_minus_1 * var).sum() / total_minus_k
+    numerator = total_minus_k * np.log(pooled_var) - (n_minus_1 * np.log(var.where(valid))).sum()
+    denominator = 1 + ((1 / n_minus_1).sum() - 1 / total_minus_k) / (3 * (k - 1))
+    bartlett_stat = numerator / denominator
+    bartlett_p = pd.Series(stats.chi2.sf(bartlett_stat, k - 1), index=bartlett_stat.index)
+
+    result = pd.DataFrame({
+        'Grup': k,
+        'ANOVA F': f_stat, 'ANOVA p': f_p,
+        'Kruskal-Wallis H': h_stat, 'Kruskal-Wallis p': h_p,
+        'Levene W': levene_stat, 'Levene p': levene_p,
+        'Bartlett T': bartlett_stat, 'Bartlett p': bartlett_p,
+    })
+    # Uji tidak terdefinisi bila kurang dari dua grup yang valid
+    result.loc[k < 2, result.columns[1:]] = np.nan
+    return result
+
+
+def group_boxplot_stats(df, group_col, value_col, whis=1.5):
+    """Statistik boxplot per grup untuk `Axes.bxp`, dihitung dengan groupby tanpa menggambar titik data."""
+    summary = group_summary(df, group_col, value_col)
+    data = df[[group_col, value_col]].dropna()
+    q1 = summary['25%'].reindex(data[group_col].to_numpy()).to_numpy()
+    q3 = summary['75%'].reindex(data[group_col].to_numpy()).to_numpy()
+    iqr = q3 - q1
+    inside = (data[value_col].to_numpy() >= q1 - whis * iqr) & (data[value_col].to_numpy() <= q3 + whis * iqr)
+    within = data[inside].groupby(group_col, observed=True)[value_col].agg(['min', 'max'])
+    outliers = (~inside).astype(int)
+    n_out = pd.Series(outliers, index=data.index).groupby(data[group_col], observed=True).sum()
+    box_stats = []
+    for group, row in summary.iterrows():
+        if row['count'] == 0:
+            continue
+        box_stats.append({
+            'label': str(group), 'med': row['50%'], 'q1': row['25%'], 'q3': row['75%'],
+            'whislo': within['min'].get(group, row['min']), 'whishi': within['max'].get(group, row['max']),
+            'fliers': [], 'mean': row['mean'], 'n_outliers': int(n_out.get(group, 0)),
+        })
+    return box_stats
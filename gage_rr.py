@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+CROSSED = "Crossed"
+NESTED = "Nested"
+# Pengali study variation (6 SD, bawaan Minitab) dan alpha untuk menghapus suku interaksi
+STUDY_VAR_MULTIPLIER = 6.0
+ALPHA_REMOVE_INTERACTION = 0.05
+STUDY_VAR_COLUMN = f'Study Var ({STUDY_VAR_MULTIPLIER:g}×SD)'
+CHARACTERISTIC = 'Karakteristik'
+VALUE = 'Nilai'
+
+SOURCES = ['Total Gage R&R', '  Repeatability', '  Reproducibility', '    Operator', '    Operator*Part', 'Part-to-Part', 'Total Variation']
+
+
+def to_long(df, part_col, operator_col, value_cols, characteristic_col=None):
+    """Menyusun data studi menjadi format panjang: karakteristik, part, operator, nilai.
+
+    Beberapa kolom pengukuran (satu per karakteristik) ditumpuk; bila `characteristic_col`
+    diberikan, data sudah panjang dan hanya satu kolom nilai yang dipakai.
+    """
+    if characteristic_col is not None:
+        long = df[[characteristic_col, part_col, operator_col, value_cols[0]]]
+        long.columns = [CHARACTERISTIC, part_col, operator_col, VALUE]
+    else:
+        long = df.melt(id_vars=[part_col, operator_col], value_vars=list(value_cols),
+                       var_name=CHARACTERISTIC, value_name=VALUE)
+    long = long.dropna(subset=[part_col, operator_col, VALUE])
+    long[VALUE] = long[VALUE].astype(float)
+    return long
+
+
+def _ss_about(frame, keys, weights):
+    """Σ bobot·(rata-rata grup - rata-rata karakteristik)² per karakteristik."""
+    means = frame.groupby([CHARACTERISTIC] + keys, observed=True)[VALUE].mean()
+    grand = frame.groupby(CHARACTERISTIC, observed=True)[VALUE].mean()
+    dev = means - grand.reindex(means.index.get_level_values(CHARACTERISTIC)).to_numpy()
+    return (dev ** 2).groupby(level=CHARACTERISTIC).sum() * weights
+
+
+def analyze(long, part_col, operator_col, study_type=CROSSED, alpha=ALPHA_REMOVE_INTERACTION):
+    """Studi Gage R&R metode ANOVA untuk semua karakteristik sekaligus.
+
+    Mengembalikan (ringkasan per karakteristik, {karakteristik: tabel ANOVA}, {karakteristik: komponen varians}).
+    Karakteristik dengan desain tidak seimbang dilewati dan dicatat di kolom 'Catatan'.
+    """
+    cell_keys = [part_col, operator_col] if study_type == CROSSED else [operator_col, part_col]
+    cells = long.groupby([CHARACTERISTIC] + cell_keys, observed=True)[VALUE].agg(['count', 'mean', 'var'])
+    by_char = cells.groupby(level=CHARACTERISTIC)
+    r = by_char['count'].min()
+    balanced = by_char['count'].max() == r
+    n_cells = by_char.size()
+    o = long.groupby(CHARACTERISTIC, observed=True)[operator_col].nunique()
+    if study_type == CROSSED:
+        p = long.groupby(CHARACTERISTIC, observed=True)[part_col].nunique()
+        balanced &= n_cells == p * o
+    else:
+        # Nested: jumlah part per operator harus sama
+        parts_per_operator = cells.groupby(level=[CHARACTERISTIC, operator_col]).size().groupby(level=CHARACTERISTIC)
+        p = parts_per_operator.min()
+        balanced &= parts_per_operator.max() == p
+    valid = balanced & (r >= 2) & (o >= 2) & (p >= 2)
+
+    ss_error = ((cells['count'] - 1) * cells['var']).groupby(level=CHARACTERISTIC).sum()
+    ss_total = long.groupby(CHARACTERISTIC, observed=True)[VALUE].var() * (long.groupby(CHARACTERISTIC, observed=True).size() - 1)
+    ss_oper = _ss_about(long, [operator_col], p * r)
+    df_oper, df_error = o - 1, o * p * (r - 1)
+
+    if study_type == CROSSED:
+        ss_part = _ss_about(long, [part_col], o * r)
+        ss_cells = _ss_about(long, cell_keys, r)
+        ss_int = ss_cells - ss_part - ss_oper
+        df_part, df_int = p - 1, (p - 1) * (o - 1)
+        ms_part, ms_oper, ms_int, ms_error = ss_part / df_part, ss_oper / df_oper, ss_int / df_int, ss_error / df_error
+        f_int = ms_int / ms_error
+        p_int = pd.Series(stats.f.sf(f_int, df_int, df_error), index=f_int.index)
+        keep_int = p_int <= alpha
+        # Tanpa interaksi: suku interaksi digabung ke galat (model tereduksi)
+        ms_pooled = (ss_int + ss_error) / (df_int + df_error)
+        ms_denominator = ms_int.where(keep_int, ms_pooled)
+        repeatability = ms_error.where(keep_int, ms_pooled)
+        interaction = ((ms_int - ms_error) / r).clip(lower=0).where(keep_int, 0.0)
+        operator = ((ms_oper - ms_denominator) / (p * r)).clip(lower=0)
+        part = ((ms_part - ms_denominator) / (o * r)).clip(lower=0)
+    else:
+        ss_part = _ss_about(long, cell_keys, r) - ss_oper
+        df_part = o * (p - 1)
+        ms_part, ms_oper, ms_error = ss_part / df_part, ss_oper / df_oper, ss_error / df_error
+        ss_int = df_int = ms_int = ms_pooled = None
+        keep_int = pd.Series(False, index=ms_part.index)
+        repeatability = ms_error
+        interaction = pd.Series(0.0, index=ms_part.index)
+        operator = ((ms_oper - ms_part) / (p * r)).clip(lower=0)
+        part = ((ms_part - ms_error) / r).clip(lower=0)
+
+    reproducibility = operator + interaction
+    gage = repeatability + reproducibility
+    total = gage + part
+    summary = pd.DataFrame({
+        'Part': p, 'Operator': o, 'Replikasi': r,
+        'Interaksi Dipakai': np.where(keep_int, 'Ya', 'Tidak') if study_type == CROSSED else '-',
+        'SD Gage R&R': np.sqrt(gage), 'SD Part': np.sqrt(part), 'SD Total': np.sqrt(total),
+        '%Contribution': 100 * gage / total,
+        '%Study Var': 100 * np.sqrt(gage / total),
+        'ndc': np.maximum(1, np.floor(1.41 * np.sqrt(part / gage))),
+    })
+    summary['Penilaian'] = pd.cut(summary['%Study Var'], [-np.inf, 10, 30, np.inf],
+                                  labels=['Dapat diterima', 'Marginal', 'Tidak dapat diterima']).astype(str)
+    summary['Catatan'] = np.where(valid, '', 'Desain tidak seimbang atau kurang data; tidak dianalisis')
+    summary.loc[~valid, summary.columns[3:-1]] = np.nan
+    summary.index.name = CHARACTERISTIC
+
+    terms = {
+        'p': p, 'o': o, 'r': r, 'keep_int': keep_int, 'ss_total': ss_total,
+        'ss_part': ss_part, 'df_part': df_part, 'ms_part': ms_part,
+        'ss_oper': ss_oper, 'df_oper': df_oper,
+        'ss_int': ss_int, 'df_int': df_int, 'ms_int': ms_int, 'ms_pooled': ms_pooled,
+        'ss_error': ss_error, 'df_error': df_error, 'ms_error': ms_error,
+    }
+    anova_tables, components = {}, {}
+    for char in summary.index[valid.reindex(summary.index).to_numpy()]:
+        anova_tables[char] = _anova_table(study_type, char, part_col, operator_col, terms)
+        var = np.array([gage[char], repeatability[char], reproducibility[char], operator[char],
+                        interaction[char], part[char], total[char]])
+        table = pd.DataFrame({'VarComp': var, '%Contribution': 100 * var / total[char]}, index=SOURCES)
+        if study_type == NESTED or not keep_int[char]:
+            table = table.drop(index='    Operator*Part')
+        table['StdDev (SD)'] = np.sqrt(table['VarComp'])
+        table[STUDY_VAR_COLUMN] = STUDY_VAR_MULTIPLIER * table['StdDev (SD)']
+        table['%Study Var'] = 100 * table['StdDev (SD)'] / np.sqrt(total[char])
+        components[char] = table
+    return summary, anova_tables, components
+
+
+def _anova_table(study_type, char, part_col, operator_col, v):
+    """Tabel ANOVA satu karakteristik dari besaran yang sudah dihitung di `analyze`."""
+    def row(source, ss, dof, denominator_ms=None, denominator_df=None):
+        ms = ss / dof
+        f = ms / denominator_ms if denominator_ms is not None else np.nan
+        p_val = stats.f.sf(f, dof, denominator_df) if denominator_ms is not None else np.nan
+        return source, dof, ss, ms, f, p_val
+
+    if study_type == NESTED:
+        rows = [
+            row(str(operator_col), v['ss_oper'][char], v['df_oper'][char], v['ms_part'][char], v['df_part'][char]),
+            row(f"{part_col} ({operator_col})", v['ss_part'][char], v['df_part'][char], v['ms_error'][char], v['df_error'][char]),
+            row('Repeatability', v['ss_error'][char], v['df_error'][char]),
+        ]
+    elif v['keep_int'][char]:
+        rows = [
+            row(str(part_col), v['ss_part'][char], v['df_part'][char], v['ms_int'][char], v['df_int'][char]),
+            row(str(operator_col), v['ss_oper'][char], v['df_oper'][char], v['ms_int'][char], v['df_int'][char]),
+            row(f"{part_col} * {operator_col}", v['ss_int'][char], v['df_int'][char], v['ms_error'][char], v['df_error'][char]),
+            row('Repeatability', v['ss_error'][char], v['df_error'][char]),
+        ]
+    else:
+        df_pooled = v['df_int'][char] + v['df_error'][char]
+        rows = [
+            row(str(part_col), v['ss_part'][char], v['df_part'][char], v['ms_pooled'][char], df_pooled),
+            row(str(operator_col), v['ss_oper'][char], v['df_oper'][char], v['ms_pooled'][char], df_pooled),
+            row('Repeatability', v['ss_int'][char] + v['ss_error'][char], df_pooled),
+        ]
+    rows.append(('Total', int(v['o'][char] * v['p'][char] * v['r'][char] - 1), v['ss_total'][char], np.nan, np.nan, np.nan))
+    return pd.DataFrame(rows, columns=['Sumber', 'DF', 'SS', 'MS', 'F', 'p-value']).set_index('Sumber')
+
+
+def cell_means(long, part_col, operator_col):
+    """Rata-rata per karakteristik × part (baris) × operator (kolom) untuk grafik per part dan interaksi."""
+    return long.groupby([CHARACTERISTIC, part_col, operator_col], observed=True)[VALUE].mean().unstack(operator_col)
+
+
+def tolerance_percent(summary, tolerances):
+    """%Tolerance = Study Var Gage R&R / (USL - LSL) untuk karakteristik yang toleransinya diisi."""
+    tol = pd.Series(tolerances, dtype=float).reindex(summary.index)
+    return 100 * STUDY_VAR_MULTIPLIER * summary['SD Gage R&R'] / tol.where(tol > 0)
@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+SOURCE_COLUMN = 'Sumber'
+MAX_PARSE_WORKERS = int(os.environ.get('PSD_PARSE_WORKERS', min(8, os.cpu_count() or 2)))
+
+
+def read_uploaded(file, sep=',', encoding='utf-8', sheet_name=0):
+    """Membaca satu file CSV/Excel (objek file atau path) menjadi DataFrame."""
+    name = getattr(file, 'name', str(file))
+    if name.lower().endswith('.csv'):
+        return pd.read_csv(file, sep=sep, encoding=encoding)
+    return pd.read_excel(file, sheet_name=sheet_name)
+
+
+def stack_files(files, sep=',', encoding='utf-8', source_col=SOURCE_COLUMN, max_workers=MAX_PARSE_WORKERS):
+    """Membaca banyak file secara paralel dan menumpuknya menjadi satu dataset format panjang.
+
+    Kolom sumber disimpan sebagai kategori (satu kode per baris, bukan string) dan kolom
+    setiap file dilepas begitu digabung, sehingga memori puncak tetap mendekati ukuran data
+    yang ditumpuk. Kolom yang tidak ada di suatu file diisi NaN. Mengembalikan (DataFrame,
+    dict nama file -> pesan error).
+    """
+    names = []
+    for f in files:
+        base = name = getattr(f, 'name', str(f))
+        # Nama file yang sama diberi nomor agar tetap bisa dibedakan sebagai sumber
+        suffix = 2
+        while name in names:
+            name = f"{base} ({suffix})"
+            suffix += 1
+        names.append(name)
+
+    def parse(file):
+        try:
+            return read_uploaded(file, sep=sep, encoding=encoding), None
+        except Exception as e:
+            return None, str(e)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files)))) as pool:
+        parsed = list(pool.map(parse, files))
+
+    errors = {name: error for name, (_, error) in zip(names, parsed) if error is not None}
+    parts = [(name, frame) for name, (frame, _) in zip(names, parsed) if frame is not None]
+    del parsed
+    if not parts:
+        return None, errors
+
+    sources = pd.Categorical.from_codes(
+        codes=np.repeat(np.arange(len(parts)), [len(frame) for _, frame in parts]),
+        categories=[name for name, _ in parts]
+    )
+    frames = [frame for _, frame in parts]
+    del parts
+    stacked = _concat_by_column(frames)
+    stacked.insert(0, source_col, sources)
+    return stacked, errors
+
+
+def _concat_by_column(frames):
+    """pd.concat(frames, ignore_index=True) satu kolom demi satu kolom; `frames` dikosongkan.
+
+    Setiap kolom diambil (pop) dari semua file lalu digabung, jadi yang hidup bersamaan hanya hasil
+    ditambah satu kolom, bukan seluruh bagian ditambah hasil. Tipe hasil sama dengan pd.concat
+    karena setiap kolom digabung sebagai DataFrame (file yang tidak punya kolom itu menjadi NaN).
+    """
+    if any(not frame.columns.is_unique for frame in frames):
+        return pd.concat(frames, ignore_index=True)
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    stacked = {}
+    for col in columns:
+        pieces = [pd.DataFrame({col: frame.pop(col)}) if col in frame.columns else pd.DataFrame(index=frame.index)
+                  for frame in frames]
+        stacked[col] = pd.concat(pieces, ignore_index=True)[col]
+        del pieces
+    frames.clear()
+    return pd.DataFrame(stacked, copy=False)
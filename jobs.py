@@ -0,0 +1,226 @@
+import hashlib
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# --- Konfigurasi Runner ---
+THREAD_WORKERS = int(os.environ.get('PSD_JOB_THREADS', 4))
+PROCESS_WORKERS = int(os.environ.get('PSD_JOB_PROCESSES', max(1, (os.cpu_count() or 2) - 1)))
+# Pekerjaan selesai yang belum diambil sesinya (lihat `forget`) dilepas setelah waktu ini
+FINISHED_TTL_SECONDS = 300
+# Pekerjaan yang selesai dalam waktu ini langsung ditampilkan tanpa indikator progres
+INLINE_WAIT_SECONDS = 0.5
+MAX_FINISHED_JOBS = 64
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class JobCancelled(Exception):
+    """Dilempar di dalam pekerjaan ketika pembatalan diminta."""
+
+
+def make_job_key(name, *parts, **params):
+    """Membuat kunci pekerjaan yang stabil dari nama analisis dan parameternya."""
+    payload = pickle.dumps((name, parts, sorted(params.items())), protocol=4)
+    return f"{name}:{hashlib.sha1(payload).hexdigest()[:16]}"
+
+
+class JobContext:
+    """Diberikan ke fungsi pekerjaan untuk melaporkan progres dan memeriksa pembatalan."""
+
+    def __init__(self, job):
+        self._job = job
+
+    def progress(self, fraction, message=None):
+        self.check_cancelled()
+        self._job.progress = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self._job.message = message
+
+    def check_cancelled(self):
+        if self._job.cancel_event.is_set():
+            raise JobCancelled()
+
+    @property
+    def cancelled(self):
+        return self._job.cancel_event.is_set()
+
+
+class Job:
+    """Status satu pekerjaan latar belakang."""
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.state = PENDING
+        self.progress = 0.0
+        self.message = None
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self.cancel_event = threading.Event()
+        # Pekerjaan di process pool tidak menerima konteks, jadi tidak melihat permintaan pembatalan
+        self.interruptible = True
+        self.future = None
+        self._done_event = threading.Event()
+
+    @property
+    def done(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancellable(self):
+        """False untuk pekerjaan process pool yang sudah berjalan: prosesnya tidak bisa dihentikan dari luar."""
+        return not self.done and (self.interruptible or self.future is None or not self.future.running())
+
+    def wait(self, timeout=None):
+        """Menunggu pekerjaan selesai; mengembalikan True bila sudah selesai."""
+        return self._done_event.wait(timeout)
+
+    def _finish(self, state, result=None, error=None):
+        if self.state == CANCELLED:
+            # Hasil dari pekerjaan yang sudah dibatalkan diabaikan
+            self._done_event.set()
+            return
+        self.state = state
+        self.result = result
+        self.error = error
+        if state == DONE:
+            self.progress = 1.0
+        self.finished = time.time()
+        self._done_event.set()
+
+
+class JobRunner:
+    """Menjalankan analisis berat di thread/process pool tanpa memblokir skrip Streamlit.
+
+    Pekerjaan diidentifikasi oleh kuncinya: pengiriman ulang dengan kunci yang sama
+    (misalnya setelah rerun) digabung ke pekerjaan yang sudah berjalan atau selesai, termasuk
+    yang gagal atau dibatalkan. Untuk menjalankan ulang, kunci harus dilepas dengan `forget`.
+    """
+
+    def __init__(self, thread_workers=THREAD_WORKERS, process_workers=PROCESS_WORKERS):
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix='psd-job')
+        self._process_workers = process_workers
+        self._processes = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, label=None, use_process=False, **kwargs):
+        """Mengirim pekerjaan, atau mengembalikan pekerjaan yang sudah ada dengan kunci yang sama.
+
+        Fungsi untuk thread pool menerima `JobContext` sebagai argumen pertama. Fungsi untuk
+        process pool harus berada di modul yang bisa diimpor dan tidak menerima konteks.
+        """
+        with self._lock:
+            self._evict()
+            job = self._jobs.get(key)
+            if job is not None:
+                return job
+            job = self._jobs[key] = Job(key, label or key)
+
+        if use_process:
+            job.state = RUNNING
+            job.interruptible = False
+            job.future = self._process_pool().submit(fn, *args, **kwargs)
+            job.future.add_done_callback(lambda future: self._collect(job, future))
+        else:
+            job.future = self._threads.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def submit_process(self, fn, *args, **kwargs):
+        """Mengirim satu tugas ke process pool dan mengembalikan `Future`-nya (tanpa registri pekerjaan).
+
+        Dipakai oleh pekerjaan thread yang membagi kerjanya ke beberapa proses.
+        """
+        return self._process_pool().submit(fn, *args, **kwargs)
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def forget(self, key):
+        """Melepas pekerjaan yang sudah selesai dari registri (hasilnya ikut dilepas).
+
+        Dipakai setelah pekerjaan diserahkan ke sesi yang memintanya, agar hasilnya tidak
+        tertahan di registri global. Pekerjaan yang masih berjalan tidak dilepas.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.done:
+                del self._jobs[key]
+
+    def cancel(self, key):
+        """Meminta pembatalan pekerjaan. Pekerjaan yang belum mulai langsung dibatalkan.
+
+        Pekerjaan process pool yang sudah berjalan tidak bisa dihentikan; pemanggilan ini
+        mengembalikan False dan pekerjaan dibiarkan selesai.
+        """
+        job = self.get(key)
+        if job is None or job.done:
+            return False
+        stopped = job.future.cancel() if job.future is not None else True
+        if not stopped and not job.interruptible:
+            return False
+        job.cancel_event.set()
+        job.state = CANCELLED
+        job.finished = time.time()
+        job._done_event.set()
+        return True
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_event.is_set():
+            return
+        job.state = RUNNING
+        try:
+            result = fn(JobContext(job), *args, **kwargs)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except Exception as e:
+            job._finish(FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            job._finish(DONE, result=result)
+
+    def _collect(self, job, future):
+        if future.cancelled():
+            job._finish(CANCELLED)
+            return
+        error = future.exception()
+        if error is not None:
+            job._finish(FAILED, error=f"{type(error).__name__}: {error}")
+        else:
+            job._finish(DONE, result=future.result())
+
+    def _process_pool(self):
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self._process_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._processes
+
+    def _evict(self):
+        now = time.time()
+        finished = sorted((job.finished, key) for key, job in self._jobs.items() if job.done)
+        for finished_at, key in finished:
+            if now - finished_at > FINISHED_TTL_SECONDS:
+                del self._jobs[key]
+        finished = [key for _, key in finished if key in self._jobs]
+        for key in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[key]
+
+
+runner = JobRunner()
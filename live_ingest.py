@@ -0,0 +1,294 @@
+import copy
+import glob
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from sketches import ColumnSketch
+
+# Jumlah bin maksimum histogram bergulir; bila rentang data melebar, lebar bin digandakan
+HISTOGRAM_MAX_BINS = 64
+# Batas byte yang dibaca per polling agar satu refresh tidak memblokir terlalu lama
+MAX_READ_BYTES = 64 * 1024 * 1024
+# Faktor d2 untuk moving range 2 titik (I-MR chart)
+MR_D2 = 1.128
+# Baris baru ditampung per blok dan digabung ke dataset sesi paling sering sekali per interval ini;
+# setiap penggabungan menyalin seluruh frame dan membuat versi data baru (cache turunan dibangun ulang)
+PUBLISH_SECONDS = float(os.environ.get('PSD_LIVE_PUBLISH_SECONDS', 30))
+# Jumlah baris terakhir yang disimpan terpisah untuk I-Chart, diperbarui setiap polling
+RECENT_ROWS = 1000
+
+
+class TailReader:
+    """Membaca hanya byte yang baru ditambahkan ke file CSV.
+
+    `path` boleh berupa file atau folder; untuk folder dipakai file terbaru yang cocok dengan
+    `pattern`. Baris yang belum lengkap (tanpa newline) ditahan sampai polling berikutnya. Bila
+    file terpotong atau diganti (rotasi), pembacaan dimulai lagi dari awal file baru.
+    """
+
+    def __init__(self, path, pattern='*.csv', sep=',', encoding='utf-8'):
+        self.path = path
+        self.pattern = pattern
+        self.sep = sep
+        self.encoding = encoding
+        self.current_file = None
+        self.offset = 0
+        self.columns = None
+        self.dtypes = None
+        self._identity = None
+        self._pending = b''
+
+    def _resolve(self):
+        if os.path.isdir(self.path):
+            files = glob.glob(os.path.join(self.path, self.pattern))
+            return max(files, key=os.path.getmtime) if files else None
+        return self.path if os.path.isfile(self.path) else None
+
+    def _reset(self, file):
+        self.current_file = file
+        self.offset = 0
+        self.columns = None
+        self.dtypes = None
+        self._pending = b''
+
+    def _pin_dtypes(self, rows):
+        """Tipe kolom ditetapkan dari blok pertama; blok berikutnya dipaksa ke tipe yang sama.
+
+        Tanpa ini tipe ditebak ulang per blok (int lalu float, angka lalu teks) dan gabungan
+        blok di sesi berganti tipe di tengah jalan.
+        """
+        if self.dtypes is None:
+            self.dtypes = {col: np.dtype(float) if is_numeric_dtype(rows[col]) and not is_bool_dtype(rows[col])
+                           else rows[col].astype(str).dtype
+                           for col in rows.columns}
+        for col, dtype in self.dtypes.items():
+            if rows[col].dtype == dtype:
+                continue
+            if dtype == np.dtype(float):
+                # Nilai yang bukan angka menjadi NaN, bukan mengubah kolom menjadi teks
+                rows[col] = pd.to_numeric(rows[col], errors='coerce').astype(float)
+            else:
+                rows[col] = rows[col].astype(dtype)
+        return rows
+
+    def poll(self):
+        """Membaca baris baru sejak polling terakhir.
+
+        Mengembalikan (DataFrame baris baru atau None, True bila file baru/rotasi terdeteksi).
+        """
+        file = self._resolve()
+        if file is None:
+            return None, False
+        stat = os.stat(file)
+        identity = (file, getattr(stat, 'st_ino', None))
+        rotated = identity != self._identity or stat.st_size < self.offset
+        if rotated:
+            self._identity = identity
+            self._reset(file)
+        if stat.st_size == self.offset:
+            return None, rotated
+
+        with open(file, 'rb') as fh:
+            fh.seek(self.offset)
+            chunk = fh.read(MAX_READ_BYTES)
+        self.offset += len(chunk)
+        data = self._pending + chunk
+        cut = data.rfind(b'\n') + 1
+        self._pending = data[cut:]
+        data = data[:cut]
+        if self.columns is None:
+            header_end = data.find(b'\n') + 1
+            if header_end == 0:
+                # Header belum lengkap; tunggu polling berikutnya
+                self._pending = data + self._pending
+                return None, rotated
+            header = pd.read_csv(io.BytesIO(data[:header_end]), sep=self.sep, encoding=self.encoding, nrows=0)
+            self.columns = header.columns.tolist()
+            data = data[header_end:]
+        if not data.strip():
+            return None, rotated
+        # Kolom teks dibaca sebagai teks sejak awal agar '3' tidak menjadi '3.0'
+        text = {col: str for col, dtype in self.dtypes.items() if dtype != np.dtype(float)} if self.dtypes else None
+        rows = pd.read_csv(io.BytesIO(data), sep=self.sep, encoding=self.encoding, header=None,
+                           names=self.columns, skip_blank_lines=True, dtype=text)
+        return self._pin_dtypes(rows), rotated
+
+
+class StreamingHistogram:
+    """Histogram lebar-bin tetap yang diperbarui per blok; bin digabung berpasangan saat rentang melebar."""
+
+    def __init__(self, max_bins=HISTOGRAM_MAX_BINS):
+        self.max_bins = max_bins
+        self.width = None
+        self.low = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return self
+        if self.width is None:
+            span = float(values.max() - values.min())
+            scale = span if span > 0 else max(abs(float(values[0])), 1.0)
+            # Lebar bin awal dibulatkan ke pangkat dua agar penggandaan tetap sejajar
+            self.width = 2.0 ** np.floor(np.log2(scale / (self.max_bins / 2)))
+            self.low = int(np.floor(values.min() / self.width))
+        index = np.floor(values / self.width).astype(np.int64)
+        low = min(self.low, int(index.min()))
+        high = max(self.low + self.counts.size - 1, int(index.max()))
+        while high - low + 1 > self.max_bins:
+            self._coarsen()
+            index = np.floor_divide(index, 2)
+            low, high = int(np.floor_divide(low, 2)), int(np.floor_divide(high, 2))
+        counts = np.zeros(high - low + 1, dtype=np.int64)
+        if self.counts.size:
+            counts[self.low - low:self.low - low + self.counts.size] = self.counts
+        counts += np.bincount(index - low, minlength=counts.size)
+        self.low, self.counts = low, counts
+        return self
+
+    def _coarsen(self):
+        if self.counts.size:
+            positions = np.arange(self.low, self.low + self.counts.size) // 2
+            new_low = int(positions[0])
+            self.counts = np.bincount(positions - new_low, weights=self.counts).astype(np.int64)
+            self.low = new_low
+        else:
+            self.low //= 2
+        self.width *= 2
+
+    @property
+    def edges(self):
+        return (self.low + np.arange(self.counts.size + 1)) * self.width
+
+
+class ControlLimits:
+    """Batas kendali I-MR (individual & moving range) yang diperbarui per blok data."""
+
+    def __init__(self):
+        self.last = None
+        self.mr_sum = 0.0
+        self.mr_count = 0
+        self.out_of_control = 0
+
+    def update(self, values, moments):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        chain = values if self.last is None else np.concatenate([[self.last], values])
+        ranges = np.abs(np.diff(chain))
+        self.mr_sum += float(ranges.sum())
+        self.mr_count += ranges.size
+        self.last = float(values[-1])
+        lcl, _, ucl = self.limits(moments)
+        if not np.isnan(ucl):
+            self.out_of_control += int(((values > ucl) | (values < lcl)).sum())
+        return self
+
+    @property
+    def mr_bar(self):
+        return self.mr_sum / self.mr_count if self.mr_count else np.nan
+
+    def limits(self, moments):
+        """(LCL, CL, UCL) berdasarkan rata-rata keseluruhan dan MR̄/d2."""
+        sigma = self.mr_bar / MR_D2
+        return moments.mean - 3 * sigma, moments.mean, moments.mean + 3 * sigma
+
+
+class LiveSource:
+    """Status satu sumber data langsung: pembaca tail ditambah statistik bergulir per kolom numerik.
+
+    Statistik bergulir dan `recent` diperbarui setiap polling; baris baru untuk dataset sesi
+    ditampung sebagai daftar blok dan diambil lewat `take_snapshot` paling sering sekali per
+    `publish_seconds`.
+    """
+
+    def __init__(self, path, pattern='*.csv', sep=',', encoding='utf-8', publish_seconds=PUBLISH_SECONDS):
+        self.reader = TailReader(path, pattern=pattern, sep=sep, encoding=encoding)
+        self.publish_seconds = publish_seconds
+        self.sketches = {}
+        self.histograms = {}
+        self.control = {}
+        self.recent = None
+        self.rows = 0
+        self.polls = 0
+        self.error = None
+        self._chunks = []
+        # Snapshot pertama (dan setelah rotasi file) mengganti dataset sesi, bukan menambahkannya
+        self._replace = True
+        self._published = -np.inf
+        self._lock = threading.Lock()
+
+    @property
+    def options(self):
+        r = self.reader
+        return (r.path, r.pattern, r.sep, r.encoding)
+
+    def poll(self):
+        """Membaca baris baru dan memperbarui statistik; mengembalikan (baris baru, rotasi)."""
+        with self._lock:
+            self.polls += 1
+            try:
+                rows, rotated = self.reader.poll()
+                self.error = None
+            except Exception as e:
+                self.error = str(e)
+                return None, False
+            if rotated:
+                self.sketches, self.histograms, self.control, self.rows = {}, {}, {}, 0
+                self.recent, self._chunks, self._replace = None, [], True
+            if rows is None or rows.empty:
+                return None, rotated
+            self.rows += len(rows)
+            self._chunks.append(rows)
+            self.recent = (rows if self.recent is None else pd.concat([self.recent, rows], ignore_index=True)).tail(RECENT_ROWS)
+            for col in rows.select_dtypes(include=np.number).columns:
+                values = rows[col].to_numpy(dtype=float, na_value=np.nan)
+                sketch = self.sketches.setdefault(col, ColumnSketch())
+                sketch.update(values)
+                self.histograms.setdefault(col, StreamingHistogram()).update(values)
+                self.control.setdefault(col, ControlLimits()).update(values, sketch.moments)
+            return rows, rotated
+
+    def take_snapshot(self):
+        """Baris yang belum dipublikasikan (digabung sekali) bila intervalnya sudah lewat.
+
+        Mengembalikan (baris baru atau None, True bila dataset sesi harus diganti, bukan ditambah,
+        salinan sketsa kolom saat publikasi atau None). Sketsa disalin agar statistik sesi hanya
+        mencakup baris yang sudah masuk dataset, bukan baris yang masih menunggu publikasi.
+        """
+        with self._lock:
+            due = self._replace or time.monotonic() - self._published >= self.publish_seconds
+            if not due or not (self._chunks or self._replace):
+                return None, False, None
+            rows = pd.concat(self._chunks, ignore_index=True) if self._chunks else None
+            replace = self._replace
+            self._chunks, self._replace = [], False
+            self._published = time.monotonic()
+            return rows, replace, copy.deepcopy(self.sketches)
+
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def get_source(session_id, path, pattern='*.csv', sep=',', encoding='utf-8'):
+    """Sumber langsung milik sesi; dibuat ulang bila path atau pengaturannya berubah."""
+    with _sources_lock:
+        source = _sources.get(session_id)
+        if source is None or source.options != (path, pattern, sep, encoding):
+            source = _sources[session_id] = LiveSource(path, pattern=pattern, sep=sep, encoding=encoding)
+        return source
+
+
+def drop_source(session_id):
+    with _sources_lock:
+        _sources.pop(session_id, None)
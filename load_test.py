@@ -0,0 +1,161 @@
+"""Uji beban lokal untuk mode multi-proses: beberapa proses worker memakai folder bersama yang sama.
+
+Setiap worker mensimulasikan rerun aplikasi: membaca status pengguna dan fitur dari SQLite
+(sesekali menulis status fitur), mengambil dataset dari cache bersama, membaca atau menyimpan
+statistik deskriptif di cache hasil, lalu menjalankan sedikit komputasi yang tidak di-cache.
+Contoh:
+
+    python load_test.py --workers 1 2 4 8 --duration 15 --datasets 4 --rows 50000
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+FEATURES = ['Histogram', 'Boxplot', 'Scatter Plot', 'Heatmap', 'Uji Normalitas', 'Uji Hipotesis']
+
+
+def make_datasets(folder, count, rows, seed):
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"data_{i}.csv")
+        pd.DataFrame({
+            'Mesin': rng.choice(['CNC-1', 'CNC-2', 'CNC-3'], rows),
+            'Diameter': rng.normal(25.0, 0.02, rows),
+            'Kekerasan': rng.normal(45.0, 1.5, rows),
+            'Berat': rng.normal(120.0, 3.0, rows),
+        }).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def make_auth_db(path):
+    """Tabel users dan features dengan skema yang sama seperti init_db di aplikasi."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id TEXT PRIMARY KEY, password TEXT, role TEXT, status TEXT)")
+    conn.execute("CREATE TABLE features (feature_name TEXT PRIMARY KEY, is_enabled INTEGER)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)",
+                     [(f"user{i:03d}", 'x', 'User', 'approved') for i in range(100)])
+    conn.executemany("INSERT INTO features VALUES (?, 1)", [(name,) for name in FEATURES])
+    conn.commit()
+    conn.close()
+
+
+def worker(index, shared_dir, db_file, paths, start_at, duration, write_every, results):
+    # Konfigurasi dibaca saat import, jadi modul aplikasi baru diimpor setelah env diisi
+    os.environ['PSD_SHARED_DIR'] = shared_dir
+    os.environ.pop('PSD_RESULT_DB', None)
+    import shared_cache
+    from result_store import dataset_hash, store
+
+    rng = np.random.default_rng(index)
+    hashes = {}
+    latencies, parses, errors = [], 0, 0
+
+    def parse(path):
+        nonlocal parses
+        parses += 1
+        return pd.read_csv(path)
+
+    time.sleep(max(0.0, start_at - time.time()))
+    reruns = 0
+    while time.time() < start_at + duration:
+        start = time.perf_counter()
+        try:
+            conn = shared_cache.connect_sqlite(db_file)
+            user = f"user{rng.integers(100):03d}"
+            conn.execute("SELECT status, role FROM users WHERE id = ?", (user,)).fetchone()
+            dict(conn.execute("SELECT feature_name, is_enabled FROM features").fetchall())
+            if write_every and reruns % write_every == write_every - 1:
+                with conn:
+                    conn.execute("UPDATE features SET is_enabled = ? WHERE feature_name = ?",
+                                 (int(rng.integers(2)), FEATURES[rng.integers(len(FEATURES))]))
+            conn.close()
+
+            path = paths[rng.integers(len(paths))]
+            key = shared_cache.content_key([path], 'csv', ',', 'utf-8')
+            frame = shared_cache.datasets.get_or_parse(key, lambda: parse(path))
+            # Hash dataset dihitung sekali per dataset, seperti per versi data di sesi aplikasi
+            if key not in hashes:
+                hashes[key] = dataset_hash(frame)
+            found, _ = store.get(hashes[key], 'Statistik Deskriptif', {})
+            if not found:
+                store.put(hashes[key], 'Statistik Deskriptif', {}, frame.describe())
+
+            # Bagian rerun yang tidak di-cache (mis. menyiapkan tampilan dan grafik)
+            values = frame['Diameter'].to_numpy()
+            np.histogram(values, bins=20)
+            np.sort(values)
+            frame.groupby('Mesin')['Kekerasan'].mean()
+        except (sqlite3.OperationalError, TimeoutError):
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        reruns += 1
+    results.put({'reruns': reruns, 'latencies': latencies, 'parses': parses, 'errors': errors})
+
+
+def run(workers, paths, root, duration, write_every):
+    shared_dir = os.path.join(root, f"shared_{workers}")
+    db_file = os.path.join(shared_dir, 'aplikasi_db.sqlite')
+    os.makedirs(shared_dir)
+    make_auth_db(db_file)
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    # Waktu mulai bersama, setelah semua proses selesai diimpor
+    start_at = time.time() + 5.0
+    processes = [context.Process(target=worker, args=(i, shared_dir, db_file, paths, start_at, duration,
+                                                       write_every, results))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    latencies = np.concatenate([o['latencies'] for o in outcomes]) if outcomes else np.array([])
+    reruns = sum(o['reruns'] for o in outcomes)
+    return {
+        'Worker': workers,
+        'Rerun/detik': reruns / duration,
+        'p50 (ms)': np.percentile(latencies, 50) * 1000 if latencies.size else np.nan,
+        'p95 (ms)': np.percentile(latencies, 95) * 1000 if latencies.size else np.nan,
+        'Parsing': sum(o['parses'] for o in outcomes),
+        'Error': sum(o['errors'] for o in outcomes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mengukur throughput mode multi-proses terhadap jumlah worker.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="Jumlah proses yang diuji")
+    parser.add_argument('--duration', type=float, default=10.0, help="Lama pengukuran per jumlah worker (detik)")
+    parser.add_argument('--datasets', type=int, default=4, help="Jumlah file CSV berbeda")
+    parser.add_argument('--rows', type=int, default=50000, help="Jumlah baris per file CSV")
+    parser.add_argument('--write-every', type=int, default=50, help="Tulis status fitur setiap sejumlah rerun (0 = tidak)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='psd_load_') as root:
+        paths = make_datasets(root, args.datasets, args.rows, args.seed)
+        print(f"CPU: {os.cpu_count()}, dataset: {args.datasets} × {args.rows} baris, {args.duration:g} detik per uji")
+        rows = []
+        for workers in args.workers:
+            rows.append(run(workers, paths, root, args.duration, args.write_every))
+            print(f"{workers} worker: {rows[-1]['Rerun/detik']:.1f} rerun/detik", flush=True)
+
+    table = pd.DataFrame(rows).set_index('Worker')
+    table.insert(1, 'Speedup', table['Rerun/detik'] / table['Rerun/detik'].iloc[0])
+    print(table.round(2).to_string())
+    # Dengan cache bersama setiap dataset hanya diparsing sekali per uji, berapa pun jumlah worker
+    print(f"Parsing yang diharapkan per uji: {args.datasets}")
+
+
+if __name__ == '__main__':
+    main()
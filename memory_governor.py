@@ -0,0 +1,317 @@
+import itertools
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+# --- Konfigurasi Anggaran Memori ---
+SESSION_BUDGET_MB = float(os.environ.get('PSD_SESSION_BUDGET_MB', 256))
+GLOBAL_BUDGET_MB = float(os.environ.get('PSD_GLOBAL_BUDGET_MB', 2048))
+IDLE_SECONDS = float(os.environ.get('PSD_IDLE_SECONDS', 900))
+SPILL_DIR = os.environ.get('PSD_SPILL_DIR', os.path.join(tempfile.gettempdir(), 'psd_spill'))
+SWEEP_INTERVAL = 60
+# Frame di bawah ukuran ini dibandingkan isinya sebelum diganti, agar versinya tidak berubah sia-sia
+COMPARE_LIMIT_BYTES = 8 * 1024 * 1024
+
+MB = 1024 * 1024
+
+
+def frame_nbytes(obj):
+    """Menghitung ukuran memori DataFrame/Series (termasuk isi kolom object)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    return 0
+
+
+class _Entry:
+    __slots__ = ('value', 'nbytes', 'last_access', 'spill_path', 'is_series', 'version', 'labels', 'unspillable')
+
+    def __init__(self, value, version):
+        self.value = value
+        self.version = version
+        self.nbytes = frame_nbytes(value)
+        self.last_access = time.time()
+        self.spill_path = None
+        self.is_series = isinstance(value, pd.Series)
+        # Nama kolom (atau nama Series) asli selama di-spill; Parquet hanya menerima nama kolom string
+        self.labels = None
+        self.unspillable = False
+
+
+class _Session:
+    __slots__ = ('user_id', 'last_seen', 'entries')
+
+    def __init__(self):
+        self.user_id = None
+        self.last_seen = time.time()
+        self.entries = {}
+
+
+class MemoryGovernor:
+    """Menyimpan frame milik setiap sesi dengan batas memori per sesi dan global.
+
+    Frame yang dingin (sesi tidak aktif atau melebihi anggaran) ditulis ke disk
+    dalam format Parquet dan dibaca ulang secara transparan ketika diakses lagi.
+    Sesi yang sudah ditutup dihapus seluruhnya.
+    """
+
+    def __init__(self, session_budget_mb=SESSION_BUDGET_MB, global_budget_mb=GLOBAL_BUDGET_MB,
+                 idle_seconds=IDLE_SECONDS, spill_dir=SPILL_DIR, is_alive=None):
+        self.session_budget = int(session_budget_mb * MB)
+        self.global_budget = int(global_budget_mb * MB)
+        self.idle_seconds = idle_seconds
+        self.spill_dir = spill_dir
+        self.is_alive = is_alive
+        self._sessions = {}
+        self._lock = threading.RLock()
+        self._versions = itertools.count(1)
+        self._sweeper = None
+        self._drop_hooks = []
+
+    # --- Akses Frame ---
+    def put(self, session_id, key, value):
+        """Menyimpan (atau mengganti) frame milik sesi. Frame yang isinya sama tidak mengubah versi."""
+        with self._lock:
+            session = self._session(session_id)
+            old = session.entries.get(key)
+            if old is not None and old.value is not None and value is not None and (
+                    old.value is value
+                    or (old.nbytes <= COMPARE_LIMIT_BYTES and type(old.value) is type(value) and old.value.equals(value))):
+                old.value = value
+                old.last_access = time.time()
+                return
+            session.entries.pop(key, None)
+            if old is not None:
+                self._remove_spill(old)
+            if value is not None:
+                session.entries[key] = _Entry(value, next(self._versions))
+            dropped = self._enforce(protect=(session_id, key))
+        self._run_drop_hooks(dropped)
+
+    def get(self, session_id, key, default=None):
+        """Mengambil frame milik sesi, membaca ulang dari disk bila sudah di-spill."""
+        with self._lock:
+            session = self._session(session_id)
+            entry = session.entries.get(key)
+            if entry is None:
+                return default
+            entry.last_access = time.time()
+            dropped = []
+            if entry.value is None:
+                self._reload(entry)
+                dropped = self._enforce(protect=(session_id, key))
+            value = entry.value
+        self._run_drop_hooks(dropped)
+        return value
+
+    def version(self, session_id, key):
+        """Nomor versi frame; berubah setiap kali frame diganti dengan `put`."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            entry = session.entries.get(key) if session is not None else None
+            return entry.version if entry is not None else None
+
+    def contains(self, session_id, key):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session is not None and key in session.entries
+
+    def discard(self, session_id, key):
+        """Menghapus satu frame milik sesi."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                entry = session.entries.pop(key, None)
+                if entry is not None:
+                    self._remove_spill(entry)
+
+    def touch(self, session_id, user_id=None):
+        """Menandai sesi masih aktif dan menjalankan penegakan anggaran."""
+        with self._lock:
+            session = self._session(session_id)
+            if user_id is not None:
+                session.user_id = user_id
+            dropped = self._enforce()
+        self._run_drop_hooks(dropped)
+        self._ensure_sweeper()
+
+    def drop_session(self, session_id):
+        """Menghapus semua frame milik sesi (memori dan file spill)."""
+        with self._lock:
+            self._forget_session(session_id)
+        self._run_drop_hooks([session_id])
+
+    def on_drop(self, hook):
+        """Mendaftarkan `hook(session_id)` yang dipanggil setiap kali sesi dihapus (logout atau sesi ditutup)."""
+        with self._lock:
+            if hook not in self._drop_hooks:
+                self._drop_hooks.append(hook)
+
+    # --- Laporan untuk Admin ---
+    def usage(self):
+        """Mengembalikan ringkasan penggunaan memori per sesi sebagai DataFrame."""
+        with self._lock:
+            rows = []
+            now = time.time()
+            for session_id, session in self._sessions.items():
+                in_memory = sum(e.nbytes for e in session.entries.values() if e.value is not None)
+                spilled = sum(e.nbytes for e in session.entries.values() if e.value is None)
+                unspillable = sum(e.nbytes for e in session.entries.values() if e.value is not None and e.unspillable)
+                rows.append({
+                    'Sesi': session_id[:8],
+                    'Pengguna': session.user_id,
+                    'Frame': len(session.entries),
+                    'Di Memori (MB)': round(in_memory / MB, 2),
+                    'Di Disk (MB)': round(spilled / MB, 2),
+                    'Tidak Bisa Di-spill (MB)': round(unspillable / MB, 2),
+                    'Tidak Aktif (detik)': int(now - session.last_seen),
+                })
+        return pd.DataFrame(rows, columns=['Sesi', 'Pengguna', 'Frame', 'Di Memori (MB)', 'Di Disk (MB)',
+                                           'Tidak Bisa Di-spill (MB)', 'Tidak Aktif (detik)'])
+
+    def total_in_memory(self):
+        with self._lock:
+            return sum(e.nbytes for s in self._sessions.values()
+                       for e in s.entries.values() if e.value is not None)
+
+    # --- Internal ---
+    def _session(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session()
+        session.last_seen = time.time()
+        return session
+
+    def _forget_session(self, session_id):
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            for entry in session.entries.values():
+                self._remove_spill(entry)
+
+    def _run_drop_hooks(self, session_ids):
+        # Dipanggil setelah kunci dilepas: hook boleh lambat atau memanggil governor lagi
+        if not session_ids:
+            return
+        with self._lock:
+            hooks = list(self._drop_hooks)
+        for session_id in session_ids:
+            for hook in hooks:
+                hook(session_id)
+
+    def _enforce(self, protect=None):
+        """Menegakkan anggaran; mengembalikan ID sesi yang dihapus agar hook-nya dipanggil di luar kunci."""
+        now = time.time()
+        dropped = []
+        # Sesi yang sudah ditutup dibuang, sesi yang lama tidak aktif di-spill seluruhnya
+        for session_id in list(self._sessions):
+            session = self._sessions[session_id]
+            if self.is_alive is not None and not self.is_alive(session_id):
+                self._forget_session(session_id)
+                dropped.append(session_id)
+                continue
+            if now - session.last_seen > self.idle_seconds:
+                for key, entry in session.entries.items():
+                    if entry.value is not None and (session_id, key) != protect:
+                        self._spill(entry)
+
+        # Anggaran per sesi: spill frame yang paling lama tidak diakses
+        for session_id, session in self._sessions.items():
+            hot = [(e.last_access, key, e) for key, e in session.entries.items()
+                   if e.value is not None and (session_id, key) != protect]
+            used = sum(e.nbytes for e in session.entries.values() if e.value is not None)
+            for _, _, entry in sorted(hot, key=lambda item: item[0]):
+                if used <= self.session_budget:
+                    break
+                if self._spill(entry):
+                    used -= entry.nbytes
+
+        # Anggaran global: spill lintas sesi, yang paling dingin lebih dulu
+        used = self.total_in_memory()
+        if used > self.global_budget:
+            hot = [(e.last_access, e) for session_id, s in self._sessions.items()
+                   for key, e in s.entries.items()
+                   if e.value is not None and (session_id, key) != protect]
+            for _, entry in sorted(hot, key=lambda item: item[0]):
+                if used <= self.global_budget:
+                    break
+                if self._spill(entry):
+                    used -= entry.nbytes
+        return dropped
+
+    def _spill(self, entry):
+        if entry.unspillable:
+            return False
+        entry.nbytes = frame_nbytes(entry.value)
+        if entry.spill_path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.parquet")
+            if entry.is_series:
+                entry.labels = entry.value.name
+                frame = entry.value.to_frame(name='value')
+            else:
+                frame = entry.value
+                if not all(isinstance(col, str) for col in frame.columns) or not frame.columns.is_unique:
+                    # Nama kolom non-string (angka, tuple, duplikat) diganti posisi; nama asli dipulihkan saat dibaca
+                    entry.labels = frame.columns
+                    frame = frame.set_axis([str(i) for i in range(frame.shape[1])], axis=1)
+            try:
+                frame.to_parquet(path)
+            except Exception:
+                # Tipe kolom yang tidak bisa ditulis ke Parquet tetap disimpan di memori (terlihat di usage())
+                if os.path.exists(path):
+                    os.remove(path)
+                entry.labels = None
+                entry.unspillable = True
+                return False
+            entry.spill_path = path
+        entry.value = None
+        return True
+
+    def _reload(self, entry):
+        frame = pd.read_parquet(entry.spill_path)
+        if entry.is_series:
+            frame = frame.iloc[:, 0].rename(entry.labels)
+        elif entry.labels is not None:
+            frame.columns = entry.labels
+        entry.value = frame
+        entry.labels = None
+        # Frame bisa diubah di tempat setelah dibaca ulang, jadi file lama tidak dipakai lagi
+        self._remove_spill(entry)
+
+    def _remove_spill(self, entry):
+        if entry.spill_path is not None:
+            try:
+                os.remove(entry.spill_path)
+            except OSError:
+                pass
+            entry.spill_path = None
+
+    def _ensure_sweeper(self):
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        def sweep():
+            while True:
+                time.sleep(SWEEP_INTERVAL)
+                with self._lock:
+                    dropped = self._enforce()
+                self._run_drop_hooks(dropped)
+
+        self._sweeper = threading.Thread(target=sweep, name='psd-memory-sweeper', daemon=True)
+        self._sweeper.start()
+
+
+def _streamlit_session_alive(session_id):
+    try:
+        from streamlit.runtime import Runtime
+        return Runtime.instance().is_active_session(session_id)
+    except Exception:
+        return True
+
+
+governor = MemoryGovernor(is_alive=_streamlit_session_alive)
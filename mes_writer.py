@@ -0,0 +1,52 @@
+"""Simulasi ekspor MES: menambahkan baris pengukuran ke file CSV secara berkala.
+
+Dipakai untuk menguji mode "Sumber Langsung", misalnya:
+
+    python mes_writer.py data_mes/hasil.csv --interval 0.5 --batch 5 --drift 0.002
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Menambahkan baris pengukuran simulasi ke file CSV.")
+    parser.add_argument('path', help="File CSV tujuan (dibuat beserta header bila belum ada)")
+    parser.add_argument('--interval', type=float, default=1.0, help="Jeda antar penulisan (detik)")
+    parser.add_argument('--batch', type=int, default=1, help="Jumlah baris per penulisan")
+    parser.add_argument('--rows', type=int, default=0, help="Berhenti setelah sejumlah baris (0 = terus)")
+    parser.add_argument('--drift', type=float, default=0.0, help="Pergeseran rata-rata diameter per baris")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+    if not os.path.exists(args.path):
+        with open(args.path, 'w', encoding='utf-8') as fh:
+            fh.write("Waktu,Part,Mesin,Diameter,Kekerasan\n")
+
+    written = 0
+    try:
+        while args.rows == 0 or written < args.rows:
+            count = args.batch if args.rows == 0 else min(args.batch, args.rows - written)
+            diameter = rng.normal(25.0 + args.drift * (written + np.arange(count)), 0.02)
+            hardness = rng.normal(45.0, 1.5, count)
+            machines = rng.choice(['CNC-1', 'CNC-2', 'CNC-3'], count)
+            now = datetime.now().isoformat(timespec='milliseconds')
+            lines = [f"{now},P{written + i + 1:07d},{machines[i]},{diameter[i]:.4f},{hardness[i]:.2f}\n" for i in range(count)]
+            # Satu write per batch agar pembaca jarang melihat baris setengah jadi
+            with open(args.path, 'a', encoding='utf-8') as fh:
+                fh.write(''.join(lines))
+            written += count
+            print(f"{written} baris ditulis ke {args.path}", end='\r', flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    print()
+
+
+if __name__ == '__main__':
+    main()
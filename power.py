@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+T_ONE_SAMPLE = "Uji-t 1 Sampel"
+T_TWO_SAMPLE = "Uji-t 2 Sampel (Independent)"
+T_PAIRED = "Uji-t Paired"
+Z_ONE_SAMPLE = "Uji-z 1 Sampel"
+PROPORTION_ONE = "Uji Proporsi 1 Sampel"
+PROPORTION_TWO = "Uji Proporsi 2 Sampel"
+F_VARIANCE = "Uji Varians (F-Test)"
+ANOVA = "ANOVA 1 Arah"
+MANN_WHITNEY = "Mann-Whitney U"
+WILCOXON = "Wilcoxon Signed-Rank"
+TESTS = [T_ONE_SAMPLE, T_TWO_SAMPLE, T_PAIRED, Z_ONE_SAMPLE, PROPORTION_ONE, PROPORTION_TWO,
+         F_VARIANCE, ANOVA, MANN_WHITNEY, WILCOXON]
+NONPARAMETRIC = [MANN_WHITNEY, WILCOXON]
+# Uji yang n-nya dihitung per grup (lainnya: jumlah data atau jumlah pasangan)
+PER_GROUP = [T_TWO_SAMPLE, PROPORTION_TWO, F_VARIANCE, ANOVA, MANN_WHITNEY]
+
+# Nama ukuran efek tiap uji beserta patokan kecil/sedang/besar (Cohen)
+EFFECT_SIZES = {
+    T_ONE_SAMPLE: ("d Cohen", (0.2, 0.5, 0.8)),
+    T_TWO_SAMPLE: ("d Cohen", (0.2, 0.5, 0.8)),
+    T_PAIRED: ("d Cohen (selisih pasangan)", (0.2, 0.5, 0.8)),
+    Z_ONE_SAMPLE: ("d Cohen", (0.2, 0.5, 0.8)),
+    PROPORTION_ONE: ("h Cohen", (0.2, 0.5, 0.8)),
+    PROPORTION_TWO: ("h Cohen", (0.2, 0.5, 0.8)),
+    F_VARIANCE: ("Rasio varians σ₁²/σ₂²", (1.5, 2.0, 3.0)),
+    ANOVA: ("f Cohen", (0.1, 0.25, 0.4)),
+    MANN_WHITNEY: ("d Cohen (pergeseran lokasi)", (0.2, 0.5, 0.8)),
+    WILCOXON: ("d Cohen (pergeseran selisih)", (0.2, 0.5, 0.8)),
+}
+
+NORMAL = "Normal"
+LOGISTIC = "Logistik"
+LAPLACE = "Laplace"
+DISTRIBUTIONS = [NORMAL, LOGISTIC, LAPLACE]
+# Efisiensi relatif asimtotik (ARE) uji rank terhadap uji-t untuk pergeseran lokasi
+ARE = {NORMAL: 3 / np.pi, LOGISTIC: np.pi ** 2 / 9, LAPLACE: 1.5}
+
+N_MIN = 2
+N_MAX = 100_000
+# Batas elemen per blok simulasi (efek × replikasi × data) agar memori tetap kecil
+MC_BLOCK_ELEMENTS = 2_000_000
+
+
+def cohen_h(p1, p2):
+    """Ukuran efek dua proporsi: selisih transformasi arcsin akar."""
+    return 2 * np.arcsin(np.sqrt(p1)) - 2 * np.arcsin(np.sqrt(p2))
+
+
+def sample_sizes(n_max, points=40):
+    """Grid n (bilangan bulat unik, jarak geometris) dari N_MIN sampai `n_max`."""
+    return np.unique(np.geomspace(N_MIN, max(n_max, N_MIN + 1), points).round().astype(int))
+
+
+def power(test, effect, n, alpha, groups=3, distribution=NORMAL):
+    """Power uji dua sisi untuk array efek, n dan α yang di-broadcast bersama (satu panggilan SciPy per uji).
+
+    Uji non-parametrik memakai pendekatan Noether: setara uji-t dengan n × ARE distribusi data.
+    """
+    effect, n, alpha = np.broadcast_arrays(np.asarray(effect, dtype=float), np.asarray(n, dtype=float),
+                                           np.asarray(alpha, dtype=float))
+    if test in NONPARAMETRIC:
+        base = T_TWO_SAMPLE if test == MANN_WHITNEY else T_PAIRED
+        return np.where(n >= N_MIN, power(base, effect, np.maximum(n * ARE[distribution], N_MIN), alpha), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if test in (T_ONE_SAMPLE, T_PAIRED, T_TWO_SAMPLE):
+            if test == T_TWO_SAMPLE:
+                dof, nc = 2 * n - 2, np.abs(effect) * np.sqrt(n / 2)
+            else:
+                dof, nc = n - 1, np.abs(effect) * np.sqrt(n)
+            crit = stats.t.isf(alpha / 2, dof)
+            # Ekor berlawanan sangat kecil; untuk nc besar SciPy bisa mengembalikan NaN di sana
+            result = stats.nct.sf(crit, dof, nc) + np.nan_to_num(stats.nct.cdf(-crit, dof, nc))
+        elif test in (Z_ONE_SAMPLE, PROPORTION_ONE, PROPORTION_TWO):
+            nc = effect * np.sqrt(n / 2 if test == PROPORTION_TWO else n)
+            z = stats.norm.isf(alpha / 2)
+            result = stats.norm.cdf(nc - z) + stats.norm.cdf(-nc - z)
+        elif test == F_VARIANCE:
+            dof = n - 1
+            upper, lower = stats.f.isf(alpha / 2, dof, dof), stats.f.ppf(alpha / 2, dof, dof)
+            result = stats.f.sf(upper / effect, dof, dof) + stats.f.cdf(lower / effect, dof, dof)
+        elif test == ANOVA:
+            dfn, dfd = groups - 1, groups * (n - 1)
+            crit = stats.f.isf(alpha, dfn, dfd)
+            result = stats.ncf.sf(crit, dfn, dfd, effect ** 2 * groups * n)
+        else:
+            raise ValueError(f"Uji '{test}' tidak dikenal.")
+    return np.where(n >= N_MIN, np.clip(result, 0.0, 1.0), np.nan)
+
+
+def power_grid(test, effects, ns, alphas, groups=3, distribution=NORMAL):
+    """Power untuk seluruh grid efek × n × α dalam satu evaluasi, sebagai tabel panjang."""
+    e, n, a = np.meshgrid(np.asarray(effects, dtype=float), np.asarray(ns, dtype=float),
+                          np.asarray(alphas, dtype=float), indexing='ij')
+    values = power(test, e, n, a, groups, distribution)
+    return pd.DataFrame({'Efek': e.ravel(), 'n': n.ravel().astype(int), 'Alpha': a.ravel(), 'Power': values.ravel()})
+
+
+def required_n(test, effects, alphas, target, groups=3, distribution=NORMAL, n_max=N_MAX):
+    """n minimum untuk mencapai power target bagi setiap efek × α.
+
+    Bisection bilangan bulat dijalankan serentak untuk semua sel grid (power naik monoton terhadap n);
+    sel yang tidak mencapai target sampai `n_max` bernilai NaN.
+    """
+    e, a = np.meshgrid(np.asarray(effects, dtype=float), np.asarray(alphas, dtype=float), indexing='ij')
+    lo = np.full(e.shape, N_MIN - 1)
+    hi = np.full(e.shape, int(n_max))
+    reachable = power(test, e, hi, a, groups, distribution) >= target
+    while np.any(hi - lo > 1):
+        mid = (lo + hi) // 2
+        enough = power(test, e, np.maximum(mid, N_MIN), a, groups, distribution) >= target
+        hi = np.where(enough, mid, hi)
+        lo = np.where(enough, lo, mid)
+    table = pd.DataFrame(np.where(reachable, hi, np.nan), index=pd.Index(effects, name='Efek'),
+                         columns=[f"α = {alpha:g}" for alpha in alphas])
+    return table
+
+
+def _draw(rng, distribution, size):
+    """Sampel acak dengan rata-rata 0 dan simpangan baku 1."""
+    if distribution == LOGISTIC:
+        return rng.logistic(0.0, np.sqrt(3) / np.pi, size)
+    if distribution == LAPLACE:
+        return rng.laplace(0.0, 1 / np.sqrt(2), size)
+    return rng.standard_normal(size)
+
+
+def _rank_test_pvalues(test, rng, distribution, size, effects):
+    """p-value (pendekatan normal dengan koreksi kontinuitas, seperti SciPy untuk n besar) untuk semua efek × replikasi."""
+    n = size[-1]
+    shifted = _draw(rng, distribution, size)[None] + effects[:, None, None]
+    if test == MANN_WHITNEY:
+        base = np.broadcast_to(_draw(rng, distribution, size), shifted.shape)
+        combined = np.concatenate([base, shifted], axis=-1)
+        ranks = stats.rankdata(combined, axis=-1)
+        statistic = ranks[..., :n].sum(axis=-1) - n * (n + 1) / 2
+        mean, sd = n * n / 2, np.sqrt(n * n * (2 * n + 1) / 12)
+    else:
+        ranks = stats.rankdata(np.abs(shifted), axis=-1)
+        statistic = (ranks * (shifted > 0)).sum(axis=-1)
+        mean, sd = n * (n + 1) / 4, np.sqrt(n * (n + 1) * (2 * n + 1) / 24)
+    z = np.maximum(np.abs(statistic - mean) - 0.5, 0) / sd
+    return 2 * stats.norm.sf(z)
+
+
+def simulate_power(test, effects, ns, alphas, distribution=NORMAL, replicates=1000, seed=0, progress=None):
+    """Validasi Monte-Carlo power uji non-parametrik.
+
+    Untuk setiap n, replikasi dibangkitkan sekali lalu digeser untuk semua efek sekaligus
+    (common random numbers) dan statistik rank dihitung tervektorisasi per blok replikasi.
+    Mengembalikan tabel panjang berisi power simulasi, galat bakunya dan power pendekatan.
+    """
+    if test not in NONPARAMETRIC:
+        raise ValueError(f"Validasi Monte-Carlo hanya untuk {', '.join(NONPARAMETRIC)}.")
+    progress = progress or (lambda fraction, message=None: None)
+    rng = np.random.default_rng(seed)
+    effects = np.asarray(effects, dtype=float)
+    alphas = np.asarray(alphas, dtype=float)
+    simulated, approx = [], []
+    for i, n in enumerate(ns):
+        progress(i / len(ns), f"Simulasi n = {n}...")
+        block = max(1, MC_BLOCK_ELEMENTS // (len(effects) * 2 * n))
+        rejected = np.zeros((len(effects), len(alphas)))
+        for start in range(0, replicates, block):
+            size = (min(block, replicates - start), n)
+            p_values = _rank_test_pvalues(test, rng, distribution, size, effects)
+            rejected += (p_values[..., None] < alphas).sum(axis=1)
+        simulated.append(rejected / replicates)
+        approx.append(power(test, effects[:, None], n, alphas[None, :], distribution=distribution))
+    progress(1.0, "Selesai")
+    # Urutan sumbu (efek, n, α) sama dengan power_grid
+    result = power_grid(test, effects, ns, alphas, distribution=distribution).drop(columns='Power')
+    result['Power (MC)'] = np.stack(simulated, axis=1).ravel()
+    result['Power (Pendekatan)'] = np.stack(approx, axis=1).ravel()
+    result['SE (MC)'] = np.sqrt(result['Power (MC)'] * (1 - result['Power (MC)']) / replicates)
+    result['Selisih'] = result['Power (MC)'] - result['Power (Pendekatan)']
+    return result
@@ -0,0 +1,67 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = [50, 100, 500, 1000]
+
+# Hanya angka float yang lengkap; teks lain (mis. '1-2' atau '>=1e' yang belum selesai diketik) dicari sebagai teks
+_NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+_RANGE = re.compile(rf'^\s*({_NUMBER})\s*\.\.\s*({_NUMBER})\s*$')
+_COMPARE = re.compile(rf'^\s*(>=|<=|>|<|==|=|!=)?\s*({_NUMBER})\s*$')
+
+
+def sort_positions(series, ascending=True):
+    """Posisi baris (bukan label index) setelah diurutkan; NaN selalu di akhir."""
+    ordered = series.reset_index(drop=True).sort_values(ascending=ascending, na_position='last', kind='mergesort')
+    return ordered.index.to_numpy()
+
+
+def filter_mask(series, query):
+    """Mask boolean untuk filter kolom.
+
+    Kolom numerik menerima `a..b`, `>x`, `>=x`, `<x`, `<=x`, `=x`, `!=x` atau angka saja;
+    kolom lain dicocokkan sebagai teks (tidak peka huruf besar/kecil).
+    """
+    query = query.strip()
+    if not query:
+        return np.ones(len(series), dtype=bool)
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        match = _RANGE.match(query)
+        if match:
+            low, high = sorted(float(v) for v in match.groups())
+            return (values >= low) & (values <= high)
+        match = _COMPARE.match(query)
+        if match:
+            op, number = match.group(1) or '=', float(match.group(2))
+            return {
+                '>': values > number, '>=': values >= number,
+                '<': values < number, '<=': values <= number,
+                '=': values == number, '==': values == number, '!=': values != number,
+            }[op]
+    return series.astype(str).str.contains(query, case=False, regex=False, na=False).to_numpy()
+
+
+def page_window(df, positions, page, page_size):
+    """Mengambil potongan baris untuk halaman tertentu (halaman dimulai dari 1)."""
+    start = (page - 1) * page_size
+    return df.iloc[positions[start:start + page_size]]
+
+
+def merge_edits(df, window, edited):
+    """Menggabungkan hasil editor pada satu potongan kembali ke frame penuh.
+
+    Mengembalikan None bila tidak ada perubahan.
+    """
+    if edited.equals(window):
+        return None
+    in_window = edited.index.isin(window.index)
+    kept = edited[in_window]
+    added = edited[~in_window]
+    merged = df.drop(index=window.index.difference(edited.index))
+    if len(kept):
+        merged.loc[kept.index, kept.columns] = kept
+    if len(added):
+        merged = pd.concat([merged, added], ignore_index=True)
+    return merged
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+MISSING = "Nilai Hilang"
+IQR = "IQR (Tukey)"
+MAD = "MAD z-score"
+ESD = "Generalized ESD (Grubbs)"
+CONSTANT_RUN = "Nilai Konstan Beruntun"
+METHODS = [MISSING, IQR, MAD, ESD, CONSTANT_RUN]
+# Setiap metode menempati satu bit pada matriks flag (uint8, baris × kolom)
+BITS = {method: 1 << i for i, method in enumerate(METHODS)}
+
+IQR_K = 1.5
+# Batas z-score termodifikasi (Iglewicz & Hoaglin); 0.6745 = kuantil 75% normal baku
+MAD_Z = 3.5
+MAD_SCALE = 0.6745
+# Bila MAD = 0 dipakai mean absolute deviation dengan faktor 1.2533 (= sqrt(pi/2))
+MEAN_AD_SCALE = 1.253314
+ESD_MAX_OUTLIERS = 10
+ESD_ALPHA = 0.05
+CONSTANT_RUN_LENGTH = 10
+
+
+class QualityResult:
+    """Hasil pemeriksaan kualitas data: matriks flag per baris/kolom, ringkasan dan batas tiap metode."""
+
+    def __init__(self, columns, methods, flags, summary, limits):
+        self.columns = columns
+        self.methods = methods
+        self.flags = flags
+        self.summary = summary
+        self.limits = limits
+
+    def mask(self, methods, columns=None):
+        """Matriks boolean (baris × kolom) untuk metode yang dipilih."""
+        bits = np.uint8(sum(BITS[m] for m in methods))
+        flags = self.flags if columns is None else self.flags[:, [self.columns.index(c) for c in columns]]
+        return (flags & bits) != 0
+
+    def row_mask(self, methods, columns=None):
+        """True untuk baris yang ditandai oleh salah satu metode pada salah satu kolom."""
+        return self.mask(methods, columns).any(axis=1)
+
+    def flag_labels(self, rows, methods):
+        """Label flag yang mudah dibaca untuk baris tertentu, mis. 'Suhu: IQR (Tukey), MAD z-score'."""
+        labels = []
+        for row in self.flags[rows]:
+            parts = []
+            for col, value in zip(self.columns, row):
+                hits = [m for m in methods if value & BITS[m]]
+                if hits:
+                    parts.append(f"{col}: {', '.join(hits)}")
+            labels.append('; '.join(parts))
+        return labels
+
+
+def _quantiles(values, qs):
+    return np.quantile(values, qs, method='linear') if values.size else np.full(len(qs), np.nan)
+
+
+def _esd_cutoffs(values, max_outliers, alpha):
+    """Generalized ESD (Rosner); dengan `max_outliers=1` sama dengan uji Grubbs dua sisi.
+
+    Pada setiap langkah titik terjauh dari rata-rata selalu nilai terkecil atau terbesar yang tersisa,
+    jadi cukup mengurutkan r nilai ekstrem di tiap ujung dan memperbarui jumlah berjalan; data
+    lengkap hanya dibaca sekali. Mengembalikan (batas bawah, batas atas, jumlah outlier).
+    """
+    n = values.size
+    r = min(max_outliers, n // 2 - 1, n - 3)
+    if r < 1:
+        return -np.inf, np.inf, 0
+    center = values.mean()
+    s1 = 0.0
+    s2 = float(((values - center) ** 2).sum())
+    low = np.sort(np.partition(values, r - 1)[:r])
+    high = np.sort(np.partition(values, n - r)[n - r:])[::-1]
+
+    ratios = np.empty(r)
+    a = b = 0
+    taken = []
+    for i in range(r):
+        m = n - i
+        mean = center + s1 / m
+        sd = np.sqrt(max(s2 - s1 * s1 / m, 0.0) / (m - 1))
+        dev_low, dev_high = mean - low[a], high[b] - mean
+        if dev_high >= dev_low:
+            x, b, side = high[b], b + 1, 'high'
+            dev = dev_high
+        else:
+            x, a, side = low[a], a + 1, 'low'
+            dev = dev_low
+        ratios[i] = dev / sd if sd > 0 else 0.0
+        taken.append(side)
+        s1 -= x - center
+        s2 -= (x - center) ** 2
+
+    m = n - np.arange(r)
+    p = 1 - alpha / (2 * m)
+    t = stats.t.ppf(p, m - 2)
+    critical = (m - 1) * t / np.sqrt((m - 2 + t ** 2) * m)
+    exceed = np.flatnonzero(ratios > critical)
+    k = int(exceed[-1]) + 1 if exceed.size else 0
+    n_low = taken[:k].count('low')
+    n_high = k - n_low
+    low_cut = low[n_low - 1] if n_low else -np.inf
+    high_cut = high[n_high - 1] if n_high else np.inf
+    return low_cut, high_cut, k
+
+
+def _constant_runs(x, min_length):
+    """True untuk nilai yang termasuk deret nilai identik berurutan sepanjang ≥ `min_length`."""
+    if x.size == 0:
+        return np.zeros(0, dtype=bool)
+    starts = np.empty(x.size, dtype=bool)
+    starts[0] = True
+    # NaN tidak pernah sama dengan NaN, jadi nilai hilang selalu memutus deret
+    np.not_equal(x[1:], x[:-1], out=starts[1:])
+    run_id = np.cumsum(starts) - 1
+    lengths = np.bincount(run_id)
+    return (lengths >= min_length)[run_id] & ~np.isnan(x)
+
+
+def screen(frame, columns, methods=METHODS, iqr_k=IQR_K, mad_z=MAD_Z, esd_max_outliers=ESD_MAX_OUTLIERS,
+           esd_alpha=ESD_ALPHA, run_length=CONSTANT_RUN_LENGTH, progress=None):
+    """Menjalankan semua metode yang dipilih pada setiap kolom numerik sebagai mask tervektorisasi.
+
+    Kolom diproses satu per satu (hanya satu array float per kolom di memori), hasilnya
+    digabung ke satu matriks flag uint8 berukuran baris × kolom.
+    """
+    progress = progress or (lambda fraction, message=None: None)
+    columns = list(columns)
+    flags = np.zeros((len(frame), len(columns)), dtype=np.uint8)
+    counts, limits = {}, {}
+    for j, col in enumerate(columns):
+        progress(j / max(len(columns), 1), f"Memeriksa kolom {col}...")
+        x = frame[col].to_numpy(dtype=float, na_value=np.nan)
+        missing = np.isnan(x)
+        values = x[~missing]
+        col_flags = flags[:, j]
+        col_limits = {}
+        if MISSING in methods:
+            col_flags[missing] |= BITS[MISSING]
+        if IQR in methods and values.size:
+            q1, q3 = _quantiles(values, [0.25, 0.75])
+            lo, hi = q1 - iqr_k * (q3 - q1), q3 + iqr_k * (q3 - q1)
+            col_flags[(x < lo) | (x > hi)] |= BITS[IQR]
+            col_limits.update({'Batas Bawah IQR': lo, 'Batas Atas IQR': hi})
+        if MAD in methods and values.size:
+            median = np.median(values)
+            abs_dev = np.abs(values - median)
+            mad = np.median(abs_dev)
+            scale = mad / MAD_SCALE if mad > 0 else MEAN_AD_SCALE * abs_dev.mean()
+            if scale > 0:
+                col_flags[np.abs(x - median) > mad_z * scale] |= BITS[MAD]
+            col_limits.update({'Median': median, 'MAD': mad})
+        if ESD in methods:
+            low_cut, high_cut, n_outliers = _esd_cutoffs(values, esd_max_outliers, esd_alpha)
+            if n_outliers:
+                col_flags[(x <= low_cut) | (x >= high_cut)] |= BITS[ESD]
+            col_limits['Outlier ESD'] = n_outliers
+        if CONSTANT_RUN in methods:
+            col_flags[_constant_runs(x, run_length)] |= BITS[CONSTANT_RUN]
+        limits[col] = col_limits
+        counts[col] = {m: int(((col_flags & BITS[m]) != 0).sum()) for m in methods}
+
+    progress(0.95, "Menyusun ringkasan...")
+    summary = pd.DataFrame.from_dict(counts, orient='index', columns=list(methods))
+    summary.index.name = 'Kolom'
+    bits = np.uint8(sum(BITS[m] for m in methods))
+    summary.loc['Baris (semua kolom)'] = [int(((flags & BITS[m]) != 0).any(axis=1).sum()) for m in methods]
+    summary['Baris Bertanda'] = list(((flags & bits) != 0).sum(axis=0)) + [int(((flags & bits) != 0).any(axis=1).sum())]
+    progress(1.0, "Selesai")
+    return QualityResult(columns, list(methods), flags, summary,
+                         pd.DataFrame.from_dict(limits, orient='index').rename_axis('Kolom'))
@@ -0,0 +1,258 @@
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import linalg, stats
+
+from sketches import StreamingMoments
+
+REGRESSION_CHUNK_ROWS = int(os.environ.get('PSD_REGRESSION_CHUNK_ROWS', 500_000))
+# Jumlah titik residual (sampel sistematis) yang disimpan untuk grafik diagnostik
+RESIDUAL_PLOT_POINTS = 5000
+# Kolom desain dengan |R_ii| di bawah batas relatif ini dianggap alias (kolinear sempurna)
+ALIAS_TOLERANCE = 1e-10
+UNUSUAL_STD_RESIDUAL = 3.0
+
+
+class RegressionError(ValueError):
+    """Dilempar bila model tidak bisa di-fit (mis. data kurang atau semua kolom alias)."""
+
+
+class DesignSpec:
+    """Spesifikasi matriks desain: intersep, prediktor numerik, faktor kategori (kode efek ±1) dan interaksi.
+
+    Faktor kategori dikodekan dengan kode efek: level pertama bernilai -1 di semua kolomnya,
+    sehingga faktor dua level menjadi -1/+1 (rendah/tinggi) seperti pada analisis DOE.
+    """
+
+    def __init__(self, frame, response, predictors, categorical=(), interaction_order=1):
+        self.response = response
+        self.predictors = list(predictors)
+        self.categorical = [col for col in self.predictors if col in set(categorical)]
+        self.levels = {}
+        for col in self.categorical:
+            levels = pd.unique(frame[col].dropna())
+            try:
+                levels = np.sort(levels)
+            except TypeError:
+                levels = np.array(sorted(levels, key=str), dtype=object)
+            if len(levels) < 2:
+                raise RegressionError(f"Faktor '{col}' hanya memiliki satu level.")
+            self.levels[col] = levels
+
+        self.terms = [(col,) for col in self.predictors]
+        for order in range(2, min(interaction_order, len(self.predictors)) + 1):
+            self.terms += list(itertools.combinations(self.predictors, order))
+
+        self.column_names = ['Konstanta']
+        self.term_slices = {}
+        for term in self.terms:
+            start = len(self.column_names)
+            parts = [self._factor_labels(col) for col in term]
+            for combo in itertools.product(*parts):
+                self.column_names.append('*'.join(combo))
+            self.term_slices[term_name(term)] = slice(start, len(self.column_names))
+
+    def _factor_labels(self, col):
+        if col in self.levels:
+            return [f"{col}[{level}]" for level in self.levels[col][1:]]
+        return [str(col)]
+
+    def _factor_block(self, chunk, col):
+        if col in self.levels:
+            levels = self.levels[col]
+            codes = pd.Categorical(chunk[col], categories=levels).codes
+            block = (codes[:, None] == np.arange(1, len(levels))[None, :]).astype(float)
+            block[codes == 0] = -1.0
+            block[codes < 0] = np.nan
+            return block
+        return chunk[col].to_numpy(dtype=float, na_value=np.nan)[:, None]
+
+    def build(self, chunk):
+        """Matriks desain dan respons untuk satu blok baris; baris dengan nilai hilang dibuang."""
+        blocks = {col: self._factor_block(chunk, col) for col in self.predictors}
+        columns = [np.ones((len(chunk), 1))]
+        for term in self.terms:
+            block = blocks[term[0]]
+            for col in term[1:]:
+                other = blocks[col]
+                block = (block[:, :, None] * other[:, None, :]).reshape(len(chunk), -1)
+            columns.append(block)
+        x = np.hstack(columns)
+        y = chunk[self.response].to_numpy(dtype=float, na_value=np.nan)
+        valid = ~np.isnan(x).any(axis=1) & ~np.isnan(y)
+        return x[valid], y[valid], valid
+
+
+def term_name(term):
+    return '*'.join(map(str, term))
+
+
+def _chunks(frame, chunk_rows):
+    for start in range(0, len(frame), chunk_rows):
+        yield start, frame.iloc[start:start + chunk_rows]
+
+
+def _rss(r_aug, columns):
+    """RSS untuk model dengan subset kolom, langsung dari faktor R [X | y] (tanpa membaca ulang data)."""
+    sub = r_aug[:, list(columns) + [r_aug.shape[1] - 1]]
+    return float(np.linalg.qr(sub, mode='r')[-1, -1] ** 2)
+
+
+class RegressionResult:
+    """Hasil fit regresi: tabel koefisien, ringkasan model, tabel ANOVA dan diagnostik residual."""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def fit_regression(frame, spec, progress=None, chunk_rows=REGRESSION_CHUNK_ROWS):
+    """Fit OLS dengan akumulasi QR per blok (TSQR) lalu satu lintasan lagi untuk diagnostik residual.
+
+    Hanya faktor R berukuran (p+1)×(p+1) yang disimpan, jadi matriks desain penuh tidak pernah
+    dibentuk. Jumlah kuadrat parsial tiap suku dihitung dari R dengan membuang kolom suku itu.
+    """
+    progress = progress or (lambda fraction, message=None: None)
+    n_chunks = max(1, -(-len(frame) // chunk_rows))
+    p = len(spec.column_names)
+    r_aug = np.zeros((0, p + 1))
+    y_moments = StreamingMoments()
+    n = 0
+    for i, (_, chunk) in enumerate(_chunks(frame, chunk_rows)):
+        x, y, _ = spec.build(chunk)
+        if len(y):
+            stacked = np.vstack([r_aug, np.column_stack([x, y])])
+            r_aug = np.linalg.qr(stacked, mode='r')
+            y_moments.update(y)
+            n += len(y)
+        progress(0.6 * (i + 1) / n_chunks, f"Akumulasi QR blok {i + 1}/{n_chunks}")
+    if n <= p:
+        raise RegressionError(f"Jumlah data lengkap ({n}) harus lebih besar dari jumlah koefisien ({p}).")
+
+    # Kolom alias (kolinear sempurna) dibuang berurutan, seperti pada Minitab
+    diag = np.abs(np.diag(r_aug)[:p])
+    keep = [j for j in range(p) if diag[j] > ALIAS_TOLERANCE * max(diag.max(), 1.0)]
+    aliased = [spec.column_names[j] for j in range(p) if j not in keep]
+    if len(keep) < p:
+        r_aug = np.linalg.qr(r_aug[:, keep + [p]], mode='r')
+    names = [spec.column_names[j] for j in keep]
+    k = len(keep)
+
+    r_xx = r_aug[:k, :k]
+    z = r_aug[:k, k]
+    rss = float(r_aug[k, k] ** 2)
+    coef = linalg.solve_triangular(r_xx, z)
+    df_error = n - k
+    mse = rss / df_error
+    r_inv = linalg.solve_triangular(r_xx, np.eye(k))
+    cov = mse * (r_inv @ r_inv.T)
+    se = np.sqrt(np.diag(cov))
+    t_stat = coef / se
+    t_p = 2 * stats.t.sf(np.abs(t_stat), df_error)
+
+    # VIF dari X'X = R'R: matriks korelasi prediktor tanpa membaca ulang data
+    xtx = r_xx.T @ r_xx
+    vif = np.full(k, np.nan)
+    if k > 2:
+        means = xtx[0, 1:] / n
+        cov_x = xtx[1:, 1:] / n - np.outer(means, means)
+        scale = np.sqrt(np.diag(cov_x))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vif[1:] = np.diag(np.linalg.pinv(cov_x / np.outer(scale, scale)))
+    elif k == 2:
+        vif[1] = 1.0
+
+    coefficients = pd.DataFrame({
+        'Koefisien': coef, 'SE Koef': se, 't': t_stat, 'p-value': t_p, 'VIF': vif,
+    }, index=pd.Index(names, name='Suku'))
+
+    tss = y_moments.m2
+    ssr = tss - rss
+    df_reg = k - 1
+    anova_rows = []
+    if df_reg > 0:
+        f_reg = (ssr / df_reg) / mse
+        anova_rows.append(('Regresi', df_reg, ssr, ssr / df_reg, f_reg, stats.f.sf(f_reg, df_reg, df_error)))
+    progress(0.65, "Menghitung jumlah kuadrat parsial...")
+    kept_index = {j: pos for pos, j in enumerate(keep)}
+    for term, term_slice in spec.term_slices.items():
+        columns = [kept_index[j] for j in range(term_slice.start, term_slice.stop) if j in kept_index]
+        if not columns:
+            continue
+        remaining = [c for c in range(k) if c not in columns]
+        adj_ss = _rss(r_aug, remaining) - rss
+        df_term = len(columns)
+        f_term = (adj_ss / df_term) / mse
+        anova_rows.append(('  ' + term, df_term, adj_ss, adj_ss / df_term, f_term, stats.f.sf(f_term, df_term, df_error)))
+    anova_rows.append(('Galat', df_error, rss, mse, np.nan, np.nan))
+    anova_rows.append(('Total', n - 1, tss, np.nan, np.nan, np.nan))
+    anova = pd.DataFrame(anova_rows, columns=['Sumber', 'DF', 'Adj SS', 'Adj MS', 'F', 'p-value']).set_index('Sumber')
+
+    summary = {
+        'n': n, 'S': float(np.sqrt(mse)),
+        'R²': ssr / tss if tss > 0 else np.nan,
+        'R² (adj)': 1 - (rss / df_error) / (tss / (n - 1)) if tss > 0 else np.nan,
+    }
+
+    diagnostics = _residual_pass(frame, spec, keep, coef, np.sqrt(mse), n, chunk_rows, progress)
+    progress(1.0, "Selesai")
+    return RegressionResult(
+        spec=spec, coefficients=coefficients, anova=anova, summary=summary,
+        aliased=aliased, df_error=df_error, **diagnostics
+    )
+
+
+def _residual_pass(frame, spec, keep, coef, s, n, chunk_rows, progress):
+    """Lintasan kedua: momen residual, Durbin-Watson, observasi tidak biasa dan sampel untuk grafik."""
+    step = max(1, -(-n // RESIDUAL_PLOT_POINTS))
+    moments = StreamingMoments()
+    dw_num = 0.0
+    last = None
+    unusual = 0
+    seen = 0
+    sample_fit, sample_res, sample_order = [], [], []
+    n_chunks = max(1, -(-len(frame) // chunk_rows))
+    for i, (start, chunk) in enumerate(_chunks(frame, chunk_rows)):
+        x, y, valid = spec.build(chunk)
+        if len(y):
+            fitted = x[:, keep] @ coef
+            resid = y - fitted
+            moments.update(resid)
+            diffs = np.diff(resid)
+            dw_num += float(diffs @ diffs)
+            if last is not None:
+                dw_num += (resid[0] - last) ** 2
+            last = resid[-1]
+            unusual += int((np.abs(resid / s) > UNUSUAL_STD_RESIDUAL).sum())
+            # Sampel sistematis setiap `step` observasi lengkap, berlanjut antar blok
+            picks = np.arange((-seen) % step, len(y), step)
+            sample_fit.append(fitted[picks])
+            sample_res.append(resid[picks])
+            sample_order.append(start + np.flatnonzero(valid)[picks])
+            seen += len(y)
+        progress(0.7 + 0.3 * (i + 1) / n_chunks, f"Diagnostik residual blok {i + 1}/{n_chunks}")
+
+    jb = n / 6 * (moments.skew ** 2 + moments.kurtosis ** 2 / 4)
+    residual_summary = {
+        'Durbin-Watson': dw_num / moments.m2 if moments.m2 > 0 else np.nan,
+        'Skewness residual': moments.skew,
+        'Kurtosis residual': moments.kurtosis,
+        'Jarque-Bera': jb,
+        'p-value Jarque-Bera': float(stats.chi2.sf(jb, 2)),
+        f'Residual standar > {UNUSUAL_STD_RESIDUAL:g}': unusual,
+    }
+    return {
+        'residual_summary': residual_summary,
+        'sample_fitted': np.concatenate(sample_fit) if sample_fit else np.empty(0),
+        'sample_residuals': np.concatenate(sample_res) if sample_res else np.empty(0),
+        'sample_order': np.concatenate(sample_order) if sample_order else np.empty(0, dtype=int),
+        'residual_s': s,
+    }
+
+
+def factor_means(frame, response, factors, pairs=()):
+    """Rata-rata respons per level faktor (main effects) dan per kombinasi pasangan faktor (interaksi)."""
+    main = {col: frame.groupby(col, observed=True)[response].mean() for col in factors}
+    interactions = {pair: frame.groupby(list(pair), observed=True)[response].mean().unstack() for pair in pairs}
+    return main, interactions
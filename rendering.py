@@ -0,0 +1,78 @@
+import io
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+
+def figure_to_png(fig, dpi=100, tight=True):
+    """Menyimpan figure ke bytes PNG lalu menutupnya.
+
+    `tight=False` melewati perhitungan bbox ketat (menggambar dua kali) untuk figure
+    yang sudah memakai `tight_layout`.
+    """
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight' if tight else None, dpi=dpi)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def render_pairplot_png(frame, dpi=100):
+    """Menggambar pairplot di proses pekerja dan mengembalikan PNG."""
+    grid = sns.pairplot(frame)
+    return figure_to_png(grid.figure, dpi=dpi)
+
+
+def render_distribution_png(name, values, dpi=100, max_points=2000):
+    """Histogram dan Q-Q plot satu kolom dalam satu gambar.
+
+    Q-Q plot digambar dari kuantil pada paling banyak `max_points` posisi plot sehingga
+    biaya menggambar tidak bergantung pada jumlah baris.
+    """
+    from scipy import stats
+
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    fig, (ax_hist, ax_qq) = plt.subplots(ncols=2, figsize=(10, 4))
+    counts, edges = np.histogram(values, bins=30)
+    ax_hist.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='black')
+    ax_hist.set_title(f'Histogram untuk {name}')
+    ax_hist.set_xlabel(name)
+    ax_hist.set_ylabel('Frekuensi')
+
+    n_points = min(values.size, max_points)
+    if n_points >= 2:
+        probs = (np.arange(1, n_points + 1) - 0.5) / n_points
+        sample_q = np.quantile(values, probs)
+        theoretical_q = stats.norm.ppf(probs)
+        ax_qq.plot(theoretical_q, sample_q, 'o', markersize=3)
+        std = values.std(ddof=1)
+        ax_qq.plot(theoretical_q, values.mean() + std * theoretical_q, 'r-')
+    ax_qq.set_title(f"Q-Q Plot untuk Kolom '{name}'")
+    ax_qq.set_xlabel('Theoretical Quantiles')
+    ax_qq.set_ylabel('Sample Quantiles')
+    fig.tight_layout()
+    return figure_to_png(fig, dpi=dpi, tight=False)
+
+
+def render_heatmap_png(corr_matrix, dpi=100):
+    """Heatmap matriks korelasi."""
+    size = min(4 + 0.5 * len(corr_matrix), 40)
+    fig, ax = plt.subplots(figsize=(size, size * 0.8))
+    sns.heatmap(corr_matrix, annot=len(corr_matrix) <= 20, cmap='coolwarm', fmt=".2f", linewidths=.5, ax=ax)
+    ax.set_title("Matriks Korelasi Heatmap", fontsize=16)
+    return figure_to_png(fig, dpi=dpi)
+
+
+def render_table_png(title, cell_text, col_labels, dpi=100):
+    """Satu halaman tabel (ukuran A4 lanskap) sebagai PNG, untuk laporan PDF."""
+    fig, ax = plt.subplots(figsize=(11.69, 8.27))
+    ax.axis('off')
+    ax.set_title(title, fontsize=14, loc='left')
+    if len(cell_text):
+        table = ax.table(cellText=cell_text, colLabels=col_labels, loc='upper center')
+        table.auto_set_font_size(False)
+        table.set_fontsize(7)
+    return figure_to_png(fig, dpi=dpi, tight=False)
@@ -0,0 +1,206 @@
+import base64
+import html
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from rendering import render_distribution_png, render_heatmap_png, render_table_png
+
+REPORT_DPI = 90
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Shapiro-Wilk tidak akurat untuk n besar; di atas batas ini uji dilakukan pada sampel acak
+SHAPIRO_MAX_N = 5000
+
+REPORT_TESTS = ["ANOVA 1 Arah", "Uji-t 1 Sampel (μ₀)"]
+
+
+def analyze_column(name, values, dpi=REPORT_DPI):
+    """Dijalankan di proses pekerja: uji normalitas dan gambar distribusi satu kolom."""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    result = {'name': name, 'n': int(values.size)}
+    if values.size >= 3:
+        shapiro_sample = values
+        if values.size > SHAPIRO_MAX_N:
+            shapiro_sample = np.random.default_rng(0).choice(values, SHAPIRO_MAX_N, replace=False)
+        result['shapiro'] = tuple(float(v) for v in stats.shapiro(shapiro_sample))
+        result['ks'] = tuple(float(v) for v in stats.kstest(values, 'norm', args=(values.mean(), values.std(ddof=1))))
+        anderson = stats.anderson(values, dist='norm')
+        result['anderson'] = (float(anderson.statistic), float(anderson.critical_values[2]))
+    if values.size >= 8:
+        result['dagostino'] = tuple(float(v) for v in stats.normaltest(values))
+    result['png'] = render_distribution_png(name, values, dpi=dpi)
+    return result
+
+
+class _ColumnCache:
+    """Cache hasil `analyze_column` dengan batas ukuran total (LRU)."""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key, item):
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = item
+            self._bytes += len(item['png'])
+            while self._bytes > self.max_bytes and self._items:
+                _, old = self._items.popitem(last=False)
+                self._bytes -= len(old['png'])
+
+
+column_cache = _ColumnCache()
+
+
+def _column_key(name, series, dpi):
+    digest = int(pd.util.hash_pandas_object(series, index=False).sum()) & 0xFFFFFFFFFFFFFFFF
+    return (name, len(series), digest, dpi)
+
+
+def generate_report(ctx, df, columns, tests, submit, mu=0.0, fmt='html', dpi=REPORT_DPI):
+    """Membuat laporan analisis lengkap (HTML atau PDF) dan mengembalikan bytes-nya.
+
+    Gambar dan uji per kolom dikerjakan paralel lewat `submit` (mis. process pool) yang
+    mengembalikan `Future`; hasil per kolom di-cache berdasarkan isi kolom sehingga
+    laporan berikutnya untuk data yang sama jauh lebih cepat.
+    """
+    ctx.progress(0.0, "Menghitung statistik deskriptif...")
+    describe = df[columns].describe()
+
+    results = {}
+    pending = {}
+    for col in columns:
+        key = _column_key(col, df[col], dpi)
+        cached = column_cache.get(key)
+        if cached is not None:
+            results[col] = cached
+        else:
+            values = df[col].to_numpy(dtype=float, na_value=np.nan)
+            pending[submit(analyze_column, col, values, dpi)] = (col, key)
+
+    heatmap_future = submit(render_heatmap_png, df[columns].corr(), dpi) if len(columns) >= 2 else None
+
+    try:
+        for future in as_completed(pending):
+            ctx.check_cancelled()
+            col, key = pending[future]
+            results[col] = future.result()
+            column_cache.put(key, results[col])
+            ctx.progress(0.05 + 0.8 * len(results) / len(columns), f"Kolom {len(results)}/{len(columns)} selesai")
+
+        heatmap_png = heatmap_future.result() if heatmap_future is not None else None
+    finally:
+        # Bila dibatalkan atau gagal, pekerjaan yang masih antre tidak boleh terus memakai pool
+        for future in [*pending, heatmap_future]:
+            if future is not None and not future.done():
+                future.cancel()
+
+    ctx.progress(0.9, "Menjalankan uji hipotesis...")
+    test_rows = _run_tests(df, columns, tests, mu)
+
+    ordered = [results[col] for col in columns]
+    normality = _normality_table(ordered)
+    ctx.progress(0.95, "Menyusun dokumen...")
+    if fmt == 'pdf':
+        return _build_pdf(describe, normality, test_rows, ordered, heatmap_png, submit)
+    return _build_html(describe, normality, test_rows, ordered, heatmap_png)
+
+
+def _run_tests(df, columns, tests, mu):
+    rows = []
+    if "ANOVA 1 Arah" in tests and len(columns) >= 2:
+        f_stat, p_val = stats.f_oneway(*[df[col].dropna() for col in columns])
+        rows.append({'Uji': 'ANOVA 1 Arah', 'Kolom': ', '.join(map(str, columns)),
+                     'Statistik': f_stat, 'p-value': p_val})
+    if "Uji-t 1 Sampel (μ₀)" in tests:
+        for col in columns:
+            t_stat, p_val = stats.ttest_1samp(df[col].dropna(), mu)
+            rows.append({'Uji': f'Uji-t 1 Sampel (μ₀ = {mu})', 'Kolom': col,
+                         'Statistik': t_stat, 'p-value': p_val})
+    return pd.DataFrame(rows, columns=['Uji', 'Kolom', 'Statistik', 'p-value'])
+
+
+def _normality_table(results):
+    rows = []
+    for r in results:
+        shapiro = r.get('shapiro', (np.nan, np.nan))
+        dagostino = r.get('dagostino', (np.nan, np.nan))
+        ks = r.get('ks', (np.nan, np.nan))
+        anderson = r.get('anderson', (np.nan, np.nan))
+        rows.append({
+            'Kolom': r['name'], 'n': r['n'],
+            'Shapiro-Wilk W': shapiro[0], 'Shapiro-Wilk p': shapiro[1],
+            "D'Agostino K²": dagostino[0], "D'Agostino p": dagostino[1],
+            'KS D': ks[0], 'KS p': ks[1],
+            'Anderson A²': anderson[0], 'Nilai Kritis 5%': anderson[1],
+            'Normal (α=0.05)': 'Ya' if shapiro[1] > 0.05 else 'Tidak' if not np.isnan(shapiro[1]) else '-',
+        })
+    return pd.DataFrame(rows)
+
+
+def _png_tag(png, alt):
+    return f'<img alt="{html.escape(alt)}" src="data:image/png;base64,{base64.b64encode(png).decode()}"/>'
+
+
+def _build_html(describe, normality, test_rows, results, heatmap_png):
+    parts = [
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Laporan PSD Analyst</title>',
+        '<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;font-size:12px}'
+        'td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}img{max-width:100%}</style></head><body>',
+        '<h1>Laporan Analisis Data</h1>',
+        # Laporan disimpan di cache hasil, jadi waktu ini adalah waktu pembuatan pertama, bukan waktu unduh
+        f'<p>Pertama kali dibuat: {datetime.now():%Y-%m-%d %H:%M}</p>',
+        '<h2>Statistik Deskriptif</h2>', describe.to_html(float_format='{:.4f}'.format),
+        '<h2>Uji Normalitas</h2>', normality.to_html(index=False, float_format='{:.4f}'.format),
+    ]
+    if not test_rows.empty:
+        parts += ['<h2>Uji Hipotesis</h2>', test_rows.to_html(index=False, float_format='{:.4f}'.format)]
+    if heatmap_png is not None:
+        parts += ['<h2>Matriks Korelasi</h2>', _png_tag(heatmap_png, 'Heatmap korelasi')]
+    parts.append('<h2>Distribusi dan Q-Q Plot</h2>')
+    for r in results:
+        parts += [f'<h3>{html.escape(str(r["name"]))}</h3>', _png_tag(r['png'], str(r['name']))]
+    parts.append('</body></html>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+def _build_pdf(describe, normality, test_rows, results, heatmap_png, submit):
+    """PDF berisi halaman tabel dan gambar; halaman tabel digambar paralel lalu dirakit dengan Pillow."""
+    from PIL import Image
+
+    def table_pages(title, frame, rows_per_page=30):
+        frame = frame.map(lambda v: f"{v:.4f}" if isinstance(v, float) else v)
+        labels = [str(c) for c in frame.columns]
+        return [submit(render_table_png, title, frame.iloc[start:start + rows_per_page].values, labels, REPORT_DPI)
+                for start in range(0, max(len(frame), 1), rows_per_page)]
+
+    futures = table_pages("Statistik Deskriptif", describe.T.reset_index(names='Kolom'))
+    futures += table_pages("Uji Normalitas", normality)
+    if not test_rows.empty:
+        futures += table_pages("Uji Hipotesis", test_rows)
+    pngs = [future.result() for future in futures]
+    if heatmap_png is not None:
+        pngs.append(heatmap_png)
+    pngs += [r['png'] for r in results]
+
+    pages = [Image.open(io.BytesIO(png)).convert('RGB') for png in pngs]
+    buf = io.BytesIO()
+    pages[0].save(buf, format='PDF', save_all=True, append_images=pages[1:], resolution=REPORT_DPI)
+    return buf.getvalue()
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from shared_cache import connect_sqlite, data_path
+
+# --- Konfigurasi Penyimpanan Hasil ---
+RESULT_DB_FILE = os.path.abspath(os.environ.get('PSD_RESULT_DB', data_path('aplikasi_results.sqlite')))
+RESULT_MAX_MB = float(os.environ.get('PSD_RESULT_MAX_MB', 512))
+RESULT_TTL_DAYS = float(os.environ.get('PSD_RESULT_TTL_DAYS', 30))
+# Hasil yang lebih besar dari ini tidak disimpan (mis. gambar atau frame hasil yang sangat besar)
+RESULT_MAX_ITEM_MB = float(os.environ.get('PSD_RESULT_MAX_ITEM_MB', 64))
+HISTORY_MAX_ROWS = 10000
+
+
+def dataset_hash(frame):
+    """Hash isi dataset (nilai, nama kolom dan tipe), tidak bergantung pada sesi atau nama file."""
+    digest = hashlib.sha1()
+    digest.update(pickle.dumps([(str(col), str(dtype)) for col, dtype in frame.dtypes.items()], protocol=4))
+    digest.update(np.ascontiguousarray(pd.util.hash_pandas_object(frame, index=False).to_numpy()).tobytes())
+    return digest.hexdigest()
+
+
+def _params_text(params):
+    return json.dumps(params or {}, sort_keys=True, default=str, ensure_ascii=False)
+
+
+class ResultStore:
+    """Cache hasil analisis persisten di SQLite yang dipakai bersama oleh semua sesi dan pengguna.
+
+    Hasil dikunci oleh hash isi dataset, jenis analisis dan parameternya, lalu disimpan
+    sebagai pickle. Entri dihapus bila lebih tua dari TTL, dan entri yang paling lama tidak
+    diakses dibuang bila total ukuran melebihi batas.
+    """
+
+    def __init__(self, path=RESULT_DB_FILE, max_bytes=RESULT_MAX_MB * 1024 * 1024,
+                 ttl_seconds=RESULT_TTL_DAYS * 86400, max_item_bytes=RESULT_MAX_ITEM_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_item_bytes = max_item_bytes
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        conn = connect_sqlite(self.path)
+        if not self._initialized:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                dataset_hash TEXT,
+                analysis TEXT,
+                params TEXT,
+                payload BLOB,
+                size INTEGER,
+                created REAL,
+                last_access REAL,
+                hits INTEGER DEFAULT 0
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_access ON results (last_access)")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dataset_hash TEXT,
+                analysis TEXT,
+                params TEXT,
+                user_id TEXT,
+                created REAL,
+                from_cache INTEGER
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_dataset ON history (dataset_hash, created)")
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    @staticmethod
+    def make_key(data_hash, analysis, params=None):
+        return hashlib.sha1(f"{data_hash}|{analysis}|{_params_text(params)}".encode('utf-8')).hexdigest()
+
+    def get(self, data_hash, analysis, params=None):
+        """Mengembalikan (True, hasil) bila ada di cache dan belum kedaluwarsa, selain itu (False, None)."""
+        key = self.make_key(data_hash, analysis, params)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT payload, created FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return False, None
+                if now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    conn.commit()
+                    return False, None
+                conn.execute("UPDATE results SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key))
+                conn.commit()
+            finally:
+                conn.close()
+        try:
+            return True, pickle.loads(row[0])
+        except Exception:
+            # Entri dari versi library lain yang tidak bisa dibaca lagi dianggap tidak ada
+            self.discard(key)
+            return False, None
+
+    def put(self, data_hash, analysis, params, value):
+        """Menyimpan hasil; hasil yang tidak bisa di-pickle atau terlalu besar dilewati."""
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        if len(payload) > self.max_item_bytes:
+            return False
+        key = self.make_key(data_hash, analysis, params)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, dataset_hash, analysis, params, payload, size, created, last_access, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (key, data_hash, analysis, _params_text(params), payload, len(payload), now, now)
+                )
+                self._evict(conn, now)
+                conn.commit()
+            finally:
+                conn.close()
+        return True
+
+    def discard(self, key):
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def record(self, data_hash, analysis, params, user_id, from_cache):
+        """Mencatat satu analisis ke riwayat dataset."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT INTO history (dataset_hash, analysis, params, user_id, created, from_cache) VALUES (?, ?, ?, ?, ?, ?)",
+                    (data_hash, analysis, _params_text(params), user_id, time.time(), int(from_cache))
+                )
+                conn.execute("DELETE FROM history WHERE id <= (SELECT MAX(id) FROM history) - ?", (HISTORY_MAX_ROWS,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def history(self, data_hash, limit=100):
+        """Riwayat analisis untuk satu dataset, terbaru lebih dulu."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT created, analysis, params, user_id, from_cache FROM history "
+                    "WHERE dataset_hash = ? ORDER BY created DESC LIMIT ?",
+                    (data_hash, limit)
+                ).fetchall()
+            finally:
+                conn.close()
+        history = pd.DataFrame(rows, columns=['Waktu', 'Analisis', 'Parameter', 'Pengguna', 'Dari Cache'])
+        history['Waktu'] = pd.to_datetime(history['Waktu'], unit='s').dt.strftime('%Y-%m-%d %H:%M:%S')
+        history['Dari Cache'] = history['Dari Cache'].map({1: 'Ya', 0: 'Tidak'})
+        return history
+
+    def stats(self):
+        """Jumlah entri, total ukuran (byte) dan total hit cache."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                count, size, hits = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM results"
+                ).fetchone()
+            finally:
+                conn.close()
+        return {'entries': count, 'bytes': size, 'hits': hits}
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM results")
+                conn.commit()
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Buang entri yang paling lama tidak diakses sampai total ukuran kembali di bawah batas
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_access"):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM results WHERE key = ?", stale)
+
+
+store = ResultStore()
@@ -0,0 +1,173 @@
+import contextlib
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# --- Konfigurasi Mode Multi-Proses ---
+# Folder bersama untuk beberapa proses server di mesin yang sama (disk lokal, bukan network share)
+SHARED_DIR = os.environ.get('PSD_SHARED_DIR')
+# Folder aplikasi, dipakai untuk file data bila tidak ada folder bersama
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARED_MAX_MB = float(os.environ.get('PSD_SHARED_MAX_MB', 2048))
+LOCK_TIMEOUT_SECONDS = float(os.environ.get('PSD_LOCK_TIMEOUT', 300))
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('PSD_SQLITE_BUSY_MS', 30000))
+
+
+def data_path(name):
+    """Lokasi default file data: di folder bersama bila diatur, selain itu di folder aplikasi (bukan folder kerja)."""
+    return os.path.join(os.path.abspath(SHARED_DIR) if SHARED_DIR else APP_DIR, name)
+
+
+def connect_sqlite(path):
+    """Koneksi SQLite yang aman dipakai beberapa proses: WAL (pembaca tidak menunggu penulis) dan busy_timeout."""
+    conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+    conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+@contextlib.contextmanager
+def file_lock(path, timeout=LOCK_TIMEOUT_SECONDS):
+    """Kunci eksklusif antar proses berbasis file (flock di POSIX, msvcrt.locking di Windows)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a+b') as handle:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Kunci '{path}' tidak didapat dalam {timeout:g} detik.")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write(path, write):
+    """Menulis lewat file sementara di folder yang sama lalu os.replace; pembaca tidak pernah melihat file setengah jadi."""
+    temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(temp)
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def content_key(files, *settings):
+    """Kunci dari isi file (bukan nama atau ID unggahan) dan pengaturan parsing."""
+    digest = hashlib.sha1()
+    for f in files:
+        if hasattr(f, 'getvalue'):
+            digest.update(f.getvalue())
+        else:
+            with open(f, 'rb') as fh:
+                for block in iter(lambda: fh.read(1 << 20), b''):
+                    digest.update(block)
+        digest.update(b'\0')
+    digest.update(repr(settings).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class SharedDatasetCache:
+    """Dataset hasil parsing (Parquet) di folder yang dipakai bersama oleh beberapa proses server.
+
+    Parsing satu kunci hanya dijalankan oleh satu proses: proses lain menunggu kunci file lalu
+    membaca hasilnya. File ditulis secara atomik, dan file yang paling lama tidak dibaca
+    dibuang bila total ukuran melebihi batas.
+    """
+
+    def __init__(self, root, max_bytes=SHARED_MAX_MB * 1024 * 1024):
+        self.root = os.path.abspath(root)
+        self.dir = os.path.join(self.root, 'datasets')
+        self.max_bytes = max_bytes
+        os.makedirs(self.dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.dir, f"{key}.parquet")
+
+    def _read(self, path):
+        try:
+            frame = pd.read_parquet(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        # Waktu akses untuk urutan pembuangan (LRU)
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return frame
+
+    def get_or_parse(self, key, reader):
+        """Mengembalikan dataset untuk `key`, memanggil `reader()` hanya bila belum ada di proses mana pun.
+
+        Proses yang mem-parsing juga mengembalikan frame yang dibaca ulang dari Parquet, jadi tipe
+        kolom (dan dengan itu hash dataset serta kunci cache hasil) sama di semua proses.
+        """
+        path = self._path(key)
+        frame = self._read(path)
+        if frame is not None:
+            return frame
+        with file_lock(f"{path}.lock"):
+            frame = self._read(path)
+            if frame is not None:
+                return frame
+            frame = reader()
+            try:
+                atomic_write(path, frame.to_parquet)
+            except Exception:
+                # Tipe kolom yang tidak bisa ditulis ke Parquet: dataset tetap dipakai, hanya tidak dibagi
+                return frame
+            shared = self._read(path)
+            if shared is not None:
+                frame = shared
+        self.prune()
+        return frame
+
+    def prune(self):
+        with file_lock(os.path.join(self.root, 'prune.lock')):
+            entries = []
+            for name in os.listdir(self.dir):
+                if name.endswith('.parquet'):
+                    with contextlib.suppress(OSError):
+                        stat = os.stat(os.path.join(self.dir, name))
+                        entries.append((stat.st_mtime, stat.st_size, name))
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.dir, name))
+                    total -= size
+
+    def stats(self):
+        """Jumlah dataset dan total ukuran (byte) di folder bersama."""
+        sizes = []
+        for name in os.listdir(self.dir):
+            if name.endswith('.parquet'):
+                with contextlib.suppress(OSError):
+                    sizes.append(os.path.getsize(os.path.join(self.dir, name)))
+        return {'entries': len(sizes), 'bytes': sum(sizes)}
+
+
+datasets = SharedDatasetCache(SHARED_DIR) if SHARED_DIR else None
@@ -0,0 +1,255 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_K = 200
+CHUNK_ROWS = 1_000_000
+# Di atas jumlah baris ini kuantil dihitung dari sketsa secara bawaan
+EXACT_ROW_LIMIT = 200_000
+
+
+class StreamingMoments:
+    """Momen eksak (count, mean, M2..M4, min, max) yang bisa diperbarui per blok dan digabung."""
+
+    def __init__(self):
+        self.n = 0
+        self.n_missing = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        mask = np.isnan(values)
+        self.n_missing += int(mask.sum())
+        values = values[~mask]
+        if values.size == 0:
+            return self
+        batch = StreamingMoments()
+        batch.n = values.size
+        batch.mean = float(values.mean())
+        dev = values - batch.mean
+        dev2 = dev * dev
+        batch.m2 = float(dev2.sum())
+        batch.m3 = float((dev2 * dev).sum())
+        batch.m4 = float((dev2 * dev2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        return self._combine(batch)
+
+    def merge(self, other):
+        self.n_missing += other.n_missing
+        return self._combine(other)
+
+    def _combine(self, other):
+        # Rumus penggabungan momen Chan/Pébay
+        na, nb = self.n, other.n
+        if nb == 0:
+            return self
+        if na == 0:
+            self.n, self.mean, self.m2, self.m3, self.m4 = other.n, other.mean, other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            return self
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6.0 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2
+              + 4.0 * delta * (na * other.m3 - nb * self.m3) / n)
+        m3 = (self.m3 + other.m3
+              + delta2 * delta * na * nb * (na - nb) / n ** 2
+              + 3.0 * delta * (na * other.m2 - nb * self.m2) / n)
+        m2 = self.m2 + other.m2 + delta2 * na * nb / n
+        self.mean += delta * nb / n
+        self.n, self.m2, self.m3, self.m4 = n, m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def var(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.var)) if self.n > 1 else np.nan
+
+    @property
+    def skew(self):
+        if self.n < 2 or self.m2 == 0:
+            return np.nan
+        return float(np.sqrt(self.n) * self.m3 / self.m2 ** 1.5)
+
+    @property
+    def kurtosis(self):
+        """Excess kurtosis (Fisher)."""
+        if self.n < 2 or self.m2 == 0:
+            return np.nan
+        return float(self.n * self.m4 / (self.m2 * self.m2) - 3.0)
+
+
+class KLLSketch:
+    """Sketsa kuantil KLL yang bisa digabung, dengan kompaksi tervektorisasi NumPy.
+
+    Selama belum ada kompaksi, semua nilai tersimpan sehingga kuantil bersifat eksak.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(8, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.n += values.size
+        step = self.k * 8
+        for start in range(0, values.size, step):
+            self.levels[0] = np.concatenate([self.levels[0], values[start:start + step]])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        # Kompaksi malas: hanya level terendah yang penuh yang dipadatkan, sampai total muat
+        while sum(lvl.size for lvl in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            level = next(h for h, lvl in enumerate(self.levels) if lvl.size >= self._capacity(h))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # Jumlah ganjil: satu nilai tetap tinggal di level ini
+            keep = items[:1] if items.size % 2 else items[:0]
+            items = items[keep.size:]
+            offset = int(self._rng.integers(2))
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset::2]])
+            self.levels[level] = keep
+
+    @property
+    def is_exact(self):
+        return len(self.levels) == 1 or all(items.size == 0 for items in self.levels[1:])
+
+    @property
+    def rank_error(self):
+        """Perkiraan galat peringkat ternormalisasi (≈99% keyakinan), 0 bila sketsa masih eksak."""
+        if self.is_exact:
+            return 0.0
+        return 2.296 / self.k ** 0.9723
+
+    def _weighted(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(lvl.size, 2.0 ** h) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind='mergesort')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """Mengembalikan perkiraan kuantil (q skalar atau array di [0, 1])."""
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        if self.is_exact:
+            return np.quantile(self.levels[0], q)
+        items, cum = self._weighted()
+        targets = np.asarray(q, dtype=float) * cum[-1]
+        idx = np.clip(np.searchsorted(cum, targets, side='left'), 0, items.size - 1)
+        return items[idx]
+
+    def rank(self, x):
+        """Perkiraan proporsi nilai yang ≤ x."""
+        if self.n == 0:
+            return np.nan
+        items, cum = self._weighted()
+        idx = np.searchsorted(items, np.asarray(x, dtype=float), side='right')
+        return np.where(idx > 0, cum[np.maximum(idx - 1, 0)], 0.0) / cum[-1]
+
+
+class ColumnSketch:
+    """Ringkasan satu kolom: momen eksak ditambah sketsa kuantil."""
+
+    def __init__(self, k=DEFAULT_K):
+        self.moments = StreamingMoments()
+        self.kll = KLLSketch(k=k)
+
+    def update(self, values):
+        self.moments.update(values)
+        self.kll.update(values)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.kll.merge(other.kll)
+        return self
+
+    def quantiles(self, qs=(0.25, 0.5, 0.75)):
+        """Kuantil dengan min/max eksak di ujung-ujungnya."""
+        values = np.asarray(self.kll.quantile(np.asarray(qs, dtype=float)), dtype=float)
+        if self.moments.n:
+            values = np.clip(values, self.moments.min, self.moments.max)
+        return values
+
+    def iqr_fences(self, whis=1.5):
+        q1, q3 = self.quantiles((0.25, 0.75))
+        iqr = q3 - q1
+        return q1 - whis * iqr, q3 + whis * iqr
+
+    def boxplot_stats(self, label, whis=1.5):
+        """Statistik untuk `Axes.bxp` tanpa membaca ulang data (fliers tidak dienumerasi)."""
+        q1, med, q3 = self.quantiles((0.25, 0.5, 0.75))
+        lo, hi = self.iqr_fences(whis)
+        n = self.moments.n
+        n_low = float(self.kll.rank(np.nextafter(lo, -np.inf))) * n
+        n_high = (1.0 - float(self.kll.rank(hi))) * n
+        return {
+            'label': label,
+            'med': med, 'q1': q1, 'q3': q3,
+            'whislo': max(self.moments.min, lo),
+            'whishi': min(self.moments.max, hi),
+            'fliers': [],
+            'mean': self.moments.mean,
+            'n_outliers': int(round(n_low + n_high)),
+        }
+
+
+def build_column_sketches(df, k=DEFAULT_K, chunk_rows=CHUNK_ROWS, sketches=None):
+    """Membangun (atau memperbarui) sketsa setiap kolom numerik per blok baris."""
+    sketches = {} if sketches is None else sketches
+    numeric = df.select_dtypes(include=np.number)
+    for col in numeric.columns:
+        sketch = sketches.setdefault(col, ColumnSketch(k=k))
+        values = numeric[col].to_numpy(dtype=float, na_value=np.nan)
+        for start in range(0, values.size, chunk_rows):
+            sketch.update(values[start:start + chunk_rows])
+    return sketches
+
+
+def describe_from_sketches(sketches):
+    """Tabel seperti `DataFrame.describe()` yang dihitung dari sketsa."""
+    index = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+    data = {}
+    for col, sketch in sketches.items():
+        m = sketch.moments
+        q1, med, q3 = sketch.quantiles((0.25, 0.5, 0.75)) if m.n else (np.nan,) * 3
+        data[col] = [m.n, m.mean if m.n else np.nan, m.std,
+                     m.min if m.n else np.nan, q1, med, q3, m.max if m.n else np.nan]
+    return pd.DataFrame(data, index=index)
+
+
+def max_rank_error(sketches):
+    """Galat peringkat terbesar di antara semua sketsa."""
+    return max((s.kll.rank_error for s in sketches.values()), default=0.0)
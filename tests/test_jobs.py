@@ -0,0 +1,50 @@
+import threading
+
+from jobs import CANCELLED, DONE, JobRunner
+
+
+def _wait_for(ctx, started, release):
+    started.set()
+    while not release.wait(0.01):
+        ctx.check_cancelled()
+    return 'selesai'
+
+
+def test_cancelled_job_stays_cancelled_on_resubmit():
+    runner = JobRunner(thread_workers=1)
+    started, release = threading.Event(), threading.Event()
+    job = runner.submit('analisis', _wait_for, started, release)
+    started.wait(5)
+    assert runner.cancel('analisis')
+    assert job.wait(5)
+
+    # Rerun skrip mengirim ulang kunci yang sama: pekerjaan tidak boleh dimulai lagi
+    again = runner.submit('analisis', _wait_for, started, release)
+    assert again is job
+    assert again.state == CANCELLED
+
+
+def test_forget_allows_rerun():
+    runner = JobRunner(thread_workers=1)
+    started, release = threading.Event(), threading.Event()
+    runner.submit('analisis', _wait_for, started, release)
+    started.wait(5)
+    runner.cancel('analisis')
+    runner.get('analisis').wait(5)
+
+    runner.forget('analisis')
+    release.set()
+    job = runner.submit('analisis', _wait_for, threading.Event(), release)
+    assert job.wait(5)
+    assert job.state == DONE and job.result == 'selesai'
+
+
+def test_forget_keeps_running_job():
+    runner = JobRunner(thread_workers=1)
+    started, release = threading.Event(), threading.Event()
+    job = runner.submit('analisis', _wait_for, started, release)
+    started.wait(5)
+    runner.forget('analisis')
+    assert runner.get('analisis') is job
+    release.set()
+    assert job.wait(5)
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from preview import filter_mask
+
+
+@pytest.fixture
+def values():
+    return pd.Series([1.0, 2.0, 1e3, -0.5, np.nan])
+
+
+@pytest.mark.parametrize('query', ['1-2', '-', 'e', '>=1e', '1..', '..2', '>='])
+def test_incomplete_number_falls_back_to_text(values, query):
+    expected = values.astype(str).str.contains(query, case=False, regex=False, na=False).to_numpy()
+    np.testing.assert_array_equal(filter_mask(values, query), expected)
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('1..2', [True, True, False, False, False]),
+    ('2..1', [True, True, False, False, False]),
+    ('>=1e3', [False, False, True, False, False]),
+    ('-.5', [False, False, False, True, False]),
+    ('== 2', [False, True, False, False, False]),
+    ('!=2', [True, False, True, True, True]),
+])
+def test_numeric_queries(values, query, expected):
+    np.testing.assert_array_equal(filter_mask(values, query), expected)
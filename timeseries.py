@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Jumlah titik maksimum yang digambar; data yang lebih panjang didesimasi min/max per bucket
+PLOT_MAX_POINTS = 4000
+# Nama kolom yang kemungkinan berisi waktu (dicek setelah tipe datetime)
+TIME_NAME_HINTS = ('time', 'waktu', 'tanggal', 'date', 'timestamp', 'jam', 'datetime')
+DETECT_SAMPLE_ROWS = 200
+ROLLING_STATS = ["Rata-rata", "Std", "Min", "Maks", "EWMA"]
+# Uji D'Agostino K² membutuhkan minimal 8 data per jendela
+MIN_WINDOW_N = 8
+
+
+def detect_time_column(df):
+    """Mencari kolom waktu: kolom bertipe datetime, lalu kolom teks yang bisa diparse sebagai tanggal."""
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            return col
+    candidates = [col for col in df.columns
+                  if df[col].dtype == object or pd.api.types.is_string_dtype(df[col])]
+    # Kolom dengan nama yang mengandung petunjuk waktu dicoba lebih dulu
+    candidates.sort(key=lambda col: not any(hint in str(col).lower() for hint in TIME_NAME_HINTS))
+    for col in candidates:
+        sample = df[col].dropna().head(DETECT_SAMPLE_ROWS)
+        if sample.empty:
+            continue
+        parsed = pd.to_datetime(sample, errors='coerce', format='mixed')
+        if parsed.notna().mean() >= 0.9:
+            return col
+    return None
+
+
+def prepare_series(df, value_col, time_col=None):
+    """Mengembalikan Series nilai float berindeks waktu (terurut) atau berindeks posisi baris."""
+    values = pd.Series(df[value_col].to_numpy(dtype=float, na_value=np.nan))
+    if time_col is None:
+        return values
+    times = pd.to_datetime(df[time_col], errors='coerce', format='mixed').to_numpy()
+    valid = ~np.isnat(times)
+    series = pd.Series(values.to_numpy()[valid], index=pd.DatetimeIndex(times[valid]))
+    if not series.index.is_monotonic_increasing:
+        series = series.sort_index(kind='mergesort')
+    return series
+
+
+def check_time_window(window):
+    """Memastikan lebar jendela waktu adalah durasi tetap (mis. 30s, 5min, 1h, 1D).
+
+    Offset kalender seperti 1W, 1ME atau 1B lolos parsing tetapi panjangnya tidak tetap, sehingga
+    tidak bisa dipakai oleh `rolling` maupun `floor`. Melempar ValueError dengan pesan yang jelas.
+    """
+    try:
+        offset = pd.tseries.frequencies.to_offset(window)
+    except ValueError:
+        raise ValueError(f"format '{window}' tidak dikenali") from None
+    try:
+        offset.nanos
+    except ValueError:
+        raise ValueError(f"'{window}' bukan durasi tetap (minggu, bulan dan hari kerja tidak didukung)") from None
+    return offset
+
+
+def rolling_stats(series, window, selected=ROLLING_STATS, quantiles=(), ewma_span=20, min_periods=1):
+    """Statistik bergulir untuk jendela baris (int) atau jendela waktu (mis. '5min').
+
+    Semua perhitungan memakai kernel rolling/ewm pandas yang terkompilasi, jadi tidak ada
+    loop Python per titik data.
+    """
+    roll = series.rolling(window, min_periods=min_periods)
+    result = {}
+    if "Rata-rata" in selected:
+        result['Rata-rata'] = roll.mean()
+    if "Std" in selected:
+        result['Std'] = roll.std()
+    if "Min" in selected:
+        result['Min'] = roll.min()
+    if "Maks" in selected:
+        result['Maks'] = roll.max()
+    for q in quantiles:
+        result[f"Q{q:g}"] = roll.quantile(q)
+    if "EWMA" in selected:
+        result['EWMA'] = series.ewm(span=ewma_span, ignore_na=True).mean()
+    return pd.DataFrame(result, index=series.index)
+
+
+def window_codes(series, window):
+    """Nomor jendela tak-tumpang-tindih untuk setiap titik, beserta label awal tiap jendela."""
+    if isinstance(window, (int, np.integer)):
+        codes = np.arange(len(series)) // int(window)
+        starts = series.index[::int(window)]
+        return codes, starts
+    # Jendela waktu: data sudah terurut, jadi kode = posisi batas jendela (searchsorted)
+    bins = series.index.floor(window)
+    edges = bins.unique()
+    codes = np.searchsorted(edges.asi8, bins.asi8)
+    return codes, edges
+
+
+def windowed_tests(series, window, alpha=0.05):
+    """Uji normalitas D'Agostino K² per jendela dan uji-t Welch tiap jendela terhadap jendela pertama.
+
+    Momen per jendela dihitung dengan `np.bincount` sehingga seluruh deret diproses sekaligus.
+    """
+    codes, starts = window_codes(series, window)
+    values = series.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    codes, x = codes[valid], values[valid]
+    n_windows = len(starts)
+
+    n = np.bincount(codes, minlength=n_windows).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.bincount(codes, weights=x, minlength=n_windows) / n
+        dev = x - mean[codes]
+        m2 = np.bincount(codes, weights=dev ** 2, minlength=n_windows) / n
+        m3 = np.bincount(codes, weights=dev ** 3, minlength=n_windows) / n
+        m4 = np.bincount(codes, weights=dev ** 4, minlength=n_windows) / n
+        skew = m3 / m2 ** 1.5
+        kurt = m4 / m2 ** 2
+        k2 = _skew_z(skew, n) ** 2 + _kurtosis_z(kurt, n) ** 2
+        k2_p = stats.chi2.sf(k2, 2)
+        var = m2 * n / (n - 1)
+
+        # Welch t-test terhadap jendela pertama yang memiliki cukup data (baseline)
+        usable = n >= MIN_WINDOW_N
+        base = np.argmax(usable) if usable.any() else 0
+        se2 = var / n + var[base] / n[base]
+        t_stat = (mean - mean[base]) / np.sqrt(se2)
+        dof = se2 ** 2 / ((var / n) ** 2 / (n - 1) + (var[base] / n[base]) ** 2 / (n[base] - 1))
+        t_p = 2 * stats.t.sf(np.abs(t_stat), dof)
+
+    k2[~usable], k2_p[~usable] = np.nan, np.nan
+    t_stat[~usable], t_p[~usable] = np.nan, np.nan
+    t_stat[base], t_p[base] = np.nan, np.nan
+    result = pd.DataFrame({
+        'Awal Jendela': starts, 'n': n.astype(int), 'Rata-rata': mean, 'Std': np.sqrt(var),
+        "K²": k2, "p-value K²": k2_p, 't (vs jendela awal)': t_stat, 'p-value t': t_p,
+    })
+    result['Normal'] = np.where(np.isnan(k2_p), '-', np.where(k2_p > alpha, 'Ya', 'Tidak'))
+    result['Bergeser'] = np.where(np.isnan(t_p), '-', np.where(t_p <= alpha, 'Ya', 'Tidak'))
+    return result
+
+
+def _skew_z(skew, n):
+    """Statistik Z uji skewness D'Agostino (sama dengan `scipy.stats.skewtest`), per jendela."""
+    y = skew * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+    beta2 = (3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3)) / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    y = np.where(y == 0, 1, y)
+    return delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+
+def _kurtosis_z(kurt, n):
+    """Statistik Z uji kurtosis Anscombe-Glynn (sama dengan `scipy.stats.kurtosistest`), per jendela."""
+    expected = 3.0 * (n - 1) / (n + 1)
+    var_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+    x = (kurt - expected) / np.sqrt(var_b2)
+    sqrt_beta1 = 6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9)) * np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3)))
+    a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+    term1 = 1 - 2 / (9.0 * a)
+    denom = 1 + x * np.sqrt(2 / (a - 4.0))
+    term2 = np.sign(denom) * np.where(denom == 0.0, np.nan, ((1 - 2.0 / a) / np.abs(denom)) ** (1 / 3.0))
+    return (term1 - term2) / np.sqrt(2 / (9.0 * a))
+
+
+def decimate_indices(values, max_points=PLOT_MAX_POINTS):
+    """Indeks titik untuk digambar: minimum dan maksimum tiap bucket, agar lonjakan tetap terlihat."""
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    bucket = -(-n // (max_points // 2))
+    n_buckets = -(-n // bucket)
+    padded = np.full(n_buckets * bucket, np.nan)
+    padded[:n] = values
+    blocks = padded.reshape(n_buckets, bucket)
+    # Bucket yang seluruhnya NaN diwakili oleh titik pertamanya
+    all_nan = np.isnan(blocks).all(axis=1)
+    blocks[all_nan, 0] = 0.0
+    offsets = np.arange(n_buckets) * bucket
+    lows = offsets + np.nanargmin(blocks, axis=1)
+    highs = offsets + np.nanargmax(blocks, axis=1)
+    indices = np.unique(np.concatenate([lows, highs]))
+    return indices[indices < n]
@@ -0,0 +1,216 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+MINMAX = "Min-Max Scaling"
+ZSCORE = "Standardize (Z-Score)"
+LOG = "Log Transform"
+BOXCOX = "Box-Cox Transform"
+YEOJOHNSON = "Yeo-Johnson Transform"
+METHODS = [MINMAX, ZSCORE, BOXCOX, YEOJOHNSON, LOG]
+# Akhiran nama kolom hasil saat ditulis kembali ke dataset
+SUFFIXES = {MINMAX: 'minmax', ZSCORE: 'z', LOG: 'log', BOXCOX: 'boxcox', YEOJOHNSON: 'yj'}
+
+# Rentang pencarian lambda dan jumlah iterasi golden-section (presisi ~1e-8 pada rentang ini)
+LAMBDA_BOUNDS = (-5.0, 5.0)
+LAMBDA_ITERATIONS = 45
+
+
+class TransformError(ValueError):
+    """Dilempar bila data tidak memenuhi syarat metode transformasi."""
+
+
+def _as_matrix(frame, columns):
+    return frame[columns].to_numpy(dtype=float, na_value=np.nan)
+
+
+def _boxcox(x, lmbda):
+    """Box-Cox untuk matriks `x` dengan satu lambda per kolom."""
+    log_x = np.log(x)
+    near_zero = np.abs(lmbda) < 1e-12
+    safe = np.where(near_zero, 1.0, lmbda)
+    return np.where(near_zero, log_x, np.expm1(safe * log_x) / safe)
+
+
+def _yeojohnson(x, lmbda):
+    """Yeo-Johnson untuk matriks `x` dengan satu lambda per kolom."""
+    lmbda = np.broadcast_to(lmbda, x.shape)
+    out = np.empty_like(x)
+    pos = x >= 0
+    neg = x < 0
+    lp, ln = lmbda[pos], lmbda[neg]
+    xp, xn = x[pos], x[neg]
+    zero = np.abs(lp) < 1e-12
+    out[pos] = np.where(zero, np.log1p(xp), np.expm1(np.where(zero, 1.0, lp) * np.log1p(xp)) / np.where(zero, 1.0, lp))
+    two = np.abs(ln - 2) < 1e-12
+    safe = np.where(two, 1.0, 2 - ln)
+    out[neg] = np.where(two, -np.log1p(-xn), -np.expm1(safe * np.log1p(-xn)) / safe)
+    out[np.isnan(x)] = np.nan
+    return out
+
+
+def _fit_lambdas(method, x, progress=None):
+    """Estimasi MLE lambda untuk semua kolom sekaligus dengan golden-section search tervektorisasi.
+
+    Logaritma data dihitung sekali di awal; setiap iterasi hanya satu `expm1` atas seluruh matriks.
+    """
+    valid = ~np.isnan(x)
+    n = valid.sum(axis=0)
+    if method == BOXCOX:
+        logs = np.where(valid, np.log(np.where(valid, x, 1.0)), 0.0)
+        sign = None
+    else:
+        filled = np.where(valid, x, 0.0)
+        sign = np.where(filled >= 0, 1.0, -1.0)
+        logs = np.log1p(np.abs(filled))
+    jacobian = (sign * logs).sum(axis=0) if sign is not None else logs.sum(axis=0)
+
+    def log_likelihood(lmbda):
+        # Log-likelihood profil (tanpa konstanta); sel NaN bernilai 0 dan dikeluarkan lewat mask
+        if sign is None:
+            exponent = np.where(np.abs(lmbda) < 1e-12, 1e-12, lmbda)
+            y = np.expm1(exponent * logs)
+            scale = exponent
+        else:
+            # Yeo-Johnson: lambda untuk nilai positif, 2 - lambda untuk nilai negatif
+            exponent = np.where(sign > 0, lmbda, 2 - lmbda)
+            exponent = np.where(np.abs(exponent) < 1e-12, 1e-12, exponent)
+            y = sign * np.expm1(exponent * logs) / exponent
+            scale = 1.0
+        mean = y.sum(axis=0) / n
+        var = (((y - mean) * valid) ** 2).sum(axis=0) / n
+        return (lmbda - 1) * jacobian - n / 2 * (np.log(var) - 2 * np.log(np.abs(scale)))
+
+    ratio = (np.sqrt(5) - 1) / 2
+    low = np.full(x.shape[1], LAMBDA_BOUNDS[0])
+    high = np.full(x.shape[1], LAMBDA_BOUNDS[1])
+    c = high - ratio * (high - low)
+    d = low + ratio * (high - low)
+    f_c = log_likelihood(c)
+    f_d = log_likelihood(d)
+    for i in range(LAMBDA_ITERATIONS):
+        # Maksimum berada di [low, d] bila f(c) > f(d), selain itu di [c, high]
+        left = f_c > f_d
+        high = np.where(left, d, high)
+        low = np.where(left, low, c)
+        new_c = high - ratio * (high - low)
+        new_d = low + ratio * (high - low)
+        probe = np.where(left, new_c, new_d)
+        f_probe = log_likelihood(probe)
+        c, d = np.where(left, new_c, d), np.where(left, c, new_d)
+        f_c, f_d = np.where(left, f_probe, f_d), np.where(left, f_c, f_probe)
+        if progress is not None:
+            progress((i + 1) / LAMBDA_ITERATIONS)
+    return (low + high) / 2
+
+
+class FittedTransform:
+    """Transformasi yang sudah di-fit: parameter per kolom yang bisa diterapkan ulang ke batch baru."""
+
+    def __init__(self, method, params):
+        self.method = method
+        # {kolom: {nama_parameter: nilai}}
+        self.params = params
+
+    @property
+    def columns(self):
+        return list(self.params)
+
+    def transform(self, frame):
+        """Menerapkan transformasi ke semua kolom sekaligus tanpa fit ulang."""
+        missing = [col for col in self.columns if col not in frame.columns]
+        if missing:
+            raise TransformError(f"Kolom tidak ditemukan: {', '.join(map(str, missing))}")
+        x = _as_matrix(frame, self.columns)
+        param = lambda name: np.array([self.params[col][name] for col in self.columns])
+        if self.method == MINMAX:
+            y = (x - param('min')) / (param('max') - param('min'))
+        elif self.method == ZSCORE:
+            y = (x - param('mean')) / param('std')
+        elif self.method == LOG:
+            _check_positive(self.method, x, self.columns)
+            y = np.log(x)
+        elif self.method == BOXCOX:
+            _check_positive(self.method, x, self.columns)
+            y = _boxcox(x, param('lambda'))
+        else:
+            y = _yeojohnson(x, param('lambda'))
+        return pd.DataFrame(y, index=frame.index, columns=self.columns)
+
+    def output_names(self, existing=()):
+        """Nama kolom hasil yang tidak bertabrakan dengan kolom yang sudah ada."""
+        names = {}
+        for col in self.columns:
+            name = base = f"{col}_{SUFFIXES[self.method]}"
+            suffix = 2
+            while name in existing:
+                name = f"{base}_{suffix}"
+                suffix += 1
+            names[col] = name
+        return names
+
+    def write_back(self, frame):
+        """Mengembalikan salinan frame dengan kolom hasil transformasi ditambahkan."""
+        result = self.transform(frame)
+        return frame.assign(**{name: result[col] for col, name in self.output_names(frame.columns).items()})
+
+    def to_frame(self):
+        """Tabel parameter hasil fit (satu baris per kolom)."""
+        return pd.DataFrame.from_dict(self.params, orient='index').rename_axis('Kolom')
+
+    def to_json(self):
+        # Pasangan [kolom, parameter], bukan objek JSON, agar nama kolom non-teks (mis. angka) tidak berubah jadi string
+        pairs = [[col.item() if isinstance(col, np.generic) else col, params] for col, params in self.params.items()]
+        return json.dumps({'method': self.method, 'params': pairs}, indent=2)
+
+    @classmethod
+    def from_json(cls, text):
+        payload = json.loads(text)
+        params = payload.get('params')
+        if payload.get('method') not in METHODS or not isinstance(params, (list, dict)):
+            raise TransformError("File parameter transformasi tidak valid.")
+        if isinstance(params, list):
+            if not all(isinstance(pair, list) and len(pair) == 2 and isinstance(pair[1], dict) for pair in params):
+                raise TransformError("File parameter transformasi tidak valid.")
+            params = {col: values for col, values in params}
+        return cls(payload['method'], params)
+
+
+def _check_positive(method, x, columns):
+    non_positive = [col for col, bad in zip(columns, np.any(x <= 0, axis=0)) if bad]
+    if non_positive:
+        raise TransformError(f"{method} hanya dapat digunakan pada data positif. "
+                             f"Kolom bermasalah: {', '.join(map(str, non_positive))}")
+
+
+def fit_transform(frame, columns, method, progress=None):
+    """Fit satu metode ke banyak kolom dalam satu lintasan matriks dan mengembalikan `FittedTransform`."""
+    if method not in METHODS:
+        raise TransformError(f"Metode tidak dikenal: {method}")
+    x = _as_matrix(frame, columns)
+    empty = [col for col, count in zip(columns, np.sum(~np.isnan(x), axis=0)) if count < 2]
+    if empty:
+        raise TransformError(f"Kolom tanpa cukup data: {', '.join(map(str, empty))}")
+
+    if method == MINMAX:
+        low, high = np.nanmin(x, axis=0), np.nanmax(x, axis=0)
+        constant = [col for col, span in zip(columns, high - low) if span == 0]
+        if constant:
+            raise TransformError(f"Kolom bernilai konstan, tidak dapat di-Min-Max Scaling: {', '.join(map(str, constant))}")
+        params = {col: {'min': float(lo), 'max': float(hi)} for col, lo, hi in zip(columns, low, high)}
+    elif method == ZSCORE:
+        mean, std = np.nanmean(x, axis=0), np.nanstd(x, axis=0, ddof=1)
+        constant = [col for col, s in zip(columns, std) if s == 0]
+        if constant:
+            raise TransformError(f"Kolom dengan standar deviasi nol, tidak dapat di-Standardize: {', '.join(map(str, constant))}")
+        params = {col: {'mean': float(m), 'std': float(s)} for col, m, s in zip(columns, mean, std)}
+    elif method == LOG:
+        _check_positive(method, x, columns)
+        params = {col: {} for col in columns}
+    else:
+        if method == BOXCOX:
+            _check_positive(method, x, columns)
+        lambdas = _fit_lambdas(method, x, progress)
+        params = {col: {'lambda': float(lmbda)} for col, lmbda in zip(columns, lambdas)}
+    return FittedTransform(method, params)